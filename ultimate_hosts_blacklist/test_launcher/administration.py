@@ -38,25 +38,31 @@ License:
     SOFTWARE.
 """
 
+import copy
 import logging
+import os
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Optional, Set
 
-from PyFunceble.helpers.command import CommandHelper
 from PyFunceble.helpers.dict import DictHelper
 from PyFunceble.helpers.file import FileHelper
 
 from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure, outputs
+from ultimate_hosts_blacklist.test_launcher.helpers.repository import RepositoryHelper
 
 
 class Administration:
     """
     Provides the administration interface.
+
+    We keep a copy of what is currently written into the administration
+    file. That way, we only write it when one of its keys actually changed.
     """
 
     info_file_location: Optional[str] = None
     info_file_helper: Optional[FileHelper] = None
     __our_info: dict = {}
+    __persisted_info: dict = {}
 
     def __init__(self) -> None:
         self.info_file_location = outputs.ADMINISTRATION_DESTINATION
@@ -86,8 +92,8 @@ class Administration:
             super().__setattr__(index, value)
 
     def __delattr__(self, index: str) -> None:
-        if index in self.info:
-            del self.info[index]
+        if index in self.__our_info:
+            del self.__our_info[index]
 
     def __del__(self) -> None:
         self.save()
@@ -100,6 +106,21 @@ class Administration:
 
         return self.info_file_helper.exists()
 
+    @property
+    def dirty_keys(self) -> Set[str]:
+        """
+        Provides the keys that changed since we last read or wrote the
+        administration file.
+        """
+
+        current = self.convert_data_for_file(self.__our_info)
+
+        return {
+            x
+            for x in set(current) | set(self.__persisted_info)
+            if current.get(x) != self.__persisted_info.get(x)
+        }
+
     @staticmethod
     def convert_data_for_system(
         data: dict,
@@ -123,17 +144,15 @@ class Administration:
                 continue
 
             if key == "name":
-                result[key] = (
-                    CommandHelper("basename $(git rev-parse --show-toplevel)")
-                    .execute()
-                    .strip()
-                )
+                result[key] = RepositoryHelper.get_name()
             elif key in infrastructure.ADMINISTRATION_INDEXES["bool"]:
                 result[key] = bool(int(value))
             elif key in infrastructure.ADMINISTRATION_INDEXES["int"]:
                 result[key] = int(value)
             elif key in infrastructure.ADMINISTRATION_INDEXES["dict"]:
                 result[key] = dict(value)
+            elif key in infrastructure.ADMINISTRATION_INDEXES["list"]:
+                result[key] = list(value)
             elif key in infrastructure.ADMINISTRATION_INDEXES["datetime"]:
                 try:
                     result[key] = datetime.fromisoformat(value)
@@ -161,6 +180,8 @@ class Administration:
                         local_result = 0
                     elif sanitize_type == "dict":
                         local_result = {}
+                    elif sanitize_type == "list":
+                        local_result = []
                     elif sanitize_type == "datetime":
                         local_result = datetime.utcnow() - timedelta(days=365.25)
                     elif sanitize_type == "epoch":
@@ -210,21 +231,45 @@ class Administration:
         Loads and return the content of the administration file.
         """
 
-        if self.info_file_helper.read():
-            content = self.info_file_helper.read()
+        content = self.info_file_helper.read()
+
+        if content:
             logging.debug("Administration file content:\n%s", content)
 
-            return self.convert_data_for_system(
-                DictHelper().from_json(content, return_dict_on_error=False)
-            )
+            data = DictHelper().from_json(content, return_dict_on_error=False)
+
+            self.__persisted_info.clear()
+            self.__persisted_info.update(copy.deepcopy(data))
+
+            return self.convert_data_for_system(data)
         return {}
 
     def save(self) -> None:
         """
-        Saves the loaded content of the administration file.
+        Saves the loaded content of the administration file - if something
+        changed.
+
+        The file is written into a temporary file first, which then replaces
+        the administration file. Therefore, nobody can ever read a partially
+        written administration file.
         """
 
-        if self.info_file_helper.exists():
-            DictHelper(self.convert_data_for_file(self.__our_info)).to_json_file(
-                self.info_file_location
-            )
+        if not self.info_file_helper.exists():
+            return
+
+        dirty_keys = self.dirty_keys
+
+        if not dirty_keys:
+            logging.debug("Administration file unchanged. Nothing to save.")
+            return
+
+        logging.debug("Administration keys to save: %r", sorted(dirty_keys))
+
+        data = self.convert_data_for_file(self.__our_info)
+        temp_file_location = f"{self.info_file_location}.tmp"
+
+        DictHelper(data).to_json_file(temp_file_location)
+        os.replace(temp_file_location, self.info_file_location)
+
+        self.__persisted_info.clear()
+        self.__persisted_info.update(copy.deepcopy(data))
@@ -40,11 +40,11 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
-from PyFunceble.helpers.command import CommandHelper
 from PyFunceble.helpers.regex import RegexHelper
 
 from ultimate_hosts_blacklist.test_launcher.administration import Administration
 from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure
+from ultimate_hosts_blacklist.test_launcher.helpers.repository import RepositoryHelper
 
 
 class Authorization:
@@ -123,5 +123,5 @@ class Authorization:
         """
 
         return RegexHelper(infrastructure.MARKERS["launch"]).match(
-            CommandHelper("git log -1").execute(), return_match=False
+            RepositoryHelper.get_last_commit_message(), return_match=False
         )
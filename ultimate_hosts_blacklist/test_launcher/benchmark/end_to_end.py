@@ -0,0 +1,676 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our offline end-to-end benchmark.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess  # nosec: B404
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ultimate_hosts_blacklist.test_launcher import __version__
+from ultimate_hosts_blacklist.test_launcher.benchmark.stubs import (
+    LocalHTTPServer,
+    StubDNSServer,
+    is_resolvable,
+)
+from ultimate_hosts_blacklist.test_launcher.benchmark.synthetic import (
+    SyntheticBlacklist,
+)
+from ultimate_hosts_blacklist.test_launcher.defaults import outputs
+
+MODULE: str = "ultimate_hosts_blacklist.test_launcher.benchmark.end_to_end"
+
+SIZES: List[int] = [100_000, 1_000_000, 10_000_000]
+
+# Above this number of lines, we don't let PyFunceble test the input but
+# generate (synthetic) test results instead.
+TEST_LIMIT: int = 100_000
+
+# The environment variables which would make us believe that we run under CI.
+CI_ENVIRONMENT_VARIABLES: List[str] = [
+    "CI",
+    "GITHUB_ACTIONS",
+    "GITLAB_CI",
+    "JENKINS_URL",
+    "TRAVIS",
+    "TRAVIS_BUILD_DIR",
+]
+
+OUTPUT_FILES: List[str] = [
+    "domains.list",
+    "clean.list",
+    "whitelisted.list",
+    "volatile.list",
+    "ip.list",
+]
+
+
+class PhaseTimer:
+    """
+    Provides a way to time our phases.
+    """
+
+    phases: Optional[Dict[str, dict]] = None
+
+    def __init__(self) -> None:
+        self.phases = {}
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        """
+        Times everything that runs inside the context.
+        """
+
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+
+        try:
+            yield
+        finally:
+            self.phases[name] = {
+                "wall": round(time.perf_counter() - start_wall, 4),
+                "cpu": round(time.process_time() - start_cpu, 4),
+            }
+
+    def wrap(self, obj: object, method: str, name: Optional[str] = None) -> None:
+        """
+        Times every call of the given method of the given object.
+        """
+
+        original = getattr(obj, method)
+
+        def wrapper(*args, **kwargs):
+            with self.span(name or method):
+                return original(*args, **kwargs)
+
+        setattr(obj, method, wrapper)
+
+
+def use_local_services(base_url: str) -> None:
+    """
+    Points every download we (and our dependencies) do to our local HTTP
+    stand-in.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import PyFunceble.cli.storage
+    from PyFunceble.downloader.iana import IANADownloader
+    from PyFunceble.downloader.public_suffix import PublicSuffixDownloader
+    from PyFunceble.downloader.user_agents import UserAgentsDownloader
+    from ultimate_hosts_blacklist.whitelist.configuration import Configuration
+
+    Configuration.links["core"] = f"{base_url}/whitelist.list"
+    Configuration.links["root_zone_db"] = f"{base_url}/iana-domains-db.json"
+    Configuration.links["public_suffix"] = f"{base_url}/public-suffix.json"
+
+    IANADownloader.DEFAULT_DOWNLOAD_URL = f"{base_url}/iana-domains-db.json"
+    PublicSuffixDownloader.DEFAULT_DOWNLOAD_URL = f"{base_url}/public-suffix.json"
+    UserAgentsDownloader.DEFAULT_DOWNLOAD_URL = f"{base_url}/user_agents.json"
+
+    PyFunceble.cli.storage.VERSION_DUMP_LINK = f"{base_url}/version.yaml"
+
+
+def write_synthetic_results(active_ratio: int, wildcard_ratio: int) -> None:
+    """
+    Writes the results PyFunceble would have produced with our stub resolver.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from ultimate_hosts_blacklist.test_launcher.defaults import outputs
+
+    for destination in (
+        outputs.ACTIVE_SUBJECTS_DESTINATION,
+        outputs.IP_SUBJECTS_DESTINATION,
+    ):
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+    with open(outputs.INPUT_DESTINATION, "r", encoding="utf-8") as input_stream, open(
+        outputs.ACTIVE_SUBJECTS_DESTINATION, "w", encoding="utf-8"
+    ) as active_stream, open(
+        outputs.IP_SUBJECTS_DESTINATION, "w", encoding="utf-8"
+    ) as ip_stream:
+        active_stream.write("# Generated by the benchmark.\n\n")
+        ip_stream.write("# Generated by the benchmark.\n\n")
+
+        for line in input_stream:
+            subject = line.strip()
+
+            if not subject or not is_resolvable(subject, active_ratio, wildcard_ratio):
+                continue
+
+            if subject.replace(".", "").isdigit():
+                ip_stream.write(f"0.0.0.0 {subject}\n")
+            else:
+                active_stream.write(subject + "\n")
+
+
+def count_lines(path: str) -> Optional[int]:
+    """
+    Provides the number of lines of the given file.
+    """
+
+    if not os.path.isfile(path):
+        return None
+
+    with open(path, "rb") as file_stream:
+        return sum(
+            chunk.count(b"\n") for chunk in iter(lambda: file_stream.read(1 << 20), b"")
+        )
+
+
+def run_phases(args: argparse.Namespace) -> None:
+    """
+    Runs (and times) our phases. This is executed inside the working
+    directory of a benchmark.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import PyFunceble.facility
+    import PyFunceble.storage
+    from PyFunceble.helpers.directory import DirectoryHelper
+    from PyFunceble.helpers.merge import Merge
+
+    from ultimate_hosts_blacklist.test_launcher.administration import Administration
+    from ultimate_hosts_blacklist.test_launcher.defaults import outputs
+    from ultimate_hosts_blacklist.test_launcher.defaults import (
+        pyfunceble as pyfunceble_defaults,
+    )
+    from ultimate_hosts_blacklist.test_launcher.pyfunceble.system_launcher import (
+        UHBPyFuncebleSystemLauncher,
+    )
+    from ultimate_hosts_blacklist.test_launcher.updater.output_files import (
+        OutputFilesUpdater,
+    )
+
+    use_local_services(args.base_url)
+
+    timer = PhaseTimer()
+
+    with timer.span("pyfunceble_configuration"):
+        PyFunceble.facility.Logger.activated = False
+
+        DirectoryHelper(outputs.PYFUNCEBLE_CONFIG_DIRECTORY).create()
+
+        PyFunceble.storage.CONFIG_DIRECTORY = outputs.PYFUNCEBLE_CONFIG_DIRECTORY
+        PyFunceble.facility.ConfigLoader.path_to_config = os.path.join(
+            PyFunceble.storage.CONFIG_DIRECTORY,
+            PyFunceble.storage.CONFIGURATION_FILENAME,
+        )
+
+        PyFunceble.facility.ConfigLoader.set_custom_config(
+            Merge(
+                {
+                    "lookup": {
+                        "dns": True,
+                        "http_status_code": False,
+                        "netinfo": False,
+                        "special": False,
+                        "whois": False,
+                        "reputation": False,
+                        "platform": False,
+                        "collection": False,
+                        "timeout": 2.0,
+                    },
+                    "dns": {
+                        "server": args.nameserver.split(","),
+                        "protocol": "UDP",
+                        "follow_server_order": False,
+                        "trust_server": True,
+                    },
+                    "platform": {"push": False},
+                    "collection": {"push": False},
+                    "cli_testing": {
+                        "autocontinue": False,
+                        "max_workers": args.workers,
+                        "ci": {"active": False},
+                        "display_mode": {
+                            "dots": False,
+                            "percentage": False,
+                            "quiet": True,
+                        },
+                    },
+                }
+            ).into(pyfunceble_defaults.CONFIGURATION, strict=True)
+        ).set_merge_upstream(True).start()
+
+    administration = Administration()
+
+    with timer.span("output_files_updater"):
+        OutputFilesUpdater(administration).start()
+
+    launcher = UHBPyFuncebleSystemLauncher(administration=administration)
+
+    timer.wrap(launcher, "run_standard_end_instructions")
+    timer.wrap(launcher, "update_domain_lists")
+    timer.wrap(launcher, "update_ip_list")
+
+    if args.synthetic_results:
+        with timer.span("synthetic_results"):
+            write_synthetic_results(args.active_ratio, args.wildcard_ratio)
+
+        launcher.run_standard_end_instructions()
+    else:
+        with timer.span("testing"):
+            launcher.start()
+
+        # The end instructions are part of PyFunceble's start.
+        timer.phases["testing"]["wall"] = round(
+            timer.phases["testing"]["wall"]
+            - timer.phases["run_standard_end_instructions"]["wall"],
+            4,
+        )
+        timer.phases["testing"]["cpu"] = round(
+            timer.phases["testing"]["cpu"]
+            - timer.phases["run_standard_end_instructions"]["cpu"],
+            4,
+        )
+
+    with open(args.result_file, "w", encoding="utf-8") as file_stream:
+        json.dump(
+            {
+                "phases": timer.phases,
+                "lines": {
+                    x: count_lines(os.path.join(outputs.CURRENT_DIRECTORY, x))
+                    for x in OUTPUT_FILES
+                },
+            },
+            file_stream,
+        )
+
+
+def prepare(directory: str, size: int, seed: int) -> dict:
+    """
+    Prepares the working directory of the given size.
+    """
+
+    public_directory = os.path.join(directory, "public")
+    os.makedirs(public_directory, exist_ok=True)
+
+    generator = SyntheticBlacklist(seed)
+    source = os.path.join(public_directory, "domains.list")
+
+    start = time.perf_counter()
+    written = generator.write(source, size)
+    generation_time = time.perf_counter() - start
+
+    files = {
+        "whitelist.list": "\n".join(generator.get_whitelist(source)) + "\n",
+        "iana-domains-db.json": generator.get_iana_database(),
+        "public-suffix.json": generator.get_public_suffix_database(),
+        "user_agents.json": generator.get_user_agents(),
+        "version.yaml": "{}\n",
+    }
+
+    for name, content in files.items():
+        with open(
+            os.path.join(public_directory, name), "w", encoding="utf-8"
+        ) as file_stream:
+            file_stream.write(content)
+
+    return {
+        "public_directory": public_directory,
+        "generation": {"wall": round(generation_time, 4), "bytes": written},
+    }
+
+
+def run_size(args: argparse.Namespace, directory: str, size: int) -> dict:
+    """
+    Runs the benchmark of the given size.
+    """
+
+    preparation = prepare(directory, size, args.seed)
+
+    http_server = LocalHTTPServer(preparation["public_directory"]).start()
+    dns_servers = [
+        StubDNSServer(
+            args.active_ratio,
+            args.cold_zone_delay,
+            args.wildcard_ratio,
+            args.stub_max_rate,
+            delay,
+            # Each stub resolver needs its own address.
+            f"127.0.0.{index + 1}",
+        ).start()
+        for index, delay in enumerate(args.stub_delays)
+    ]
+
+    administration = {
+        "name": f"benchmark-{size}",
+        "raw_link": f"{http_server.base_url}/domains.list",
+        "currently_under_test": False,
+        "days_until_next_test": 0,
+        "streaming_diff": args.streaming_diff,
+        "output_writer_process": args.output_writer_process,
+        "auto_tune_workers": args.auto_tune_workers,
+        "dns_cache": args.dns_cache,
+        "parent_zone_short_circuit": args.parent_zone_short_circuit,
+        "zone_ordering": args.zone_ordering,
+        "wildcard_zone_short_circuit": args.wildcard_zone_short_circuit,
+        "dns_rate_limit": args.dns_rate_limit,
+        "dns_server_selection": args.dns_server_selection,
+        "pyfunceble": {"config": {}},
+    }
+
+    with open(
+        os.path.join(directory, "info.json"), "w", encoding="utf-8"
+    ) as file_stream:
+        json.dump(administration, file_stream, indent=4)
+
+    environment = {
+        k: v for k, v in os.environ.items() if k not in CI_ENVIRONMENT_VARIABLES
+    }
+    environment["GITHUB_REPOSITORY"] = f"benchmark/{administration['name']}"
+
+    result_file = os.path.join(directory, "phases.json")
+    command = [
+        sys.executable,
+        "-m",
+        MODULE,
+        "--child",
+        "--base-url",
+        http_server.base_url,
+        "--nameserver",
+        ",".join(x.nameserver for x in dns_servers),
+        "--result-file",
+        result_file,
+        "--active-ratio",
+        str(args.active_ratio),
+        "--wildcard-ratio",
+        str(args.wildcard_ratio),
+        "--workers",
+        str(args.workers),
+    ]
+
+    synthetic_results = size > args.test_limit
+
+    if synthetic_results:
+        command.append("--synthetic-results")
+
+    start = time.perf_counter()
+
+    try:
+        subprocess.run(  # nosec: B603
+            command, cwd=directory, env=environment, check=True
+        )
+    finally:
+        http_server.stop()
+        for dns_server in dns_servers:
+            dns_server.stop()
+
+    total = time.perf_counter() - start
+
+    with open(result_file, "r", encoding="utf-8") as file_stream:
+        result = json.load(file_stream)
+
+    result["phases"]["total"] = {"wall": round(total, 4)}
+    result["generation"] = preparation["generation"]
+    result["synthetic_results"] = synthetic_results
+    result["dns_queries"] = sum(x.queries for x in dns_servers)
+    result["dns_cold_queries"] = sum(x.cold_queries for x in dns_servers)
+    result["dns_servfails"] = sum(x.servfails for x in dns_servers)
+
+    with open(
+        os.path.join(directory, "info.json"), "r", encoding="utf-8"
+    ) as file_stream:
+        result["tuned_max_workers"] = json.load(file_stream).get("tuned_max_workers")
+
+    metrics_file = os.path.join(directory, "output", outputs.METRICS_FILENAME)
+
+    if os.path.isfile(metrics_file):
+        with open(metrics_file, "r", encoding="utf-8") as file_stream:
+            metrics = json.load(file_stream)
+
+        for section in (
+            "dns_cache",
+            "dns_rate_limit",
+            "dns_servers",
+            "parent_zone",
+            "wildcard_zone",
+        ):
+            result[section] = metrics.get(section)
+
+    return result
+
+
+def compare(
+    results: dict, baseline: dict, *, tolerance: float, min_seconds: float
+) -> List[str]:
+    """
+    Compares the given results with the given baseline.
+
+    :return:
+        The description of the regressions.
+    """
+
+    regressions = []
+
+    for size, result in results["sizes"].items():
+        if size not in baseline.get("sizes", {}):
+            continue
+
+        for phase, timing in result["phases"].items():
+            reference = baseline["sizes"][size]["phases"].get(phase)
+
+            if not reference or reference["wall"] < min_seconds:
+                continue
+
+            ratio = timing["wall"] / reference["wall"]
+
+            print(
+                f"{size:>10} {phase:<32} {reference['wall']:>10.2f}s "
+                f"{timing['wall']:>10.2f}s {ratio:>7.2f}x"
+            )
+
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{phase} ({size} lines): {reference['wall']:.2f}s -> "
+                    f"{timing['wall']:.2f}s"
+                )
+
+    return regressions
+
+
+def get_meta() -> dict:
+    """
+    Provides the description of the environment we ran into.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from PyFunceble import __version__ as pyfunceble_version
+
+    return {
+        "datetime": datetime.utcnow().isoformat(),
+        "launcher_version": __version__,
+        "pyfunceble_version": pyfunceble_version,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def benchmark() -> None:
+    """
+    Runs our end-to-end benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Runs the launcher offline against synthetic blacklists."
+    )
+
+    parser.add_argument(
+        "--sizes",
+        type=lambda x: [int(y) for y in x.split(",")],
+        default=SIZES,
+        help="The (comma separated) number of lines of our inputs.",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--test-limit",
+        type=int,
+        default=TEST_LIMIT,
+        help="Above this number of lines, the test results are synthetic.",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--active-ratio",
+        type=int,
+        default=60,
+        help="The share (in percent) of subjects our stub resolver resolves.",
+    )
+    parser.add_argument(
+        "--wildcard-ratio",
+        type=int,
+        default=0,
+        help="The share (in percent) of zones with a wildcard record.",
+    )
+    parser.add_argument("--streaming-diff", action="store_true", default=False)
+    parser.add_argument("--output-writer-process", action="store_true", default=False)
+    parser.add_argument("--auto-tune-workers", action="store_true", default=False)
+    parser.add_argument("--dns-cache", action="store_true", default=False)
+    parser.add_argument(
+        "--parent-zone-short-circuit", action="store_true", default=False
+    )
+    parser.add_argument("--zone-ordering", action="store_true", default=False)
+    parser.add_argument(
+        "--wildcard-zone-short-circuit", action="store_true", default=False
+    )
+    parser.add_argument("--dns-rate-limit", action="store_true", default=False)
+    parser.add_argument("--dns-server-selection", action="store_true", default=False)
+    parser.add_argument(
+        "--stub-max-rate",
+        type=int,
+        default=0,
+        help="The number of queries per second above which our stub resolver "
+        "answers SERVFAIL. 0 for no limit.",
+    )
+    parser.add_argument(
+        "--stub-delays",
+        type=lambda x: [float(y) for y in x.split(",")],
+        default=[0.0],
+        help="The (comma separated) number of seconds each of our stub resolvers "
+        "delays its answers. One stub resolver is started per delay.",
+    )
+    parser.add_argument(
+        "--cold-zone-delay",
+        type=float,
+        default=0.0,
+        help="The number of seconds our stub resolver delays the queries of the "
+        "zones it does not remember.",
+    )
+    parser.add_argument(
+        "--output",
+        default="uhb-benchmark-results.json",
+        help="Where to write our results.",
+    )
+    parser.add_argument("--baseline", help="The results to compare against.")
+    parser.add_argument(
+        "--save-baseline", help="Where to save our results as new baseline."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="The accepted slowdown (0.25 = 25%%) against the baseline.",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.5,
+        help="The phases faster than this (in the baseline) are not compared.",
+    )
+    parser.add_argument("--workdir", help="The directory to work into.")
+    parser.add_argument("--keep", action="store_true", default=False)
+
+    # Arguments of the process which runs inside a working directory.
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--nameserver", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--synthetic-results", action="store_true", help=argparse.SUPPRESS
+    )
+
+    args = parser.parse_args()
+
+    if args.child:
+        run_phases(args)
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="uhb-benchmark-")
+
+    results = {"meta": get_meta(), "sizes": {}}
+
+    try:
+        for size in args.sizes:
+            directory = os.path.join(workdir, str(size))
+            os.makedirs(directory, exist_ok=True)
+
+            results["sizes"][str(size)] = run_size(args, directory, size)
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as file_stream:
+        json.dump(results, file_stream, indent=4)
+
+    print(json.dumps(results, indent=4))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file_stream:
+            json.dump(results, file_stream, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file_stream:
+            regressions = compare(
+                results,
+                json.load(file_stream),
+                tolerance=args.tolerance,
+                min_seconds=args.min_seconds,
+            )
+
+        if regressions:
+            sys.exit("Regressions:\n" + "\n".join(regressions))
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,146 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides the benchmark of the startup of our CLI.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess  # nosec: B404
+import sys
+from typing import Dict, List
+
+MODULE: str = "ultimate_hosts_blacklist.test_launcher.cli"
+
+# The modules that are too heavy to be imported by a cold start.
+HEAVY_MODULES: List[str] = [
+    "PyFunceble",
+    "github",
+    "requests",
+    "ultimate_hosts_blacklist.whitelist",
+]
+
+# The default budget (in milliseconds) of a cold start.
+BUDGET: float = 150.0
+
+
+def get_import_times(module: str) -> Dict[str, int]:
+    """
+    Imports the given module in a fresh interpreter and provides the
+    cumulative import time (in microseconds) of every imported module.
+    """
+
+    process = subprocess.run(  # nosec: B603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    result = {}
+
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line[len("import time:") :].split("|")
+
+        try:
+            result[name.strip()] = int(cumulative)
+        except ValueError:
+            # The header line.
+            continue
+
+    return result
+
+
+def benchmark() -> None:
+    """
+    Measures the cold start of our CLI and fails if it exceeds our budget or
+    imports one of our heavy modules.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Measures the cold start of the CLI through -X importtime."
+    )
+
+    parser.add_argument(
+        "--runs", type=int, default=5, help="The number of cold starts to measure."
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=BUDGET,
+        help="The maximum (median) import time of the CLI in milliseconds.",
+    )
+
+    args = parser.parse_args()
+
+    timings = []
+    heavy_modules = set()
+
+    for _ in range(args.runs):
+        import_times = get_import_times(MODULE)
+
+        timings.append(import_times[MODULE] / 1000)
+        heavy_modules.update(x for x in HEAVY_MODULES if x in import_times)
+
+    median = statistics.median(timings)
+
+    print(
+        json.dumps(
+            {
+                "module": MODULE,
+                "runs": args.runs,
+                "median_ms": round(median, 2),
+                "min_ms": round(min(timings), 2),
+                "budget_ms": args.budget,
+                "heavy_modules": sorted(heavy_modules),
+            },
+            indent=4,
+        )
+    )
+
+    if heavy_modules:
+        sys.exit(
+            f"Cold start imports heavy modules: {', '.join(sorted(heavy_modules))}"
+        )
+
+    if median > args.budget:
+        sys.exit(f"Cold start exceeded its budget: {median:.2f}ms > {args.budget}ms")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,377 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides the local stand-ins of the services we
+depend on.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import functools
+import hashlib
+import http.server
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import dns.exception
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+import dns.rrset
+
+from ultimate_hosts_blacklist.test_launcher.benchmark.synthetic import (
+    TLD_WEIGHTS,
+    get_zone,
+)
+
+
+def is_wildcard(zone: str, wildcard_ratio: int) -> bool:
+    """
+    Checks if the given zone has a wildcard record.
+    """
+
+    digest = hashlib.blake2b(f"*.{zone.lower()}".encode(), digest_size=2).digest()
+
+    return int.from_bytes(digest, "big") % 100 < wildcard_ratio
+
+
+def is_resolvable(name: str, active_ratio: int, wildcard_ratio: int = 0) -> bool:
+    """
+    Checks if our stub resolver resolves the given name.
+
+    Like a real resolver (RFC 8020), nothing resolves under a name which does
+    not. Our TLDs always resolve. Everything under a zone with a wildcard
+    resolves - as long as the zone does.
+    """
+
+    zone = get_zone(name)
+
+    if zone != name.lower().rstrip(".") and is_wildcard(zone, wildcard_ratio):
+        return is_resolvable(zone, active_ratio)
+
+    labels = name.lower().rstrip(".").split(".")
+
+    for index in range(len(labels) - 1):
+        ancestor = ".".join(labels[index:])
+
+        if ancestor in TLD_WEIGHTS:
+            break
+
+        digest = hashlib.blake2b(ancestor.encode(), digest_size=2).digest()
+
+        if int.from_bytes(digest, "big") % 100 >= active_ratio:
+            return False
+
+    return True
+
+
+class QuietHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    Provides a request handler which doesn't log every request.
+    """
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        return None
+
+
+class LocalHTTPServer:
+    """
+    Provides a local HTTP server which serves the given directory.
+
+    :param directory:
+        The directory to serve.
+    """
+
+    server: Optional[http.server.ThreadingHTTPServer] = None
+    thread: Optional[threading.Thread] = None
+
+    def __init__(self, directory: str) -> None:
+        self.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0),
+            functools.partial(QuietHTTPRequestHandler, directory=directory),
+        )
+
+    @property
+    def base_url(self) -> str:
+        """
+        Provides the base URL of our server.
+        """
+
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self) -> "LocalHTTPServer":
+        """
+        Starts the server in a background thread.
+        """
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def stop(self) -> "LocalHTTPServer":
+        """
+        Stops the server.
+        """
+
+        self.server.shutdown()
+        self.server.server_close()
+
+        return self
+
+
+class StubDNSRequestHandler(socketserver.BaseRequestHandler):
+    """
+    Provides the handler of our stub resolver.
+
+    The answer only depends on the queried name: a deterministic share of
+    the names resolve (to a loopback address), the others are NXDOMAIN.
+    Empty answers come with the SOA record which gives their negative TTL.
+    Above its maximum rate, our server is overloaded: it answers SERVFAIL.
+    """
+
+    TTL: int = 300
+    SOA: str = "ns.invalid. hostmaster.invalid. 1 3600 600 86400 300"
+
+    def handle(self) -> None:
+        data, sock = self.request
+
+        try:
+            query = dns.message.from_wire(data)
+        except dns.exception.DNSException:
+            return
+
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.RA
+
+        if self.server.is_overloaded():
+            response.set_rcode(dns.rcode.SERVFAIL)
+            sock.sendto(response.to_wire(), self.client_address)
+            return
+
+        for question in query.question:
+            name = question.name.to_text(omit_final_dot=True)
+
+            if not is_resolvable(
+                name, self.server.active_ratio, self.server.wildcard_ratio
+            ):
+                response.set_rcode(dns.rcode.NXDOMAIN)
+            elif question.rdtype == dns.rdatatype.A:
+                zone = get_zone(name)
+
+                if zone != name.lower() and is_wildcard(
+                    zone, self.server.wildcard_ratio
+                ):
+                    # A wildcard gives the same answer to all the names under it.
+                    digest = hashlib.blake2b(
+                        f"*.{zone}".encode(), digest_size=2
+                    ).digest()
+                else:
+                    digest = hashlib.blake2b(name.encode(), digest_size=2).digest()
+
+                response.answer.append(
+                    dns.rrset.from_text(
+                        question.name,
+                        self.TTL,
+                        dns.rdataclass.IN,
+                        dns.rdatatype.A,
+                        f"127.0.{digest[0]}.{digest[1] or 1}",
+                    )
+                )
+                continue
+
+            response.authority.append(
+                dns.rrset.from_text(
+                    question.name.parent(),
+                    self.TTL,
+                    dns.rdataclass.IN,
+                    dns.rdatatype.SOA,
+                    self.SOA,
+                )
+            )
+
+        self.server.queries += 1
+
+        if query.question and self.server.is_cold(query.question[0].name.to_text()):
+            time.sleep(self.server.cold_delay)
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        sock.sendto(response.to_wire(), self.client_address)
+
+
+class StubDNSServer(socketserver.ThreadingUDPServer):
+    """
+    Provides a local (UDP) DNS resolver which answers without ever touching
+    the network.
+
+    Like a recursive resolver, we only remember the delegation of the last
+    :code:`zone_cache_size` zones we were asked about. The queries of the
+    other zones are cold: they are counted and delayed.
+
+    :param active_ratio:
+        The share (in percent) of names which resolve.
+    :param cold_delay:
+        The number of seconds a cold query is delayed.
+    :param wildcard_ratio:
+        The share (in percent) of zones with a wildcard record.
+    :param max_rate:
+        The number of queries per second above which we answer SERVFAIL.
+        :code:`0` for no limit.
+    :param delay:
+        The number of seconds every answer is delayed.
+    :param host:
+        The (loopback) address to listen on.
+    """
+
+    daemon_threads = True
+
+    active_ratio: int = 60
+    cold_delay: float = 0.0
+    wildcard_ratio: int = 0
+    max_rate: int = 0
+    delay: float = 0.0
+    zone_cache_size: int = 256
+    queries: int = 0
+    cold_queries: int = 0
+    servfails: int = 0
+    thread: Optional[threading.Thread] = None
+
+    def __init__(
+        self,
+        active_ratio: Optional[int] = None,
+        cold_delay: Optional[float] = None,
+        wildcard_ratio: Optional[int] = None,
+        max_rate: Optional[int] = None,
+        delay: Optional[float] = None,
+        host: str = "127.0.0.1",
+    ) -> None:
+        if active_ratio is not None:
+            self.active_ratio = int(active_ratio)
+
+        if cold_delay is not None:
+            self.cold_delay = float(cold_delay)
+
+        if wildcard_ratio is not None:
+            self.wildcard_ratio = int(wildcard_ratio)
+
+        if max_rate is not None:
+            self.max_rate = int(max_rate)
+
+        if delay is not None:
+            self.delay = float(delay)
+
+        self.zones: OrderedDict = OrderedDict()
+        self.zones_lock = threading.Lock()
+        self.window = [0, 0]
+        self.window_lock = threading.Lock()
+
+        super().__init__((host, 0), StubDNSRequestHandler)
+
+    def is_cold(self, name: str) -> bool:
+        """
+        Checks if the zone of the given name is unknown to us - and remembers
+        it.
+        """
+
+        zone = get_zone(name)
+
+        with self.zones_lock:
+            if zone in self.zones:
+                self.zones.move_to_end(zone)
+                return False
+
+            self.zones[zone] = True
+            self.cold_queries += 1
+
+            if len(self.zones) > self.zone_cache_size:
+                self.zones.popitem(last=False)
+
+        return True
+
+    def is_overloaded(self) -> bool:
+        """
+        Checks if we received more than our maximum rate of queries during
+        the current second - and counts the query.
+        """
+
+        if not self.max_rate:
+            return False
+
+        second = int(time.monotonic())
+
+        with self.window_lock:
+            if self.window[0] != second:
+                self.window = [second, 0]
+
+            self.window[1] += 1
+
+            if self.window[1] <= self.max_rate:
+                return False
+
+            self.servfails += 1
+
+        return True
+
+    @property
+    def nameserver(self) -> str:
+        """
+        Provides our address in a format PyFunceble understands.
+        """
+
+        return f"{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self) -> "StubDNSServer":
+        """
+        Starts the server in a background thread.
+        """
+
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def stop(self) -> "StubDNSServer":
+        """
+        Stops the server.
+        """
+
+        self.shutdown()
+        self.server_close()
+
+        return self
@@ -0,0 +1,341 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our synthetic inputs.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import json
+import random
+import string
+from typing import Dict, List, Optional, Set
+
+# An approximation of the TLD distribution of the lists we test.
+TLD_WEIGHTS: Dict[str, float] = {
+    "com": 46.0,
+    "net": 6.0,
+    "org": 4.0,
+    "ru": 4.0,
+    "de": 3.0,
+    "info": 3.0,
+    "xyz": 3.0,
+    "top": 3.0,
+    "cn": 2.0,
+    "br": 2.0,
+    "tk": 2.0,
+    "co.uk": 2.0,
+    "io": 1.5,
+    "online": 1.5,
+    "site": 1.5,
+    "pl": 1.2,
+    "in": 1.0,
+    "fr": 1.0,
+    "jp": 1.0,
+    "nl": 1.0,
+    "it": 1.0,
+    "ml": 1.0,
+    "ga": 1.0,
+    "cf": 1.0,
+    "club": 1.0,
+    "biz": 1.0,
+    "us": 1.0,
+    "com.au": 1.0,
+    "es": 1.0,
+    "eu": 0.8,
+}
+
+# The share (in percent) of each kind of line.
+LINE_WEIGHTS: Dict[str, float] = {
+    "plain": 40.0,
+    "sibling": 15.0,
+    "hosts": 20.0,
+    "hosts_localhost": 5.0,
+    "duplicate": 5.0,
+    "comment": 4.0,
+    "inline_comment": 3.0,
+    "www": 3.0,
+    "ip": 2.0,
+    "blank": 2.0,
+    "invalid": 1.0,
+}
+
+SUBDOMAIN_DEPTH_WEIGHTS: List[float] = [50.0, 35.0, 10.0, 5.0]
+
+SYLLABLES: List[str] = [
+    "ad",
+    "ads",
+    "an",
+    "click",
+    "cdn",
+    "da",
+    "ex",
+    "go",
+    "ka",
+    "lo",
+    "ma",
+    "me",
+    "net",
+    "no",
+    "pix",
+    "ra",
+    "ro",
+    "se",
+    "stat",
+    "ta",
+    "to",
+    "track",
+    "um",
+    "vi",
+    "web",
+    "xo",
+    "za",
+]
+
+
+def get_zone(name: str) -> str:
+    """
+    Provides the zone (registrable domain) of the given name.
+    """
+
+    labels = name.lower().rstrip(".").split(".")
+
+    for index in range(1, len(labels)):
+        if ".".join(labels[index:]) in TLD_WEIGHTS:
+            return ".".join(labels[index - 1 :])
+
+    return ".".join(labels[-2:])
+
+
+class SyntheticBlacklist:
+    """
+    Provides a generator of synthetic (but realistic) :code:`domains.list`
+    files.
+
+    :param seed:
+        The seed of our random generator.
+    """
+
+    rand: Optional[random.Random] = None
+    tlds: Optional[List[str]] = None
+    tld_weights: Optional[List[float]] = None
+    kinds: Optional[List[str]] = None
+    kind_weights: Optional[List[float]] = None
+
+    def __init__(self, seed: int = 42) -> None:
+        self.rand = random.Random(seed)
+
+        self.tlds = list(TLD_WEIGHTS)
+        self.tld_weights = list(TLD_WEIGHTS.values())
+        self.kinds = list(LINE_WEIGHTS)
+        self.kind_weights = list(LINE_WEIGHTS.values())
+
+    def get_label(self) -> str:
+        """
+        Provides a random label.
+        """
+
+        result = "".join(
+            self.rand.choice(SYLLABLES) for _ in range(self.rand.randint(1, 4))
+        )
+
+        if self.rand.random() < 0.3:
+            result += str(self.rand.randint(0, 999))
+
+        if self.rand.random() < 0.1:
+            result += "-" + self.rand.choice(SYLLABLES)
+
+        return result
+
+    def get_domain(self) -> str:
+        """
+        Provides a random domain.
+        """
+
+        depth = self.rand.choices(
+            range(len(SUBDOMAIN_DEPTH_WEIGHTS)), weights=SUBDOMAIN_DEPTH_WEIGHTS
+        )[0]
+
+        labels = [self.get_label() for _ in range(depth + 1)]
+        labels.append(self.rand.choices(self.tlds, weights=self.tld_weights)[0])
+
+        return ".".join(labels)
+
+    def get_ip(self) -> str:
+        """
+        Provides a random (public looking) IPv4.
+        """
+
+        return ".".join(
+            [str(self.rand.randint(11, 223))]
+            + [str(self.rand.randint(0, 255)) for _ in range(3)]
+        )
+
+    def get_line(self, previous: List[str]) -> str:
+        """
+        Provides a random line.
+
+        :param previous:
+            A pool of previously generated domains. Used for duplicates and
+            siblings.
+        """
+
+        kind = self.rand.choices(self.kinds, weights=self.kind_weights)[0]
+
+        if kind == "duplicate" and previous:
+            return self.rand.choice(previous)
+
+        if kind == "sibling" and previous:
+            # Blacklists list a lot of subdomains of the same zones.
+            return f"{self.get_label()}.{get_zone(self.rand.choice(previous))}"
+
+        if kind == "comment":
+            return "# " + " ".join(self.get_label() for _ in range(4))
+
+        if kind == "blank":
+            return ""
+
+        if kind == "ip":
+            return self.get_ip()
+
+        if kind == "invalid":
+            return (
+                self.get_label()
+                + "."
+                + "".join(self.rand.choices(string.ascii_lowercase, k=3))
+                + "_"
+            )
+
+        domain = self.get_domain()
+
+        if len(previous) < 10_000:
+            previous.append(domain)
+        else:
+            previous[self.rand.randrange(len(previous))] = domain
+
+        if kind == "hosts":
+            return f"0.0.0.0 {domain}"
+
+        if kind == "hosts_localhost":
+            return f"127.0.0.1\t{domain}"
+
+        if kind == "inline_comment":
+            return f"{domain} # {self.get_label()}"
+
+        if kind == "www":
+            return f"www.{domain}"
+
+        return domain
+
+    def write(self, destination: str, lines: int) -> int:
+        """
+        Writes the given number of lines into the given destination.
+
+        :return:
+            The number of written bytes.
+        """
+
+        previous = []
+        written = 0
+
+        with open(destination, "w", encoding="utf-8") as file_stream:
+            for _ in range(lines):
+                written += file_stream.write(self.get_line(previous) + "\n")
+
+        return written
+
+    def get_whitelist(self, source: str, rules: int = 500) -> List[str]:
+        """
+        Provides a whitelist which matches a (small) part of the given input.
+        """
+
+        result: Set[str] = set()
+
+        with open(source, "r", encoding="utf-8") as file_stream:
+            for line in file_stream:
+                line = line.split("#", 1)[0].strip()
+
+                if not line or self.rand.random() > 0.01:
+                    continue
+
+                subject = line.split()[-1]
+
+                if self.rand.random() < 0.2:
+                    result.add(f"ALL .{subject.split('.', 1)[-1]}")
+                else:
+                    result.add(subject)
+
+                if len(result) >= rules:
+                    break
+
+        return sorted(result)
+
+    @staticmethod
+    def get_iana_database() -> str:
+        """
+        Provides a (JSON) root zone database covering our TLDs.
+        """
+
+        return json.dumps(
+            {
+                x.rsplit(".", 1)[-1]: f"whois.nic.{x.rsplit('.', 1)[-1]}"
+                for x in TLD_WEIGHTS
+            }
+        )
+
+    @staticmethod
+    def get_public_suffix_database() -> str:
+        """
+        Provides a (JSON) public suffix database covering our TLDs.
+        """
+
+        result = {}
+
+        for tld in TLD_WEIGHTS:
+            result.setdefault(tld.rsplit(".", 1)[-1], []).append(tld)
+
+        return json.dumps(result)
+
+    @staticmethod
+    def get_user_agents() -> str:
+        """
+        Provides a (JSON) user agent database.
+        """
+
+        return json.dumps(
+            {
+                "chrome": {
+                    "linux": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+                }
+            }
+        )
@@ -0,0 +1,183 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides the benchmark of our whitelist matcher.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import argparse
+import itertools
+import json
+import random
+import time
+from typing import Callable, Iterable, List
+
+from ultimate_hosts_blacklist.whitelist.core import _is_whitelisted
+from ultimate_hosts_blacklist.whitelist.parser import Parser as whitelist_parser
+
+from ultimate_hosts_blacklist.test_launcher.helpers.whitelist import WhitelistHelper
+from ultimate_hosts_blacklist.test_launcher.helpers.whitelist_matcher import (
+    WhitelistMatcher,
+)
+
+TLDS: List[str] = ["com", "net", "org", "info", "ru", "de", "co.uk", "xyz", "io"]
+
+
+def get_offline_parser() -> whitelist_parser:
+    """
+    Provides a whitelist parser which doesn't download the root zone
+    database. Our synthetic rules don't need it.
+    """
+
+    parser = whitelist_parser.__new__(whitelist_parser)
+    parser.no_complement = False
+    parser.rzdb = []
+
+    return parser
+
+
+def generate_rules(count: int, rand: random.Random) -> List[str]:
+    """
+    Generates a synthetic whitelist list.
+    """
+
+    result = []
+
+    for index in range(count):
+        domain = f"rule{index}.{rand.choice(TLDS)}"
+        kind = rand.random()
+
+        if kind < 0.80:
+            result.append(domain)
+        elif kind < 0.97:
+            result.append(f"ALL .{domain}")
+        else:
+            result.append(rf"REG ^ads{index}\.")
+
+    return result + WhitelistHelper.get_special_rules()
+
+
+def generate_lines(count: int, rules: int, rand: random.Random) -> List[str]:
+    """
+    Generates synthetic subjects. Some of them match our synthetic rules.
+    """
+
+    result = []
+
+    for index in range(count):
+        kind = rand.random()
+
+        if kind < 0.05:
+            result.append(f"rule{rand.randrange(rules)}.{rand.choice(TLDS)}")
+        elif kind < 0.10:
+            result.append(f"sub.rule{rand.randrange(rules)}.{rand.choice(TLDS)}")
+        elif kind < 0.12:
+            result.append(f"ads{rand.randrange(rules)}.example.com")
+        elif kind < 0.15:
+            result.append(".".join(str(rand.randrange(256)) for _ in range(4)))
+        else:
+            result.append(
+                f"host{index}.example{rand.randrange(1000)}.{rand.choice(TLDS)}"
+            )
+
+    return result
+
+
+def measure(func: Callable[[str], bool], lines: Iterable[str], count: int) -> float:
+    """
+    Provides the number of lines per second the given function can handle.
+    """
+
+    start = time.perf_counter()
+
+    for line in itertools.islice(lines, count):
+        func(line)
+
+    return count / (time.perf_counter() - start)
+
+
+def benchmark() -> None:
+    """
+    Compares the throughput of our matcher with the whitelist tool.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Compares our whitelist matcher with the whitelist tool."
+    )
+
+    parser.add_argument("--lines", type=int, default=10_000_000)
+    parser.add_argument(
+        "--reference-lines",
+        type=int,
+        default=100_000,
+        help="The number of lines to give to the (much slower) whitelist tool.",
+    )
+    parser.add_argument("--rules", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+
+    args = parser.parse_args()
+    rand = random.Random(args.seed)
+
+    manifest = get_offline_parser().parse(generate_rules(args.rules, rand))
+    matcher = WhitelistMatcher(manifest)
+
+    # We cycle through a pool in order to not hold all lines in memory.
+    pool = generate_lines(min(args.lines, 1_000_000), args.rules, rand)
+
+    for line in pool[: args.reference_lines]:
+        if matcher.is_whitelisted(line) != _is_whitelisted(line, manifest)[0]:
+            raise AssertionError(f"Results differ for {line!r}.")
+
+    reference = measure(
+        lambda x: _is_whitelisted(x, manifest)[0],
+        itertools.cycle(pool),
+        min(args.reference_lines, args.lines),
+    )
+    ours = measure(matcher.is_whitelisted, itertools.cycle(pool), args.lines)
+
+    print(
+        json.dumps(
+            {
+                "lines": args.lines,
+                "rules": args.rules,
+                "whitelist_tool_lines_per_second": round(reference),
+                "matcher_lines_per_second": round(ours),
+                "speedup": round(ours / reference, 2),
+            },
+            indent=4,
+        )
+    )
+
+
+if __name__ == "__main__":
+    benchmark()
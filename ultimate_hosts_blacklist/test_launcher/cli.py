@@ -40,33 +40,9 @@ import logging
 import os
 
 import colorama
-import PyFunceble.facility
-import PyFunceble.storage
-from PyFunceble import __version__ as pyfunceble_version
-from PyFunceble.helpers.directory import DirectoryHelper
-from PyFunceble.helpers.merge import Merge
 
 from ultimate_hosts_blacklist.test_launcher import __version__
-from ultimate_hosts_blacklist.test_launcher.administration import Administration
-from ultimate_hosts_blacklist.test_launcher.authorization import Authorization
-from ultimate_hosts_blacklist.test_launcher.cleaner.infrastructure import (
-    InfrastructureCleaner,
-)
 from ultimate_hosts_blacklist.test_launcher.defaults import outputs
-from ultimate_hosts_blacklist.test_launcher.defaults import (
-    pyfunceble as pyfunceble_defaults,
-)
-from ultimate_hosts_blacklist.test_launcher.orchester import Orchestration
-from ultimate_hosts_blacklist.test_launcher.updater.infrastructure_files import (
-    InfrastructureFilesUpdater,
-)
-from ultimate_hosts_blacklist.test_launcher.updater.output_files import (
-    OutputFilesUpdater,
-)
-from ultimate_hosts_blacklist.test_launcher.updater.readme import ReadmeUpdater
-from ultimate_hosts_blacklist.test_launcher.updater.requirements import (
-    RequirementsUpdater,
-)
 
 
 def tool() -> None:
@@ -74,6 +50,12 @@ def tool() -> None:
     This it the entrypoint of the CLI.
     """
 
+    # pylint: disable=import-outside-toplevel
+    #
+    # Our heavy dependencies (PyFunceble, PyGithub, the whitelist tool, ...)
+    # are only imported once we know that we have some work to do. That way,
+    # --version or a missing administration file don't pay their import cost.
+
     colorama.init(autoreset=True)
 
     parser = argparse.ArgumentParser(
@@ -90,6 +72,25 @@ def tool() -> None:
         default=False,
     )
 
+    parser.add_argument(
+        "-p",
+        "--profile",
+        help="Profiles the launcher and all its workers. The (merged) profiles are "
+        "written into the given directory. %(const)r if no directory is given.",
+        nargs="?",
+        const=outputs.PROFILE_DIRECTORY,
+        default=None,
+    )
+
+    parser.add_argument(
+        "-m",
+        "--memory-profile",
+        help="Reports the peak memory and the top allocation sites of each phase "
+        f"into {outputs.MEMORY_PROFILE_DESTINATION!r}.",
+        action="store_true",
+        default=False,
+    )
+
     parser.add_argument(
         "-v",
         "--version",
@@ -102,59 +103,153 @@ def tool() -> None:
 
     if args.debug:
         logging_level = logging.DEBUG
-        PyFunceble.facility.Logger.activated = True
-        PyFunceble.facility.Logger.min_level = "info"
-        PyFunceble.facility.Logger.init_loggers()
     else:
         logging_level = logging.INFO
-        PyFunceble.facility.Logger.activated = False
 
     logging.basicConfig(
         format="[%(asctime)s::%(levelname)s] %(message)s", level=logging_level
     )
 
     logging.info("Launcher version: %s", __version__)
+
+    if not os.path.isfile(outputs.ADMINISTRATION_DESTINATION):
+        logging.critical(
+            "Administration file (%r) not found.", outputs.ADMINISTRATION_DESTINATION
+        )
+        return
+
+    if not args.profile and not args.memory_profile:
+        launch(args)
+        return
+
+    from ultimate_hosts_blacklist.test_launcher.helpers.memory_profiler import (
+        MemoryProfiler,
+    )
+    from ultimate_hosts_blacklist.test_launcher.helpers.profiler import (
+        ProcessProfiler,
+    )
+
+    if args.profile:
+        ProcessProfiler.prepare(args.profile)
+        ProcessProfiler("main").start()
+
+    if args.memory_profile:
+        MemoryProfiler.start()
+
+    try:
+        launch(args)
+    finally:
+        MemoryProfiler.stop()
+
+        if ProcessProfiler.active is not None:
+            ProcessProfiler.active.stop()
+            ProcessProfiler.merge()
+
+
+def launch(args: argparse.Namespace) -> None:
+    """
+    Launches the test launcher - once we know that we have some work to do.
+
+    :param args:
+        The parsed arguments of the CLI.
+    """
+
+    # pylint: disable=import-outside-toplevel
+
+    import PyFunceble.facility
+    import PyFunceble.storage
+    from PyFunceble import __version__ as pyfunceble_version
+    from PyFunceble.helpers.directory import DirectoryHelper
+    from PyFunceble.helpers.merge import Merge
+
+    from ultimate_hosts_blacklist.test_launcher.administration import Administration
+    from ultimate_hosts_blacklist.test_launcher.authorization import Authorization
+    from ultimate_hosts_blacklist.test_launcher.defaults import (
+        pyfunceble as pyfunceble_defaults,
+    )
+
+    if args.debug:
+        PyFunceble.facility.Logger.activated = True
+        PyFunceble.facility.Logger.min_level = "info"
+        PyFunceble.facility.Logger.init_loggers()
+    else:
+        PyFunceble.facility.Logger.activated = False
+
     logging.info("PyFunceble version: %s", pyfunceble_version)
 
     administration = Administration()
 
-    if administration.exists:
-        DirectoryHelper(outputs.PYFUNCEBLE_CONFIG_DIRECTORY).create()
+    DirectoryHelper(outputs.PYFUNCEBLE_CONFIG_DIRECTORY).create()
+
+    PyFunceble.storage.CONFIG_DIRECTORY = outputs.PYFUNCEBLE_CONFIG_DIRECTORY
+    PyFunceble.facility.ConfigLoader.path_to_config = os.path.join(
+        PyFunceble.storage.CONFIG_DIRECTORY,
+        PyFunceble.storage.CONFIGURATION_FILENAME,
+    )
 
-        PyFunceble.storage.CONFIG_DIRECTORY = outputs.PYFUNCEBLE_CONFIG_DIRECTORY
-        PyFunceble.facility.ConfigLoader.path_to_config = os.path.join(
-            PyFunceble.storage.CONFIG_DIRECTORY,
-            PyFunceble.storage.CONFIGURATION_FILENAME,
+    if administration.pyfunceble["config"] and isinstance(
+        administration.pyfunceble["config"], dict
+    ):
+        our_config = Merge(administration.pyfunceble["config"]).into(
+            pyfunceble_defaults.CONFIGURATION, strict=True
         )
+    else:
+        our_config = pyfunceble_defaults.CONFIGURATION
 
-        if administration.pyfunceble["config"] and isinstance(
-            administration.pyfunceble["config"], dict
-        ):
-            our_config = Merge(administration.pyfunceble["config"]).into(
-                pyfunceble_defaults.CONFIGURATION, strict=True
-            )
-        else:
-            our_config = pyfunceble_defaults.CONFIGURATION
+    PyFunceble.facility.ConfigLoader.set_custom_config(our_config).set_merge_upstream(
+        True
+    ).start()
 
-        PyFunceble.facility.ConfigLoader.set_custom_config(
-            our_config
-        ).set_merge_upstream(True).start()
+    authorization = Authorization(administration)
 
-        authorization = Authorization(administration)
+    if authorization.launch:
+        from ultimate_hosts_blacklist.test_launcher.cleaner.infrastructure import (
+            InfrastructureCleaner,
+        )
+        from ultimate_hosts_blacklist.test_launcher.helpers.file import (
+            ChangeAwareFileHelper,
+        )
+        from ultimate_hosts_blacklist.test_launcher.helpers.metrics import (
+            RunMetrics,
+        )
+        from ultimate_hosts_blacklist.test_launcher.orchester import Orchestration
+        from ultimate_hosts_blacklist.test_launcher.updater.infrastructure_files import (  # noqa: E501
+            InfrastructureFilesUpdater,
+        )
+        from ultimate_hosts_blacklist.test_launcher.updater.output_files import (
+            OutputFilesUpdater,
+        )
+        from ultimate_hosts_blacklist.test_launcher.updater.readme import (
+            ReadmeUpdater,
+        )
+        from ultimate_hosts_blacklist.test_launcher.updater.requirements import (
+            RequirementsUpdater,
+        )
 
-        if authorization.launch:
+        with RunMetrics.span("InfrastructureCleaner.start"):
             InfrastructureCleaner().start()
+
+        with RunMetrics.span("RequirementsUpdater.start"):
             RequirementsUpdater(administration).start()
+
+        with RunMetrics.span("InfrastructureFilesUpdater.start"):
             InfrastructureFilesUpdater(administration).start()
+
+        with RunMetrics.span(
+            "OutputFilesUpdater.start", files=[outputs.INPUT_DESTINATION]
+        ):
             OutputFilesUpdater(administration).start()
+
+        with RunMetrics.span("ReadmeUpdater.start"):
             ReadmeUpdater(administration).start()
 
+        ChangeAwareFileHelper.log_report()
+
+        with RunMetrics.span("Orchestration.start"):
             Orchestration(
                 administration=administration,
             ).start()
 
-        administration.save()
-    else:
-        logging.critical(
-            "Administration file (%r) not found.", administration.info_file_location
-        )
+        RunMetrics.save(administration)
+
+    administration.save()
@@ -86,9 +86,27 @@ LINKS: dict = {**CENTRAL_LINKS, **LINKS_DEV}
 MARKERS: dict = {"launch": r"Launch\stest"}
 
 ADMINISTRATION_INDEXES: Dict[str, List[str]] = {
-    "bool": ["currently_under_test"],
-    "int": ["days_until_next_test", "last_test"],
-    "dict": ["custom_pyfunceble_config"],
+    "bool": [
+        "currently_under_test",
+        "streaming_diff",
+        "output_writer_process",
+        "auto_tune_workers",
+        "dns_cache",
+        "parent_zone_short_circuit",
+        "zone_ordering",
+        "wildcard_zone_short_circuit",
+        "dns_rate_limit",
+        "dns_server_selection",
+    ],
+    "int": [
+        "days_until_next_test",
+        "last_test",
+        "diff_memory_limit",
+        "tuned_max_workers",
+        "dns_cache_max_ttl",
+    ],
+    "dict": ["custom_pyfunceble_config", "dns_rate_limits"],
+    "list": ["metrics_history"],
     "datetime": [
         "start_datetime",
         "end_datetime",
@@ -109,6 +127,116 @@ ADMINISTRATION_INDEXES: Dict[str, List[str]] = {
     ],
 }
 
+# The maximum amount of memory (in MiB) the streaming diff is allowed to use
+# while sorting. Can be overwritten through the `diff_memory_limit` index.
+DIFF_MEMORY_LIMIT: int = 256
+
+# The maximum age (in days) of our compiled whitelist, even if the upstream
+# didn't change.
+WHITELIST_CACHE_MAX_AGE: int = 7
+
+# The rules the whitelist tool always appends to the official ones (as of
+# ultimate-hosts-blacklist-whitelist 3.27.4). It doesn't expose them, hence
+# our copy.
+WHITELIST_SPECIAL_RULES: List[str] = [
+    # Match 0.0.0.0–0.255.255.255
+    r"REG ^(0\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",  # noqa: E501
+    # Match 10.0.0.0–10.255.255.255
+    r"REG ^(10\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",  # noqa: E501
+    # Match 100.64.0.0–100.127.255.255
+    r"REG ^(100\.(0?6[4-9]|0?[7-9][0-9]|1[0-1][0-9]|12[0-7])\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",  # noqa: E501
+    # Match 127.0.0.0–127.255.255.255
+    r"REG ^(127\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",  # noqa: E501
+    # Match 169.254.0.0–169.254.255.255
+    r"REG ^(169\.254\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",  # noqa: E501
+    # Match 172.16.0.0–172.31.255.255
+    r"REG ^(172\.(0?1[6-9]|0?2[0-9]|0?3[0-1])\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",  # noqa: E501
+    # Match 192.0.0.0–192.0.0.255
+    r"REG ^(192\.0\.0\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",
+    # Match 192.0.2.0–192.0.2.255
+    r"REG ^(192\.0\.2\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",
+    # Match 192.88.99.0–192.88.99.255
+    r"REG ^(192\.88\.99\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",
+    # Match 192.168.0.0–192.168.255.255
+    r"REG ^(192\.168\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",  # noqa: E501
+    # Match 198.18.0.0–198.19.255.255
+    r"REG ^(198\.(0?1[8-9])\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",  # noqa: E501
+    # Match 198.51.100.0–198.51.100.255
+    r"REG ^(198\.51\.100\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",
+    # Match 203.0.113.0–203.0.113.255
+    r"REG ^(203\.0\.113\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,}))$",
+    # Match 224.0.0.0–239.255.255.255
+    r"REG ^(22[4-9]|23[0-9])\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,})$",  # noqa: E501
+    # Match 240.0.0.0–255.255.255.254
+    r"REG ^(24[0-9]|25[0-5])\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[0-9]{1,}\/[0-9]{1,})$",  # noqa: E501
+    # Match 255.255.255.255
+    r"255.255.255.255",
+]
+
+# The maximum number of (new) subjects we test before all others. Above that,
+# we simply test everything in the normal order.
+PRIORITY_LANE_MAX_SIZE: int = 100_000
+
+# The number of testers the worker tuning starts with, when no previous run
+# recorded its choice (into the `tuned_max_workers` index).
+WORKER_TUNING_START: int = 2
+
+# The maximum number of testers the worker tuning may use - per CPU and in
+# total.
+WORKER_TUNING_MAX_WORKERS_PER_CPU: int = 8
+WORKER_TUNING_MAX_WORKERS: int = 64
+
+# The number of seconds between two decisions of the worker tuning.
+WORKER_TUNING_INTERVAL: float = 30.0
+
+# The number of run summaries we keep into the `metrics_history` index.
+METRICS_HISTORY_SIZE: int = 30
+
+# The maximum number of seconds we keep a DNS answer into our cache - unless
+# overwritten by the `dns_cache_max_ttl` index.
+DNS_CACHE_MAX_TTL: int = 86400
+
+# The maximum number of seconds we keep an empty (NXDOMAIN, NODATA) DNS
+# answer into our cache.
+DNS_CACHE_MAX_NEGATIVE_TTL: int = 3600
+
+# The maximum size (in bytes) of our DNS cache. It is committed along with
+# the rest of the repository, so it has to stay well under the 100 MB GitHub
+# accepts per file.
+DNS_CACHE_MAX_SIZE: int = 50 * 1024 * 1024
+
+# The minimum number of subdomains a registrable domain should have in our
+# input, to be resolved before our tests.
+PARENT_ZONE_MIN_SUBDOMAINS: int = 2
+
+# The minimum number of subdomains a parent should have in our input, to be
+# probed for a wildcard before our tests.
+WILDCARD_ZONE_MIN_SUBDOMAINS: int = 2
+
+# The number of concurrent checks of our zone resolvers.
+ZONE_RESOLVER_THREADS: int = 16
+
+# The rate (queries per second) our DNS rate limiter starts with, for each
+# DNS server a previous run didn't record the rate of (into the
+# `dns_rate_limits` index).
+DNS_RATE_LIMIT_START: float = 50.0
+
+# The minimum and maximum rate (queries per second) of each DNS server.
+DNS_RATE_LIMIT_MIN: float = 1.0
+DNS_RATE_LIMIT_MAX: float = 1000.0
+
+# The rate (queries per second) a healthy response adds to the rate of its
+# DNS server.
+DNS_RATE_LIMIT_INCREASE: float = 0.1
+
+# The weight of the latest query into the rolling latency and error rate of
+# a DNS server.
+DNS_SERVER_SELECTION_ALPHA: float = 0.1
+
+# The share of the queries which try the DNS servers in a random order -
+# instead of the best one first.
+DNS_SERVER_SELECTION_EXPLORATION: float = 0.05
+
 
 REQUIREMENTS_FILE_CONTENT: List[str] = [
     "PyFunceble-dev",
@@ -52,6 +52,12 @@ MANIFEST_FILENAME: str = "MANIFEST.in"
 README_FILENAME: str = "README.md"
 
 PYFUNCEBLE_CONFIG_DIRNAME: str = ".pyfunceble"
+DOWNLOAD_CACHE_FILENAME: str = "uhb_download_cache.json"
+WHITELIST_CACHE_FILENAME: str = "uhb_whitelist_cache.json"
+METRICS_FILENAME: str = "run-metrics.json"
+PRIORITY_LANE_FILENAME: str = "uhb_priority_lane.list"
+DNS_CACHE_FILENAME: str = "uhb_dns_cache.sqlite"
+ZONES_FILENAME: str = "uhb_zones.json"
 
 
 INPUT_DESTINATION: str = os.path.join(CURRENT_DIRECTORY, INPUT_FILENAME)
@@ -68,6 +74,25 @@ OUTPUT_DIRECTORY: str = os.path.join(OUTPUT_ROOT_DIRECTORY, INPUT_FILENAME)
 PYFUNCEBLE_CONFIG_DIRECTORY: str = os.path.join(
     CURRENT_DIRECTORY, PYFUNCEBLE_CONFIG_DIRNAME
 )
+METRICS_DESTINATION: str = os.path.join(OUTPUT_ROOT_DIRECTORY, METRICS_FILENAME)
+MEMORY_PROFILE_DESTINATION: str = os.path.join(
+    OUTPUT_ROOT_DIRECTORY, "memory-profile.json"
+)
+PROFILE_DIRECTORY: str = os.path.join(OUTPUT_ROOT_DIRECTORY, "profile")
+
+DOWNLOAD_CACHE_DESTINATION: str = os.path.join(
+    PYFUNCEBLE_CONFIG_DIRECTORY, DOWNLOAD_CACHE_FILENAME
+)
+WHITELIST_CACHE_DESTINATION: str = os.path.join(
+    PYFUNCEBLE_CONFIG_DIRECTORY, WHITELIST_CACHE_FILENAME
+)
+PRIORITY_LANE_DESTINATION: str = os.path.join(
+    PYFUNCEBLE_CONFIG_DIRECTORY, PRIORITY_LANE_FILENAME
+)
+DNS_CACHE_DESTINATION: str = os.path.join(
+    PYFUNCEBLE_CONFIG_DIRECTORY, DNS_CACHE_FILENAME
+)
+ZONES_DESTINATION: str = os.path.join(PYFUNCEBLE_CONFIG_DIRECTORY, ZONES_FILENAME)
 
 
 TEMP_VOLATIVE_DESTINATION: str = os.path.join(OUTPUT_DIRECTORY, VOLATILE_FILENAME)
@@ -36,8 +36,8 @@ License:
     SOFTWARE.
 """
 
-from PyFunceble.cli.continuous_integration.github_actions import GitHubActions
-from PyFunceble.cli.continuous_integration.jenkins import Jenkins
+import functools
+from typing import Any
 
 LINKS_STABLE: dict = {
     "license": {
@@ -56,56 +56,84 @@ LINKS_DEV: dict = {
 
 LINKS: dict = dict(LINKS_DEV)
 
-CONFIGURATION = {
-    "lookup": {
-        "timeout": 5.0,
-        "reputation": False,
-        "collection": True,
-    },
-    "share_logs": False,
-    "cli_testing": {
-        "whois_db": True,
-        "autocontinue": True,
-        "preload_file": False,
-        "cooldown_time": 0.09,
-        "ci": {
-            "active": Jenkins().guess_all_settings().authorized
-            or GitHubActions().guess_all_settings().authorized,
-            "commit_message": "[Autosave] Testing for Ultimate Hosts Blacklist",
-            "end_commit_message": "[Results] Testing for Ultimate Hosts Blacklist",
-            "max_exec_minutes": 15,
+
+@functools.lru_cache(maxsize=None)
+def is_continuous_integration() -> bool:
+    """
+    Checks if we are running under one of the supported CI engines.
+
+    The detection is only done once - the first time we are asked.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from PyFunceble.cli.continuous_integration.github_actions import GitHubActions
+    from PyFunceble.cli.continuous_integration.jenkins import Jenkins
+
+    return (
+        Jenkins().guess_all_settings().authorized
+        or GitHubActions().guess_all_settings().authorized
+    )
+
+
+def get_configuration() -> dict:
+    """
+    Provides our PyFunceble configuration.
+    """
+
+    return {
+        "lookup": {
+            "timeout": 5.0,
+            "reputation": False,
+            "collection": True,
         },
-        "file_generation": {"hosts": True, "plain": True},
-        "display_mode": {
-            "all": False,
-            "dots": True,
-            "execution_time": True,
-            "less": True,
-            "percentage": True,
-            "quiet": False,
-            "simple": False,
-            "status": "ALL",
+        "share_logs": False,
+        "cli_testing": {
+            "whois_db": True,
+            "autocontinue": True,
+            "preload_file": False,
+            "cooldown_time": 0.09,
+            "ci": {
+                "active": is_continuous_integration(),
+                "commit_message": "[Autosave] Testing for Ultimate Hosts Blacklist",
+                "end_commit_message": "[Results] Testing for Ultimate Hosts Blacklist",
+                "max_exec_minutes": 15,
+            },
+            "file_generation": {"hosts": True, "plain": True},
+            "display_mode": {
+                "all": False,
+                "dots": True,
+                "execution_time": True,
+                "less": True,
+                "percentage": True,
+                "quiet": False,
+                "simple": False,
+                "status": "ALL",
+            },
+            "testing_mode": {
+                "availability": True,
+                "syntax": False,
+                "reputation": False,
+            },
+            "max_workers": 1 if is_continuous_integration() else None,
         },
-        "testing_mode": {
-            "availability": True,
-            "syntax": False,
-            "reputation": False,
+        "collection": {
+            "push": True,
+            "url_base": "https://collection.dead-hosts.funilrys.com",
         },
-        "max_workers": (
-            None
-            if not Jenkins().guess_all_settings().authorized
-            and not GitHubActions().guess_all_settings().authorized
-            else 1
-        ),
-    },
-    "collection": {
-        "push": True,
-        "url_base": "https://collection.dead-hosts.funilrys.com",
-    },
-    "dns": {
-        "server": ["9.9.9.10", "149.112.112.10", "2620:fe::10"],
-        "protocol": "UDP",
-        "follow_server_order": False,
-        "trust_server": True,
-    },
-}
+        "dns": {
+            "server": ["9.9.9.10", "149.112.112.10", "2620:fe::10"],
+            "protocol": "UDP",
+            "follow_server_order": False,
+            "trust_server": True,
+        },
+    }
+
+
+def __getattr__(name: str) -> Any:
+    # Our configuration depends on the CI detection. Therefore, we only build
+    # it the first time somebody asks for it.
+    if name == "CONFIGURATION":
+        globals()[name] = get_configuration()
+        return globals()[name]
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
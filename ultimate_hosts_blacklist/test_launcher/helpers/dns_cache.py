@@ -0,0 +1,349 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+Provides our persistent DNS answer cache.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import contextlib
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, Generator, List, Optional, Tuple
+
+
+class DNSAnswerCache:
+    """
+    Provides a persistent (across runs) cache of DNS answers.
+
+    Answers are kept into a SQLite database, indexed by name and record type,
+    along with their response code, until their TTL expires. Empty answers
+    (NXDOMAIN, NODATA) are kept according to the negative TTL given by the SOA
+    record of the response.
+
+    Each process opens its own connection - the first time it needs it - and
+    writes its new answers in batches. The database is pruned from its
+    expired (and, above :code:`max_size`, its soonest expiring) entries
+    before it is committed, which keeps its size bounded.
+
+    .. note::
+        The database is committed along with the rest of the repository.
+        Therefore, we use a rollback journal: it only exists while an answer
+        is written, unlike the files of the WAL mode, which exist as long as
+        a connection is open.
+
+    :param path:
+        The path of the database.
+    :param max_ttl:
+        The maximum number of seconds we keep an answer.
+    :param max_negative_ttl:
+        The maximum number of seconds we keep an empty answer.
+    :param max_size:
+        The maximum size (in bytes) of the database.
+    """
+
+    BATCH_SIZE: int = 512
+    CACHE_SIZE_KIB: int = 16 * 1024
+    BUSY_TIMEOUT: float = 60.0
+
+    path: Optional[str] = None
+    max_ttl: int = 0
+    max_negative_ttl: int = 0
+    max_size: int = 0
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+    _connection: Optional[sqlite3.Connection] = None
+
+    def __init__(
+        self, path: str, *, max_ttl: int, max_negative_ttl: int, max_size: int
+    ) -> None:
+        self.path = path
+        self.max_ttl = max_ttl
+        self.max_negative_ttl = max_negative_ttl
+        self.max_size = max_size
+
+        self.pending: Dict[Tuple[str, int], Tuple[int, str, int]] = {}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Provides the connection to our database - opened the first time we
+        need it.
+        """
+
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            # An instance is never used by two threads at once, but it may be
+            # closed by another thread than the one which used it (e.g. by our
+            # zone resolvers).
+            self._connection = sqlite3.connect(
+                self.path, timeout=self.BUSY_TIMEOUT, check_same_thread=False
+            )
+
+            self._connection.execute("PRAGMA journal_mode=DELETE")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(f"PRAGMA cache_size=-{self.CACHE_SIZE_KIB}")
+
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS answers ("
+                    "name TEXT NOT NULL, "
+                    "record_type INTEGER NOT NULL, "
+                    "expires INTEGER NOT NULL, "
+                    "answers TEXT NOT NULL, "
+                    "rcode INTEGER NOT NULL DEFAULT 0, "
+                    "PRIMARY KEY (name, record_type)"
+                    ") WITHOUT ROWID"
+                )
+
+                if "rcode" not in (
+                    x[1] for x in self._connection.execute("PRAGMA table_info(answers)")
+                ):
+                    # Databases of previous versions don't have it. Their empty
+                    # answers are considered as NODATA.
+                    self._connection.execute(
+                        "ALTER TABLE answers "
+                        "ADD COLUMN rcode INTEGER NOT NULL DEFAULT 0"
+                    )
+
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS answers_expires ON answers (expires)"
+                )
+
+        return self._connection
+
+    def get(self, name: str, record_type: int) -> Optional[Tuple[List[str], int]]:
+        """
+        Provides the cached answers and response code of the given query.
+
+        :return:
+            :code:`None` when nothing (valid) is cached. An empty list of
+            answers for a cached empty answer.
+        """
+
+        now = int(time.time())
+
+        if (name, record_type) in self.pending:
+            row = self.pending[(name, record_type)]
+        else:
+            try:
+                row = self.connection.execute(
+                    "SELECT expires, answers, rcode FROM answers "
+                    "WHERE name = ? AND record_type = ?",
+                    (name, record_type),
+                ).fetchone()
+            except sqlite3.OperationalError:
+                # The database is locked (e.g. while it is committed). We
+                # simply ask the DNS.
+                row = None
+
+        if row is None or row[0] <= now:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return (row[1].split("\n") if row[1] else [], row[2])
+
+    def set(
+        self,
+        name: str,
+        record_type: int,
+        answers: List[str],
+        ttl: int,
+        *,
+        rcode: int = 0,
+    ) -> None:
+        """
+        Caches the answers of the given query.
+
+        :param ttl:
+            The TTL given by the DNS. It is capped by our maximums.
+        :param rcode:
+            The response code given by the DNS.
+        """
+
+        ttl = min(ttl, self.max_ttl if answers else self.max_negative_ttl)
+
+        if ttl <= 0:
+            return
+
+        self.pending[(name, record_type)] = (
+            int(time.time()) + ttl,
+            "\n".join(sorted(answers)),
+            rcode,
+        )
+        self.stores += 1
+
+        if len(self.pending) >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes our pending answers.
+        """
+
+        if not self.pending:
+            return
+
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO answers "
+                    "(name, record_type, expires, answers, rcode) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(*key, *value) for key, value in self.pending.items()],
+                )
+        except sqlite3.OperationalError as exception:
+            # Another process is holding the database for too long. We will
+            # try again with our next batch.
+            logging.warning("Could not write into %r: %s", self.path, exception)
+            return
+
+        self.pending.clear()
+
+    def get_size(self) -> int:
+        """
+        Provides the size (in bytes) of the answers of our database - without
+        its free pages.
+        """
+
+        page_size, page_count, freelist_count = (
+            self.connection.execute(f"PRAGMA {x}").fetchone()[0]
+            for x in ("page_size", "page_count", "freelist_count")
+        )
+
+        return page_size * (page_count - freelist_count)
+
+    def prune(self) -> int:
+        """
+        Removes the expired answers and, when we are over our maximum size,
+        the ones which expire the soonest. The database is then compacted.
+
+        :return:
+            The number of removed answers.
+        """
+
+        self.flush()
+
+        with self.connection:
+            removed = self.connection.execute(
+                "DELETE FROM answers WHERE expires <= ?", (int(time.time()),)
+            ).rowcount
+
+            size = self.get_size()
+
+            if size > self.max_size:
+                count = self.connection.execute(
+                    "SELECT COUNT(*) FROM answers"
+                ).fetchone()[0]
+
+                # We keep some room, so that we don't have to prune at each
+                # commit.
+                over = count - int(count * self.max_size * 0.9 / size)
+
+                removed += self.connection.execute(
+                    "DELETE FROM answers WHERE (name, record_type) IN ("
+                    "SELECT name, record_type FROM answers ORDER BY expires LIMIT ?"
+                    ")",
+                    (over,),
+                ).rowcount
+
+        if removed:
+            self.connection.execute("VACUUM")
+
+        logging.info("Pruned %d answer(s) from %r.", removed, self.path)
+
+        return removed
+
+    @contextlib.contextmanager
+    def locked(self) -> Generator[None, None, None]:
+        """
+        Holds an exclusive lock on our database while the context runs - so
+        that nobody writes into it while it is committed.
+        """
+
+        self.flush()
+
+        if not os.path.isfile(self.path):
+            yield
+            return
+
+        connection = sqlite3.connect(
+            self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None
+        )
+
+        try:
+            connection.execute("BEGIN EXCLUSIVE")
+            yield
+        finally:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+
+            connection.close()
+
+    def clone(self) -> "DNSAnswerCache":
+        """
+        Provides a new cache - with its own connection - over the same
+        database.
+        """
+
+        return type(self)(
+            self.path,
+            max_ttl=self.max_ttl,
+            max_negative_ttl=self.max_negative_ttl,
+            max_size=self.max_size,
+        )
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Provides the hits, misses and stores of the current process.
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "stores": self.stores}
+
+    def close(self) -> None:
+        """
+        Writes our pending answers and closes our connection.
+        """
+
+        self.flush()
+
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,332 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our cached download helper.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import concurrent.futures
+import hashlib
+import os
+from typing import Any, Iterable, List, Optional, Tuple
+
+import PyFunceble.helpers.exceptions
+import requests
+from PyFunceble.helpers.dict import DictHelper
+from PyFunceble.helpers.directory import DirectoryHelper
+from PyFunceble.helpers.file import FileHelper
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ultimate_hosts_blacklist.test_launcher.defaults import outputs
+
+
+class PooledDownloadHelper:
+    """
+    Provides a way to download several URLs concurrently over a single
+    pooled HTTP session.
+
+    :param max_workers:
+        The maximum number of downloads to run at the same time.
+    :param timeout:
+        The timeout (in seconds) to apply to each download.
+    :param retries:
+        The number of time we have to retry a download before raising an
+        exception.
+    """
+
+    RETRY_STATUS_CODES: List[int] = [429, 500, 502, 503, 504]
+
+    max_workers: int = 8
+    timeout: float = 30.0
+    retries: int = 3
+
+    _session: Optional[requests.Session] = None
+
+    def __init__(
+        self,
+        *,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+    ) -> None:
+        if max_workers is not None:
+            self.max_workers = max_workers
+
+        if timeout is not None:
+            self.timeout = timeout
+
+        if retries is not None:
+            self.retries = retries
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Provides the session shared by all our downloads.
+        """
+
+        if not self._session:
+            self._session = requests.Session()
+
+            adapter = HTTPAdapter(
+                pool_connections=self.max_workers,
+                pool_maxsize=self.max_workers,
+                max_retries=Retry(
+                    total=self.retries,
+                    backoff_factor=1,
+                    status_forcelist=self.RETRY_STATUS_CODES,
+                    raise_on_status=False,
+                ),
+            )
+
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+
+        return self._session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a GET request through our session.
+
+        :raise UnableToDownload: When we could not reach the URL.
+        """
+
+        kwargs.setdefault("timeout", self.timeout)
+
+        try:
+            return self.session.get(url, **kwargs)
+        except requests.exceptions.RequestException as exception:
+            raise PyFunceble.helpers.exceptions.UnableToDownload(
+                f"{url} (could not resolve?)"
+            ) from exception
+
+    def download_text(self, url: str, *, destination: Optional[str] = None) -> str:
+        """
+        Downloads the body of the given URL.
+
+        .. note::
+            if :code:`destination` is set to :code:`None`,
+            we only return the output.
+
+            Otherwise, we save the output into the given
+            destination, but we also return the output.
+
+        :param url: The URL to download.
+        :param destination: The download destination.
+
+        :raise UnableToDownload: When we could not download the URL.
+        """
+
+        req = self.get(url)
+
+        if req.status_code != 200:
+            raise PyFunceble.helpers.exceptions.UnableToDownload(
+                f"{req.url} (retries: {self.retries} | status code: {req.status_code})"
+            )
+
+        if destination:
+            FileHelper(destination).write(req.text, overwrite=True)
+
+        return req.text
+
+    def download_many(
+        self, downloads: Iterable[Tuple[str, Optional[str]]]
+    ) -> List[str]:
+        """
+        Downloads the given URLs concurrently.
+
+        :param downloads:
+            The :code:`(url, destination)` pairs to download.
+
+        :return:
+            The bodies of the given URLs, in the given order.
+
+        :raise UnableToDownload: When we could not download one of the URLs.
+        """
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor:
+            futures = [
+                executor.submit(self.download_text, url, destination=destination)
+                for url, destination in downloads
+            ]
+
+            return [x.result() for x in futures]
+
+
+class CachedDownloadHelper:
+    """
+    Provides a download helper which keeps track of what it previously
+    downloaded, so that the upstream can tell us when nothing changed.
+
+    The cache is only persisted when :meth:`save` is called. That way, a
+    caller which crashes while processing the downloaded content will process
+    it again on the next run.
+
+    :param url:
+        The URL to download.
+    :param cache_file:
+        The file to store our cache into.
+    :param downloader:
+        The pooled downloader to go through.
+    """
+
+    HASH_ALGO: str = "sha256"
+    CHUNK_SIZE: int = 64 * 1024
+
+    url: Optional[str] = None
+    cache_file: Optional[str] = None
+    downloader: Optional[PooledDownloadHelper] = None
+
+    _cache: Optional[dict] = None
+    _pending: Optional[dict] = None
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        cache_file: str = outputs.DOWNLOAD_CACHE_DESTINATION,
+        downloader: Optional[PooledDownloadHelper] = None,
+    ) -> None:
+        self.url = url
+        self.cache_file = cache_file
+        self.downloader = downloader or PooledDownloadHelper()
+
+        self._pending = {}
+
+    @property
+    def cache(self) -> dict:
+        """
+        Provides the whole (persisted) cache.
+        """
+
+        if self._cache is None:
+            self._cache = DictHelper().from_json_file(self.cache_file) or {}
+
+        return self._cache
+
+    @property
+    def entry(self) -> dict:
+        """
+        Provides the cache entry of the current URL.
+        """
+
+        return {**self.cache.get(self.url, {}), **self._pending}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Provides the given key of the cache entry of the current URL.
+        """
+
+        return self.entry.get(key, default)
+
+    def set(self, key: str, value: Any) -> "CachedDownloadHelper":
+        """
+        Sets the given key of the cache entry of the current URL.
+
+        .. note::
+            The value is only persisted when :meth:`save` is called.
+        """
+
+        self._pending[key] = value
+
+        return self
+
+    def download(self, destination: str, *, conditional: bool = True) -> bool:
+        """
+        Downloads the set URL into the given destination.
+
+        :param destination:
+            The download destination.
+        :param conditional:
+            Whether we are allowed to ask the upstream to only send the
+            content when it changed since our last recorded download.
+
+        :return:
+            :code:`False` when we are allowed to be conditional and the
+            upstream content is identical to the last recorded one.
+            :code:`True` otherwise.
+
+        :raise UnableToDownload: When we could not download the URL.
+        """
+
+        headers = {"Accept-Encoding": "gzip"}
+
+        if conditional:
+            if self.get("etag"):
+                headers["If-None-Match"] = self.get("etag")
+
+            if self.get("last_modified"):
+                headers["If-Modified-Since"] = self.get("last_modified")
+
+        req = self.downloader.get(self.url, headers=headers, stream=True)
+
+        with req:
+            if conditional and req.status_code == 304:
+                return False
+
+            if req.status_code != 200:
+                raise PyFunceble.helpers.exceptions.UnableToDownload(
+                    f"{req.url} (status code: {req.status_code})"
+                )
+
+            digest = hashlib.new(self.HASH_ALGO)
+
+            with FileHelper(destination).open("wb") as file_stream:
+                # iter_content takes care of the transfer decoding (gzip).
+                for chunk in req.iter_content(chunk_size=self.CHUNK_SIZE):
+                    digest.update(chunk)
+                    file_stream.write(chunk)
+
+            content_hash = digest.hexdigest()
+            unchanged = conditional and content_hash == self.get("hash")
+
+            self.set("etag", req.headers.get("ETag"))
+            self.set("last_modified", req.headers.get("Last-Modified"))
+            self.set("hash", content_hash)
+
+        return not unchanged
+
+    def save(self) -> "CachedDownloadHelper":
+        """
+        Persists the cache entry of the current URL.
+        """
+
+        self.cache[self.url] = self.entry
+        self._pending = {}
+
+        DirectoryHelper(os.path.dirname(self.cache_file)).create()
+        DictHelper(self.cache).to_json_file(self.cache_file)
+
+        return self
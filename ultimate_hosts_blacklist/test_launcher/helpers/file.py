@@ -0,0 +1,177 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our change-aware file helper.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Optional, Union
+
+from PyFunceble.helpers.directory import DirectoryHelper
+from PyFunceble.helpers.file import FileHelper
+
+
+class ChangeAwareFileHelper(FileHelper):
+    """
+    Provides a file helper which only writes a file when its content
+    actually changed.
+
+    Avoiding needless writes keeps the mtime of our files (and therefore the
+    stat cache of git) intact.
+
+    The number of avoided writes is shared between all instances, so that
+    we can report them at the end of a run.
+    """
+
+    HASH_ALGO: str = "sha256"
+    CHUNK_SIZE: int = 64 * 1024
+
+    skipped_files: int = 0
+    skipped_bytes: int = 0
+    written_files: int = 0
+    written_bytes: int = 0
+
+    def get_hash(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Provides the hash of the content of the given file (streamed).
+
+        :param path:
+            The file to hash. Defaults to the current path.
+        """
+
+        path = path or self.path
+
+        if not os.path.isfile(path):
+            return None
+
+        digest = hashlib.new(self.HASH_ALGO)
+
+        with open(path, "rb") as file_stream:
+            for block in iter(lambda: file_stream.read(self.CHUNK_SIZE), b""):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def is_same_as(self, data: Union[str, bytes], *, encoding: str = "utf-8") -> bool:
+        """
+        Checks if the content of the current path is the given data.
+        """
+
+        if isinstance(data, str):
+            data = data.encode(encoding)
+
+        if not self.exists() or self.get_size() != len(data):
+            return False
+
+        return self.get_hash() == hashlib.new(self.HASH_ALGO, data).hexdigest()
+
+    @classmethod
+    def record(cls, *, size: int, written: bool) -> None:
+        """
+        Records a (skipped) write.
+        """
+
+        if written:
+            cls.written_files += 1
+            cls.written_bytes += size
+        else:
+            cls.skipped_files += 1
+            cls.skipped_bytes += size
+
+    def write_if_changed(self, data: str, *, encoding: str = "utf-8") -> bool:
+        """
+        Writes the given data, unless the current content is already the
+        given one.
+
+        :return:
+            Whether we wrote the file.
+        """
+
+        encoded = data.encode(encoding)
+
+        if self.is_same_as(encoded):
+            self.record(size=len(encoded), written=False)
+            return False
+
+        DirectoryHelper(os.path.dirname(self.path)).create()
+
+        with self.open("wb") as file_stream:
+            file_stream.write(encoded)
+
+        self.record(size=len(encoded), written=True)
+        return True
+
+    def replace_if_changed(self, source: str) -> bool:
+        """
+        Replaces the current path with the given (freshly produced) file,
+        unless both have the same content. The given file is removed in any
+        case.
+
+        :return:
+            Whether we replaced the file.
+        """
+
+        size = os.path.getsize(source)
+
+        if (
+            self.exists()
+            and self.get_size() == size
+            and self.get_hash() == self.get_hash(source)
+        ):
+            os.remove(source)
+
+            self.record(size=size, written=False)
+            return False
+
+        os.replace(source, self.path)
+
+        self.record(size=size, written=True)
+        return True
+
+    @classmethod
+    def log_report(cls) -> None:
+        """
+        Logs the number of writes we performed and avoided.
+        """
+
+        logging.info(
+            "Written: %d file(s) (%d bytes) | Skipped (unchanged): %d file(s) "
+            "(%d bytes)",
+            cls.written_files,
+            cls.written_bytes,
+            cls.skipped_files,
+            cls.skipped_bytes,
+        )
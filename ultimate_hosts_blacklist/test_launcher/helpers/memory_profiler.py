@@ -0,0 +1,228 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+Provides our memory profiler.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import contextlib
+import json
+import linecache
+import logging
+import os
+import sys
+import tracemalloc
+from typing import Generator, List, Optional
+
+from ultimate_hosts_blacklist.test_launcher.defaults import outputs
+
+
+class MemoryProfiler:
+    """
+    Provides the memory profile of each phase of a run.
+
+    While active, every phase (see our run metrics spans) takes an
+    allocation snapshot when it starts and when it ends. For each phase, we
+    report the peak of the traced memory and the allocation sites which
+    grew the most.
+
+    Allocation sites are reported relative to the import paths, and
+    everything is sorted. That way, the report of two runs can be compared
+    with a simple diff.
+
+    .. note::
+        Only the launcher process is traced. Forked processes (our workers)
+        stop tracing right away.
+    """
+
+    TOP_LIMIT: int = 15
+    NFRAME: int = 1
+
+    IGNORED_FILES: List[str] = [
+        tracemalloc.__file__,
+        linecache.__file__,
+        "<frozen importlib._bootstrap>",
+        "<frozen importlib._bootstrap_external>",
+        "<unknown>",
+    ]
+
+    active: bool = False
+
+    phases: List[dict] = []
+    open_peaks: List[int] = []
+
+    @classmethod
+    def start(cls) -> None:
+        """
+        Starts the tracing of our allocations.
+        """
+
+        tracemalloc.start(cls.NFRAME)
+        os.register_at_fork(after_in_child=tracemalloc.stop)
+
+        cls.active = True
+
+    @classmethod
+    def filter_snapshot(cls, snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+        """
+        Removes the allocations we don't want to report from the given
+        snapshot.
+
+        .. warning::
+            Filtering allocates a (traced) copy of the snapshot. Therefore, we
+            only filter once the phase is measured.
+        """
+
+        return snapshot.filter_traces(
+            [tracemalloc.Filter(False, x) for x in cls.IGNORED_FILES]
+        )
+
+    @staticmethod
+    def get_site(filename: str, lineno: int) -> str:
+        """
+        Provides the (comparable) name of the given allocation site.
+        """
+
+        candidates = [
+            x
+            for x in sys.path
+            if x and filename.startswith(os.path.join(os.path.abspath(x), ""))
+        ]
+
+        if candidates:
+            filename = os.path.relpath(
+                filename, os.path.abspath(max(candidates, key=len))
+            )
+
+        return f"{filename}:{lineno}"
+
+    @classmethod
+    def fold_peak(cls) -> None:
+        """
+        Folds the current peak into all opened phases, and resets it.
+        """
+
+        _, peak = tracemalloc.get_traced_memory()
+
+        cls.open_peaks[:] = [max(x, peak) for x in cls.open_peaks]
+        tracemalloc.reset_peak()
+
+    @classmethod
+    @contextlib.contextmanager
+    def phase(cls, name: str) -> Generator[None, None, None]:
+        """
+        Records the memory profile of what runs inside the context.
+
+        :param name:
+            The name of the phase.
+        """
+
+        if not cls.active:
+            yield
+            return
+
+        cls.fold_peak()
+        cls.open_peaks.append(0)
+
+        current, _ = tracemalloc.get_traced_memory()
+        start_snapshot = tracemalloc.take_snapshot()
+
+        try:
+            yield
+        finally:
+            end, _ = tracemalloc.get_traced_memory()
+
+            cls.fold_peak()
+            peak = cls.open_peaks.pop()
+
+            end_snapshot = tracemalloc.take_snapshot()
+
+            top_growth = [
+                {
+                    "site": cls.get_site(
+                        x.traceback[0].filename, x.traceback[0].lineno
+                    ),
+                    "size_diff": x.size_diff,
+                    "count_diff": x.count_diff,
+                }
+                for x in cls.filter_snapshot(end_snapshot).compare_to(
+                    cls.filter_snapshot(start_snapshot), "lineno"
+                )
+                if x.size_diff > 0
+            ]
+
+            del start_snapshot, end_snapshot
+
+            top_growth.sort(key=lambda x: (-x["size_diff"], x["site"]))
+
+            cls.phases.append(
+                {
+                    "name": name,
+                    "start": current,
+                    "end": end,
+                    "peak": peak,
+                    "top_growth": top_growth[: cls.TOP_LIMIT],
+                }
+            )
+
+            logging.debug("Memory profile of %r: peak %d bytes.", name, peak)
+
+    @classmethod
+    def stop(cls, destination: Optional[str] = None) -> None:
+        """
+        Stops the tracing of our allocations and writes our report.
+
+        :param destination:
+            Where to write our report. Defaults to our output directory.
+        """
+
+        if not cls.active:
+            return
+
+        destination = destination or outputs.MEMORY_PROFILE_DESTINATION
+
+        cls.fold_peak()
+        tracemalloc.stop()
+        cls.active = False
+
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+        with open(destination, "w", encoding="utf-8") as file_stream:
+            json.dump(
+                {"top_limit": cls.TOP_LIMIT, "phases": cls.phases},
+                file_stream,
+                indent=4,
+            )
+            file_stream.write("\n")
+
+        logging.info("Memory profile written into %r.", destination)
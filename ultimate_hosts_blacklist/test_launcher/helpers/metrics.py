@@ -0,0 +1,277 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+Provides our run metrics helper.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Generator, List, Optional
+
+from ultimate_hosts_blacklist.test_launcher import __version__
+from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure, outputs
+from ultimate_hosts_blacklist.test_launcher.helpers.memory_profiler import (
+    MemoryProfiler,
+)
+
+if TYPE_CHECKING:
+    from ultimate_hosts_blacklist.test_launcher.administration import Administration
+
+
+class RunMetrics:
+    """
+    Provides the timing and resource usage of the phases of a run.
+
+    Like the write report of our file helper, the recorded spans are shared
+    between all callers, so that every phase can record itself without
+    having to pass anything around.
+
+    .. note::
+        The CPU time includes the terminated child processes (our testers
+        and producers). The peak RSS is the high-water mark of the biggest
+        process at the end of the span. The bytes read and written are the
+        ones of the launcher process itself.
+    """
+
+    PROC_IO_FILE: str = "/proc/self/io"
+
+    spans: List[dict] = []
+    sections: Dict[str, dict] = {}
+    started_at: float = time.monotonic()
+    recorded: bool = False
+
+    @classmethod
+    def get_io_counters(cls) -> dict:
+        """
+        Provides the number of bytes the current process read and wrote.
+        """
+
+        result = {"read": None, "written": None}
+
+        try:
+            with open(cls.PROC_IO_FILE, "r", encoding="utf-8") as file_stream:
+                counters = dict(
+                    x.split(":", 1) for x in file_stream.read().splitlines() if x
+                )
+        except (OSError, ValueError):
+            return result
+
+        result["read"] = int(counters.get("rchar", 0))
+        result["written"] = int(counters.get("wchar", 0))
+
+        return result
+
+    @staticmethod
+    def get_peak_rss() -> int:
+        """
+        Provides the peak RSS (in bytes) of the current process or its
+        biggest terminated child.
+        """
+
+        peak = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        )
+
+        if sys.platform == "darwin":
+            return peak
+        return peak * 1024
+
+    @staticmethod
+    def get_cpu_time() -> float:
+        """
+        Provides the CPU time consumed by the current process and its
+        terminated children.
+        """
+
+        return sum(
+            x.ru_utime + x.ru_stime
+            for x in (
+                resource.getrusage(resource.RUSAGE_SELF),
+                resource.getrusage(resource.RUSAGE_CHILDREN),
+            )
+        )
+
+    @staticmethod
+    def count_lines(file: str) -> Optional[int]:
+        """
+        Counts the number of lines of the given file.
+        """
+
+        if not os.path.isfile(file):
+            return None
+
+        result = 0
+
+        with open(file, "rb") as file_stream:
+            for block in iter(lambda: file_stream.read(1024 * 1024), b""):
+                result += block.count(b"\n")
+
+        return result
+
+    @classmethod
+    @contextlib.contextmanager
+    def span(
+        cls, name: str, *, files: Optional[List[str]] = None
+    ) -> Generator[dict, None, None]:
+        """
+        Records the timing and resource usage of what runs inside the
+        context. Can also be used as a decorator.
+
+        :param name:
+            The name of the span.
+        :param files:
+            The files to count the lines of, once the span is over.
+        """
+
+        result = {"name": name}
+
+        io_before = cls.get_io_counters()
+        cpu_before = cls.get_cpu_time()
+        wall_before = time.monotonic()
+
+        try:
+            with MemoryProfiler.phase(name):
+                yield result
+        finally:
+            result["wall"] = round(time.monotonic() - wall_before, 4)
+            result["cpu"] = round(cls.get_cpu_time() - cpu_before, 4)
+            result["peak_rss"] = cls.get_peak_rss()
+
+            io_after = cls.get_io_counters()
+
+            for key in ("read", "written"):
+                if io_after[key] is None:
+                    result[f"bytes_{key}"] = None
+                else:
+                    result[f"bytes_{key}"] = io_after[key] - io_before[key]
+
+            if files:
+                result["lines"] = {
+                    os.path.basename(x): cls.count_lines(x) for x in files
+                }
+
+            cls.spans.append(result)
+
+            logging.debug("Span %r: %r", name, result)
+
+    @classmethod
+    def set_section(cls, name: str, data: dict) -> None:
+        """
+        Sets a section of our report - for the statistics which are not
+        related to a single phase.
+
+        :param name:
+            The name of the section.
+        :param data:
+            The (JSON serializable) statistics.
+        """
+
+        cls.sections[name] = data
+
+    @classmethod
+    def get_report(cls) -> dict:
+        """
+        Provides the full report of the current run.
+        """
+
+        return {
+            "version": __version__,
+            "generated_at": datetime.utcnow().isoformat(),
+            "wall": round(time.monotonic() - cls.started_at, 4),
+            "cpu": round(cls.get_cpu_time(), 4),
+            "peak_rss": cls.get_peak_rss(),
+            "spans": cls.spans,
+            **cls.sections,
+        }
+
+    @classmethod
+    def get_summary(cls) -> dict:
+        """
+        Provides the summary of the current run - as we keep it into the
+        history of the administration file.
+        """
+
+        report = cls.get_report()
+
+        return {
+            "date": report["generated_at"],
+            "version": report["version"],
+            "wall": report["wall"],
+            "cpu": report["cpu"],
+            "peak_rss": report["peak_rss"],
+            "spans": {x["name"]: x["wall"] for x in report["spans"]},
+            **cls.sections,
+        }
+
+    @classmethod
+    def write_report(cls, destination: str = outputs.METRICS_DESTINATION) -> None:
+        """
+        Writes the full report of the current run into the given destination.
+        """
+
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+        with open(destination, "w", encoding="utf-8") as file_stream:
+            json.dump(cls.get_report(), file_stream, indent=4)
+            file_stream.write("\n")
+
+        logging.info("Run metrics written into %r.", destination)
+
+    @classmethod
+    def save(cls, administration: "Administration") -> None:
+        """
+        Writes the report and - once per run - appends our summary to the
+        metrics history of the given administration.
+
+        :param administration:
+            A instance of the administration management class.
+        """
+
+        cls.write_report()
+
+        if cls.recorded:
+            return
+
+        history = list(administration.metrics_history or [])
+        history.append(cls.get_summary())
+
+        administration.metrics_history = history[-infrastructure.METRICS_HISTORY_SIZE :]
+        cls.recorded = True
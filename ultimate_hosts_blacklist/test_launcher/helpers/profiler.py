@@ -0,0 +1,234 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+Provides our (cross-process) profiler.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import collections
+import cProfile
+import glob
+import logging
+import os
+import pstats
+import signal
+from types import FrameType
+from typing import Counter, Optional
+
+
+class ProcessProfiler:
+    """
+    Provides the profiler of a single process.
+
+    While running, we keep a deterministic profile (cProfile) of the process
+    and sample its stack every :code:`INTERVAL` seconds of CPU time. Once
+    stopped, both are dumped into the (shared) profile directory, where they
+    can be merged with the ones of the other processes.
+
+    The :code:`directory` class attribute is set (by the CLI, before our
+    workers are forked) when the profiling is requested.
+
+    :param name:
+        The name of the profiled process. It is used as the root frame of
+        our stacks.
+    """
+
+    INTERVAL: float = 0.005
+
+    STATS_EXTENSION: str = ".pstats"
+    COLLAPSED_EXTENSION: str = ".collapsed"
+    MERGED_NAME: str = "merged"
+
+    directory: Optional[str] = None
+    active: Optional["ProcessProfiler"] = None
+
+    name: Optional[str] = None
+    pid: Optional[int] = None
+    profile: Optional[cProfile.Profile] = None
+    samples: Optional[Counter[str]] = None
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.samples = collections.Counter()
+
+    @classmethod
+    def start_if_requested(cls, name: str) -> Optional["ProcessProfiler"]:
+        """
+        Starts and provides a profiler for the current process - if the
+        profiling was requested.
+        """
+
+        if not cls.directory:
+            return None
+
+        return cls(name).start()
+
+    @classmethod
+    def prepare(cls, directory: str) -> None:
+        """
+        Requests the profiling and removes the profiles of a previous run.
+
+        :param directory:
+            The directory to write our profiles into.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+
+        for extension in (cls.STATS_EXTENSION, cls.COLLAPSED_EXTENSION):
+            for file in glob.glob(os.path.join(directory, f"*{extension}")):
+                os.remove(file)
+
+        cls.directory = directory
+
+    @staticmethod
+    def get_frame_name(frame: FrameType) -> str:
+        """
+        Provides the name of the given frame, as we write it into our
+        collapsed stacks.
+        """
+
+        code = frame.f_code
+
+        return (
+            f"{code.co_name} "
+            f"({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        )
+
+    def sample(self, signum: int, frame: Optional[FrameType]) -> None:
+        """
+        Records the stack of the given frame. This is our SIGPROF handler.
+        """
+
+        # pylint: disable=unused-argument
+
+        stack = []
+
+        while frame is not None:
+            stack.append(self.get_frame_name(frame))
+            frame = frame.f_back
+
+        stack.append(self.name)
+
+        self.samples[";".join(reversed(stack))] += 1
+
+    def start(self) -> "ProcessProfiler":
+        """
+        Starts the profiling of the current process.
+        """
+
+        if self.active is not None and self.active.pid != os.getpid():
+            # We were forked while our parent was being profiled. Its profiler
+            # has to be released before we can start ours.
+            self.active.profile.disable()
+
+        signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.INTERVAL, self.INTERVAL)
+
+        self.pid = os.getpid()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+        ProcessProfiler.active = self
+
+        return self
+
+    def stop(self) -> "ProcessProfiler":
+        """
+        Stops the profiling of the current process and writes its profiles.
+        """
+
+        self.profile.disable()
+
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+        ProcessProfiler.active = None
+
+        basename = os.path.join(self.directory, f"{self.name}-{os.getpid()}")
+
+        self.profile.dump_stats(basename + self.STATS_EXTENSION)
+
+        with open(
+            basename + self.COLLAPSED_EXTENSION, "w", encoding="utf-8"
+        ) as file_stream:
+            for stack, count in self.samples.items():
+                file_stream.write(f"{stack} {count}\n")
+
+        return self
+
+    @classmethod
+    def merge(cls) -> None:
+        """
+        Merges the profiles of all processes into a single profile and a
+        single (flamegraph compatible) collapsed stack file.
+        """
+
+        merged_basename = os.path.join(cls.directory, cls.MERGED_NAME)
+
+        stats_files = [
+            x
+            for x in sorted(
+                glob.glob(os.path.join(cls.directory, f"*{cls.STATS_EXTENSION}"))
+            )
+            if not x.startswith(merged_basename + ".")
+        ]
+
+        if stats_files:
+            pstats.Stats(*stats_files).dump_stats(merged_basename + cls.STATS_EXTENSION)
+
+        samples = collections.Counter()
+
+        for file in glob.glob(
+            os.path.join(cls.directory, f"*{cls.COLLAPSED_EXTENSION}")
+        ):
+            if file.startswith(merged_basename + "."):
+                continue
+
+            with open(file, "r", encoding="utf-8") as file_stream:
+                for line in file_stream:
+                    stack, _, count = line.rstrip("\n").rpartition(" ")
+
+                    if stack:
+                        samples[stack] += int(count)
+
+        with open(
+            merged_basename + cls.COLLAPSED_EXTENSION, "w", encoding="utf-8"
+        ) as file_stream:
+            for stack, count in sorted(samples.items()):
+                file_stream.write(f"{stack} {count}\n")
+
+        logging.info(
+            "Merged the profiles of %d process(es) into %r.",
+            len(stats_files),
+            cls.directory,
+        )
@@ -0,0 +1,80 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our public suffix helper.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from typing import Dict, List, Optional, Set
+
+
+class PublicSuffixHelper:
+    """
+    Provides a way to get the registrable domain of a subject - from the
+    public suffix list.
+
+    :param database:
+        The public suffix database - as provided by PyFunceble: the suffixes
+        indexed by their extension.
+    """
+
+    suffixes: Optional[Set[str]] = None
+
+    def __init__(self, database: Dict[str, List[str]]) -> None:
+        self.suffixes = {x.lower() for x in database}
+
+        for suffixes in database.values():
+            self.suffixes.update(x.lower() for x in suffixes)
+
+    def get_registrable_domain(self, subject: str) -> Optional[str]:
+        """
+        Provides the registrable domain of the given subject.
+
+        :return:
+            :code:`None` when the subject is not under a known suffix - or
+            is a suffix itself.
+        """
+
+        subject = subject.lower().rstrip(".")
+
+        if subject in self.suffixes:
+            return None
+
+        labels = subject.split(".")
+
+        # From the longest suffix to the shortest.
+        for index in range(1, len(labels)):
+            if ".".join(labels[index:]) in self.suffixes:
+                return ".".join(labels[index - 1 :])
+
+        return None
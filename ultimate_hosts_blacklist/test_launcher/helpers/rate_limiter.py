@@ -0,0 +1,258 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+Provides our adaptive rate limiter.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import multiprocessing
+import multiprocessing.sharedctypes
+import time
+from typing import Dict, Iterable, Optional
+
+from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure
+
+# The offsets of the fields of a bucket.
+(
+    TOKENS,
+    REFILLED_AT,
+    RATE,
+    DECREASED_AT,
+    STARTED_AT,
+    LAST_AT,
+    QUERIES,
+    FAILURES,
+    WAITED,
+) = range(9)
+
+
+class AdaptiveRateLimiter:
+    """
+    Provides a token bucket per DNS server, whose rate adapts to the health
+    of the server.
+
+    Each healthy response raises the rate of its server a bit (additive
+    increase) while each timeout or SERVFAIL halves it (multiplicative
+    decrease). As the queries in flight at the time of a failure are likely
+    to fail too, we decrease at most once per :code:`DECREASE_INTERVAL`.
+
+    The buckets live into shared memory. Therefore, an instance created
+    before our testers are forked is shared by all of them.
+
+    :param servers:
+        The servers to limit. The other ones are not limited.
+    :param rate:
+        The rate (queries per second) to start with.
+    :param min_rate:
+        The minimum rate.
+    :param max_rate:
+        The maximum rate.
+    :param increase:
+        The rate a healthy response adds.
+    :param rates:
+        The rates to start with, per server. Falls back to :code:`rate`.
+    """
+
+    FIELDS: tuple = (
+        "tokens",
+        "refilled_at",
+        "rate",
+        "decreased_at",
+        "started_at",
+        "last_at",
+        "queries",
+        "failures",
+        "waited",
+    )
+
+    DECREASE_FACTOR: float = 0.5
+    DECREASE_INTERVAL: float = 1.0
+
+    rate: float = infrastructure.DNS_RATE_LIMIT_START
+    min_rate: float = infrastructure.DNS_RATE_LIMIT_MIN
+    max_rate: float = infrastructure.DNS_RATE_LIMIT_MAX
+    increase: float = infrastructure.DNS_RATE_LIMIT_INCREASE
+
+    indexes: Optional[Dict[str, int]] = None
+    state: Optional[multiprocessing.sharedctypes.SynchronizedArray] = None
+
+    def __init__(
+        self,
+        servers: Iterable[str],
+        *,
+        rate: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        increase: Optional[float] = None,
+        rates: Optional[Dict[str, float]] = None,
+    ) -> None:
+        if rate is not None:
+            self.rate = float(rate)
+
+        if min_rate is not None:
+            self.min_rate = float(min_rate)
+
+        if max_rate is not None:
+            self.max_rate = float(max_rate)
+
+        if increase is not None:
+            self.increase = float(increase)
+
+        self.indexes = {
+            x: index * len(self.FIELDS)
+            for index, x in enumerate(dict.fromkeys(servers))
+        }
+        self.state = multiprocessing.Array("d", len(self.indexes) * len(self.FIELDS))
+
+        rates = rates or {}
+
+        for server, index in self.indexes.items():
+            self.state[index + RATE] = min(
+                self.max_rate, max(self.min_rate, float(rates.get(server, self.rate)))
+            )
+            self.state[index + TOKENS] = 1.0
+
+    def acquire(self, server: str) -> float:
+        """
+        Takes a token from the bucket of the given server - and waits for it
+        when the bucket is empty.
+
+        :return:
+            The number of seconds we waited.
+        """
+
+        index = self.indexes.get(server)
+
+        if index is None:
+            return 0.0
+
+        with self.state.get_lock():
+            state = self.state.get_obj()
+            now = time.monotonic()
+            rate = state[index + RATE]
+
+            if not state[index + STARTED_AT]:
+                state[index + STARTED_AT] = now
+
+            # We refill (up to a second of queries) then reserve our token. A
+            # negative balance is the queue of the reserved tokens.
+            tokens = (
+                min(
+                    max(1.0, rate),
+                    state[index + TOKENS] + (now - state[index + REFILLED_AT]) * rate,
+                )
+                - 1.0
+            )
+
+            state[index + TOKENS] = tokens
+            state[index + REFILLED_AT] = now
+            state[index + QUERIES] += 1
+
+            waiting = -tokens / rate if tokens < 0 else 0.0
+            state[index + WAITED] += waiting
+            state[index + LAST_AT] = now + waiting
+
+        if waiting:
+            time.sleep(waiting)
+
+        return waiting
+
+    def report(self, server: str, healthy: bool) -> "AdaptiveRateLimiter":
+        """
+        Adapts the rate of the given server to the outcome of a query.
+
+        :param healthy:
+            Whether the server answered (without a SERVFAIL).
+        """
+
+        index = self.indexes.get(server)
+
+        if index is None:
+            return self
+
+        with self.state.get_lock():
+            state = self.state.get_obj()
+
+            if healthy:
+                state[index + RATE] = min(
+                    self.max_rate, state[index + RATE] + self.increase
+                )
+                return self
+
+            now = time.monotonic()
+            state[index + FAILURES] += 1
+
+            if now - state[index + DECREASED_AT] >= self.DECREASE_INTERVAL:
+                state[index + RATE] = max(
+                    self.min_rate, state[index + RATE] * self.DECREASE_FACTOR
+                )
+                state[index + DECREASED_AT] = now
+
+        return self
+
+    def get_rates(self) -> Dict[str, float]:
+        """
+        Provides the current rate of each server.
+        """
+
+        with self.state.get_lock():
+            return {
+                x: round(self.state[index + RATE], 2)
+                for x, index in self.indexes.items()
+            }
+
+    def get_statistics(self) -> Dict[str, dict]:
+        """
+        Provides the statistics of each server.
+        """
+
+        result = {}
+
+        with self.state.get_lock():
+            for server, index in self.indexes.items():
+                data = dict(
+                    zip(self.FIELDS, self.state[index : index + len(self.FIELDS)])
+                )
+                duration = data["last_at"] - data["started_at"]
+
+                result[server] = {
+                    "rate": round(data["rate"], 2),
+                    "effective_rate": (
+                        round(data["queries"] / duration, 2) if duration > 0 else None
+                    ),
+                    "queries": int(data["queries"]),
+                    "failures": int(data["failures"]),
+                    "waited": round(data["waited"], 4),
+                }
+
+        return result
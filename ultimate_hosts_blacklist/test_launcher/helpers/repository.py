@@ -0,0 +1,276 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides the metadata of the repository we are
+working in.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import functools
+import json
+import logging
+import os
+import zlib
+from typing import Optional
+
+from PyFunceble.helpers.command import CommandHelper
+
+
+class RepositoryHelper:
+    """
+    Provides the name of the repository we are working in and the message of
+    its last commit - without spawning any process whenever possible.
+
+    Our sources are (in order):
+
+        - the environment variables of the CI engines,
+        - the :code:`.git` directory,
+        - the :code:`git` command itself.
+
+    Every result is memoized for the lifetime of the process.
+    """
+
+    NAME_ENVIRONMENT_VARIABLES: tuple = ("CI_PROJECT_NAME",)
+    MESSAGE_ENVIRONMENT_VARIABLES: tuple = (
+        "CI_COMMIT_MESSAGE",
+        "TRAVIS_COMMIT_MESSAGE",
+    )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get_root() -> Optional[str]:
+        """
+        Provides the top level directory of the repository.
+        """
+
+        directory = os.getcwd()
+
+        while True:
+            if os.path.exists(os.path.join(directory, ".git")):
+                return directory
+
+            parent = os.path.dirname(directory)
+
+            if parent == directory:
+                break
+
+            directory = parent
+
+        return CommandHelper("git rev-parse --show-toplevel").execute().strip() or None
+
+    @classmethod
+    def get_git_directory(cls) -> Optional[str]:
+        """
+        Provides the git directory of the repository.
+        """
+
+        root = cls.get_root()
+
+        if not root:
+            return None
+
+        result = os.path.join(root, ".git")
+
+        if os.path.isfile(result):
+            # Worktrees and submodules: .git is a "gitdir: <path>" file.
+            with open(result, "r", encoding="utf-8") as file_stream:
+                content = file_stream.read().strip()
+
+            if not content.startswith("gitdir:"):
+                return None
+
+            result = os.path.join(root, content[len("gitdir:") :].strip())
+
+        return result
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get_name(cls) -> str:
+        """
+        Provides the name of the repository.
+        """
+
+        repository = os.environ.get("GITHUB_REPOSITORY")
+
+        if repository and "/" in repository:
+            return repository.rsplit("/", 1)[-1]
+
+        for variable in cls.NAME_ENVIRONMENT_VARIABLES:
+            if os.environ.get(variable):
+                return os.environ[variable]
+
+        root = cls.get_root()
+
+        if root:
+            return os.path.basename(root)
+
+        return (
+            CommandHelper("basename $(git rev-parse --show-toplevel)").execute().strip()
+        )
+
+    @classmethod
+    def get_head_commit(cls) -> Optional[str]:
+        """
+        Provides the hash of the commit :code:`HEAD` points to.
+        """
+
+        git_dir = cls.get_git_directory()
+
+        if not git_dir:
+            return None
+
+        try:
+            with open(
+                os.path.join(git_dir, "HEAD"), "r", encoding="utf-8"
+            ) as file_stream:
+                head = file_stream.read().strip()
+        except OSError:
+            return None
+
+        if not head.startswith("ref:"):
+            return head or None
+
+        reference = head[len("ref:") :].strip()
+
+        try:
+            with open(
+                os.path.join(git_dir, reference), "r", encoding="utf-8"
+            ) as file_stream:
+                return file_stream.read().strip() or None
+        except OSError:
+            pass
+
+        try:
+            with open(
+                os.path.join(git_dir, "packed-refs"), "r", encoding="utf-8"
+            ) as file_stream:
+                for line in file_stream:
+                    if line.startswith(("#", "^")):
+                        continue
+
+                    commit, _, name = line.strip().partition(" ")
+
+                    if name == reference:
+                        return commit
+        except OSError:
+            pass
+
+        return None
+
+    @classmethod
+    def get_commit_message_from_git_directory(cls) -> Optional[str]:
+        """
+        Provides the message of the last commit by reading its (loose) object.
+
+        :return:
+            :code:`None` if the object is not available as loose object
+            (e.g. packed).
+        """
+
+        commit = cls.get_head_commit()
+
+        if not commit:
+            return None
+
+        try:
+            with open(
+                os.path.join(
+                    cls.get_git_directory(), "objects", commit[:2], commit[2:]
+                ),
+                "rb",
+            ) as file_stream:
+                data = zlib.decompress(file_stream.read())
+        except (OSError, zlib.error):
+            return None
+
+        header, _, body = data.partition(b"\0")
+
+        if not header.startswith(b"commit "):
+            return None
+
+        # The message starts after the first empty line.
+        _, _, message = body.partition(b"\n\n")
+
+        return message.decode("utf-8", errors="replace")
+
+    @staticmethod
+    def get_commit_message_from_github_event() -> Optional[str]:
+        """
+        Provides the message of the last commit from the event that triggered
+        the current GitHub Actions workflow.
+        """
+
+        event_path = os.environ.get("GITHUB_EVENT_PATH")
+
+        if not event_path or not os.path.isfile(event_path):
+            return None
+
+        try:
+            with open(event_path, "r", encoding="utf-8") as file_stream:
+                event = json.load(file_stream)
+        except (OSError, ValueError):
+            return None
+
+        head_commit = event.get("head_commit") if isinstance(event, dict) else None
+
+        if isinstance(head_commit, dict) and head_commit.get("message"):
+            return head_commit["message"]
+
+        return None
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get_last_commit_message(cls) -> str:
+        """
+        Provides the message of the last commit.
+        """
+
+        for variable in cls.MESSAGE_ENVIRONMENT_VARIABLES:
+            if os.environ.get(variable):
+                logging.debug("Last commit message read from %r.", variable)
+                return os.environ[variable]
+
+        result = cls.get_commit_message_from_github_event()
+
+        if result is not None:
+            logging.debug("Last commit message read from the GitHub event.")
+            return result
+
+        result = cls.get_commit_message_from_git_directory()
+
+        if result is not None:
+            logging.debug("Last commit message read from the git directory.")
+            return result
+
+        logging.debug("Last commit message read through git.")
+        return CommandHelper("git log -1 --format=%B").execute()
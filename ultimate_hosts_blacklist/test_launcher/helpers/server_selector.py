@@ -0,0 +1,199 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+Provides our latency aware DNS server selector.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import multiprocessing
+import multiprocessing.sharedctypes
+import random
+from typing import Dict, Iterable, List, Optional
+
+from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure
+
+# The offsets of the fields of a server.
+LATENCY, ERRORS, QUERIES, FAILURES, TOTAL_LATENCY = range(5)
+
+
+class DNSServerSelector:
+    """
+    Provides the order in which the DNS servers should be queried - the
+    best one first.
+
+    We keep a rolling (exponentially weighted) average of the latency and of
+    the error rate of each server. The score of a server is the time we
+    expect to wait for its answer: its latency when it answers, the penalty
+    when it doesn't. Therefore, slow or failing servers are demoted
+    automatically. Once in a while, we try a random order, so that a
+    demoted server gets a chance to show that it recovered.
+
+    The statistics live into shared memory. Therefore, an instance created
+    before our testers are forked is shared by all of them.
+
+    :param servers:
+        The servers to order. The other ones come last.
+    :param penalty:
+        The number of seconds a failure costs.
+    """
+
+    FIELDS: tuple = ("latency", "errors", "queries", "failures", "total_latency")
+
+    alpha: float = infrastructure.DNS_SERVER_SELECTION_ALPHA
+    exploration: float = infrastructure.DNS_SERVER_SELECTION_EXPLORATION
+    penalty: float = 5.0
+
+    indexes: Optional[Dict[str, int]] = None
+    state: Optional[multiprocessing.sharedctypes.SynchronizedArray] = None
+
+    def __init__(
+        self,
+        servers: Iterable[str],
+        *,
+        penalty: Optional[float] = None,
+        alpha: Optional[float] = None,
+        exploration: Optional[float] = None,
+    ) -> None:
+        if penalty is not None:
+            self.penalty = float(penalty)
+
+        if alpha is not None:
+            self.alpha = float(alpha)
+
+        if exploration is not None:
+            self.exploration = float(exploration)
+
+        self.indexes = {
+            x: index * len(self.FIELDS)
+            for index, x in enumerate(dict.fromkeys(servers))
+        }
+        self.state = multiprocessing.Array("d", len(self.indexes) * len(self.FIELDS))
+
+    def get_score(self, server: str) -> float:
+        """
+        Provides the number of seconds we expect to wait for an answer of the
+        given server. The lower, the better.
+        """
+
+        index = self.indexes[server]
+        state = self.state.get_obj()
+
+        return (1.0 - state[index + ERRORS]) * state[index + LATENCY] + state[
+            index + ERRORS
+        ] * self.penalty
+
+    def sort(self, servers: List[str]) -> List[str]:
+        """
+        Sorts the given servers - the best one first.
+        """
+
+        if random.random() < self.exploration:  # nosec: B311
+            return random.sample(servers, len(servers))
+
+        with self.state.get_lock():
+            return sorted(
+                servers,
+                key=lambda x: (
+                    self.get_score(x) if x in self.indexes else float("inf")
+                ),
+            )
+
+    def report(
+        self, server: str, latency: Optional[float] = None
+    ) -> "DNSServerSelector":
+        """
+        Learns from the outcome of a query.
+
+        :param latency:
+            The number of seconds the server took to answer. :code:`None`
+            when it failed (timeout, SERVFAIL, ...).
+        """
+
+        index = self.indexes.get(server)
+
+        if index is None:
+            return self
+
+        with self.state.get_lock():
+            state = self.state.get_obj()
+            error = 1.0 if latency is None else 0.0
+
+            if not state[index + QUERIES]:
+                state[index + ERRORS] = error
+            else:
+                state[index + ERRORS] += self.alpha * (error - state[index + ERRORS])
+
+            state[index + QUERIES] += 1
+
+            if latency is None:
+                state[index + FAILURES] += 1
+                return self
+
+            if state[index + QUERIES] == state[index + FAILURES] + 1:
+                # The first answer we get.
+                state[index + LATENCY] = latency
+            else:
+                state[index + LATENCY] += self.alpha * (
+                    latency - state[index + LATENCY]
+                )
+
+            state[index + TOTAL_LATENCY] += latency
+
+        return self
+
+    def get_statistics(self) -> Dict[str, dict]:
+        """
+        Provides the statistics of each server.
+        """
+
+        result = {}
+
+        with self.state.get_lock():
+            for server, index in self.indexes.items():
+                data = dict(
+                    zip(self.FIELDS, self.state[index : index + len(self.FIELDS)])
+                )
+                answers = data["queries"] - data["failures"]
+
+                result[server] = {
+                    "score": round(self.get_score(server), 4),
+                    "latency": round(data["latency"], 4),
+                    "error_rate": round(data["errors"], 4),
+                    "average_latency": (
+                        round(data["total_latency"] / answers, 4) if answers else None
+                    ),
+                    "queries": int(data["queries"]),
+                    "failures": int(data["failures"]),
+                }
+
+        return result
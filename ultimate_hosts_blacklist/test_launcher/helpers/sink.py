@@ -0,0 +1,179 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our buffered line sink.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import multiprocessing.queues
+import os
+import time
+from typing import List, Optional, Set
+
+
+class BufferedLineSink:
+    """
+    Provides a way to append lines to a file in batches, instead of opening,
+    appending and closing the file for every single line.
+
+    Lines are deduplicated as they come and flushed once we collected
+    enough of them, once the oldest buffered line waited long enough, or
+    when we are explicitly asked to.
+
+    Each flush is a single append (:code:`O_APPEND`) of the whole batch, so
+    that multiple processes can share the same file. When an output queue
+    is given, the batch is sent to it - as an output writer record - instead.
+
+    :param path:
+        The file to append into.
+    :param max_lines:
+        The maximum number of lines we buffer before flushing.
+    :param max_delay:
+        The maximum number of seconds a line may wait in the buffer.
+    :param output_queue:
+        The queue of the output writer to send our batches to.
+    """
+
+    path: Optional[str] = None
+    max_lines: int = 1024
+    max_delay: float = 5.0
+    output_queue: Optional[multiprocessing.queues.JoinableQueue] = None
+
+    buffer: Optional[List[str]] = None
+    seen: Optional[Set[str]] = None
+    first_buffered_at: Optional[float] = None
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_lines: Optional[int] = None,
+        max_delay: Optional[float] = None,
+        output_queue: Optional[multiprocessing.queues.JoinableQueue] = None,
+    ) -> None:
+        self.path = path
+        self.output_queue = output_queue
+
+        if max_lines is not None:
+            self.max_lines = int(max_lines)
+
+        if max_delay is not None:
+            self.max_delay = float(max_delay)
+
+        self.buffer = []
+        self.seen = set()
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def add(self, line: str) -> "BufferedLineSink":
+        """
+        Adds the given line to the buffer - unless we already saw it.
+        """
+
+        if line in self.seen:
+            return self
+
+        self.seen.add(line)
+
+        if not self.buffer:
+            self.first_buffered_at = time.monotonic()
+
+        self.buffer.append(line)
+
+        return self.flush_if_due()
+
+    def is_due(self) -> bool:
+        """
+        Checks if one of our thresholds is reached.
+        """
+
+        if not self.buffer:
+            return False
+
+        return (
+            len(self.buffer) >= self.max_lines
+            or time.monotonic() - self.first_buffered_at >= self.max_delay
+        )
+
+    def flush_if_due(self) -> "BufferedLineSink":
+        """
+        Flushes the buffer if one of our thresholds is reached.
+        """
+
+        if self.is_due():
+            self.flush()
+
+        return self
+
+    def flush(self) -> "BufferedLineSink":
+        """
+        Appends the buffered lines to our file.
+        """
+
+        if not self.buffer:
+            return self
+
+        data = "".join(x + "\n" for x in self.buffer)
+
+        if self.output_queue is not None:
+            self.output_queue.put((self.path, None, data))
+        else:
+            self.write(data)
+
+        self.buffer.clear()
+        self.first_buffered_at = None
+
+        return self
+
+    def write(self, data: str) -> None:
+        """
+        Appends the given data to our file - in a single write.
+        """
+
+        directory = os.path.dirname(self.path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        file_descriptor = os.open(
+            self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+        )
+
+        try:
+            view = memoryview(data.encode("utf-8"))
+
+            while view:
+                view = view[os.write(file_descriptor, view) :]
+        finally:
+            os.close(file_descriptor)
@@ -0,0 +1,198 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our external sort helper.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import heapq
+import sys
+import tempfile
+from typing import IO, Any, Callable, Generator, Iterable, List, Optional
+
+
+class ExternalSortHelper:
+    """
+    Provides a way to sort and deduplicate a (huge) stream of lines without
+    holding all of them in memory.
+
+    Lines are collected until the memory limit is reached. The collected
+    lines are then sorted and flushed into a temporary run file. At the end,
+    all runs are merged back together.
+
+    :param memory_limit:
+        The maximum number of bytes we are allowed to keep in memory before
+        flushing a sorted run to the disk.
+    :param temp_directory:
+        The directory to write our temporary runs into.
+    :param key:
+        The key to sort by. Lines with the same key are sorted by themselves,
+        so that duplicates stay next to each other.
+    """
+
+    MAX_OPEN_RUNS: int = 128
+
+    memory_limit: int = 256 * 1024 * 1024
+    temp_directory: Optional[str] = None
+    key: Optional[Callable[[str], Any]] = None
+
+    def __init__(
+        self,
+        memory_limit: Optional[int] = None,
+        *,
+        temp_directory: Optional[str] = None,
+        key: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        if memory_limit:
+            self.memory_limit = int(memory_limit)
+
+        self.temp_directory = temp_directory
+
+        if key is not None:
+            self.key = lambda x: (key(x), x)
+
+    @staticmethod
+    def unique(lines: Iterable[str]) -> Generator[str, None, None]:
+        """
+        Removes the consecutive duplicates of the given (sorted) lines.
+        """
+
+        previous = None
+
+        for line in lines:
+            if line != previous:
+                previous = line
+                yield line
+
+    @staticmethod
+    def read_run(file_stream: IO) -> Generator[str, None, None]:
+        """
+        Reads the given run from its beginning.
+        """
+
+        file_stream.seek(0)
+
+        for line in file_stream:
+            yield line[:-1]
+
+    def write_run(self, lines: Iterable[str]) -> IO:
+        """
+        Writes the given (sorted) lines into a new temporary run.
+        """
+
+        # pylint: disable=consider-using-with
+        file_stream = tempfile.TemporaryFile(
+            mode="w+", encoding="utf-8", dir=self.temp_directory
+        )
+
+        for line in lines:
+            file_stream.write(line + "\n")
+
+        file_stream.flush()
+
+        return file_stream
+
+    def merge_runs(self, runs: List[IO]) -> List[IO]:
+        """
+        Merges the given runs until we are under the number of runs we are
+        allowed to keep open at the same time.
+        """
+
+        while len(runs) > self.MAX_OPEN_RUNS:
+            merged = []
+
+            for index in range(0, len(runs), self.MAX_OPEN_RUNS):
+                batch = runs[index : index + self.MAX_OPEN_RUNS]
+
+                merged.append(
+                    self.write_run(
+                        self.unique(
+                            heapq.merge(
+                                *(self.read_run(x) for x in batch), key=self.key
+                            )
+                        )
+                    )
+                )
+
+                for run in batch:
+                    run.close()
+
+            runs = merged
+
+        return runs
+
+    def sort(self, lines: Iterable[str]) -> Generator[str, None, None]:
+        """
+        Sorts and deduplicates the given lines.
+
+        .. warning::
+            The given lines shouldn't contain any new line character.
+
+        :param lines:
+            The lines to sort.
+        """
+
+        runs = []
+        buffer = []
+        buffer_size = 0
+
+        try:
+            for line in lines:
+                buffer.append(line)
+                buffer_size += sys.getsizeof(line) + 8
+
+                if buffer_size >= self.memory_limit:
+                    buffer.sort(key=self.key)
+                    runs.append(self.write_run(self.unique(buffer)))
+
+                    buffer.clear()
+                    buffer_size = 0
+
+            buffer.sort(key=self.key)
+
+            if not runs:
+                yield from self.unique(buffer)
+                return
+
+            if buffer:
+                runs.append(self.write_run(self.unique(buffer)))
+                buffer.clear()
+
+            runs = self.merge_runs(runs)
+
+            yield from self.unique(
+                heapq.merge(*(self.read_run(x) for x in runs), key=self.key)
+            )
+        finally:
+            for run in runs:
+                run.close()
@@ -0,0 +1,207 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our whitelist helper.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from PyFunceble.helpers.dict import DictHelper
+from PyFunceble.helpers.directory import DirectoryHelper
+from PyFunceble.helpers.file import FileHelper
+from ultimate_hosts_blacklist.whitelist.configuration import (
+    Configuration as whitelist_configuration,
+)
+from ultimate_hosts_blacklist.whitelist.parser import Parser as whitelist_parser
+
+from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure, outputs
+from ultimate_hosts_blacklist.test_launcher.helpers.download import (
+    CachedDownloadHelper,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.whitelist_matcher import (
+    WhitelistMatcher,
+)
+
+
+class WhitelistHelper:
+    """
+    Provides a way to check subjects against the whitelist rules one by one,
+    without going through intermediate files.
+
+    The official rules are compiled once per run and persisted into our
+    configuration directory, so that the next runs only have to ask the
+    upstream whether they changed.
+
+    :param use_official:
+        Whether we have to use the official whitelist list.
+    :param secondary_whitelist:
+        A list of additional rules to use.
+    """
+
+    _parser: Optional[whitelist_parser] = None
+    _official_manifest: Optional[dict] = None
+
+    matchers: Optional[List[WhitelistMatcher]] = None
+
+    def __init__(
+        self,
+        *,
+        use_official: bool = True,
+        secondary_whitelist: Optional[List[str]] = None,
+    ) -> None:
+        manifests = []
+
+        if use_official:
+            manifests.append(self.get_official_manifest())
+
+            if secondary_whitelist:
+                manifests.append(self.compile(secondary_whitelist))
+        else:
+            manifests.append(
+                self.compile(self.get_special_rules() + (secondary_whitelist or []))
+            )
+
+        self.matchers = [WhitelistMatcher(x) for x in manifests if x]
+
+    @classmethod
+    def get_parser(cls) -> whitelist_parser:
+        """
+        Provides the parser shared by all our compilations.
+
+        .. note::
+            The construction of the parser downloads the root zone database
+            and the public suffix list. Hence the sharing.
+        """
+
+        if cls._parser is None:
+            cls._parser = whitelist_parser()
+
+        return cls._parser
+
+    @staticmethod
+    def get_special_rules() -> List[str]:
+        """
+        Provides the rules the whitelist tool always appends.
+        """
+
+        return list(infrastructure.WHITELIST_SPECIAL_RULES)
+
+    @classmethod
+    def compile(cls, rules: List[str]) -> dict:
+        """
+        Compiles the given rules into something the whitelist tool
+        understands.
+
+        .. note::
+            We also keep the regex rules apart, so that our matcher can
+            prefilter them.
+        """
+
+        result = cls.get_parser().parse(rules) or {}
+
+        if result:
+            result["regex_rules"] = [
+                x.split(whitelist_configuration.markers["regex"])[-1].strip()
+                for x in rules
+                if x and x.startswith(whitelist_configuration.markers["regex"])
+            ]
+
+        return result
+
+    @classmethod
+    def get_official_manifest(cls) -> dict:
+        """
+        Provides the compiled official rules.
+        """
+
+        if cls._official_manifest is None:
+            cls._official_manifest = cls.load_official_manifest()
+
+        return cls._official_manifest
+
+    @classmethod
+    def load_official_manifest(cls) -> dict:
+        """
+        Loads the compiled official rules from our cache, or compiles
+        them when the upstream changed or our cache is too old.
+        """
+
+        cache = DictHelper().from_json_file(outputs.WHITELIST_CACHE_DESTINATION)
+        downloader = CachedDownloadHelper(whitelist_configuration.links["core"])
+
+        try:
+            fresh = datetime.utcnow() - datetime.fromisoformat(
+                cache["created"]
+            ) < timedelta(days=infrastructure.WHITELIST_CACHE_MAX_AGE)
+            fresh = fresh and cache["hash"] == downloader.get("hash")
+        except (KeyError, TypeError, ValueError):
+            fresh = False
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+            destination = os.path.join(temp_directory, "whitelist.list")
+
+            if not downloader.download(destination, conditional=fresh):
+                logging.info("Whitelist unchanged. Using our compiled cache.")
+                return cache["manifest"]
+
+            logging.info("Started compilation of the whitelist.")
+
+            manifest = cls.compile(
+                FileHelper(destination).read().split("\n") + cls.get_special_rules()
+            )
+
+            logging.info("Finished compilation of the whitelist.")
+
+        DirectoryHelper(os.path.dirname(outputs.WHITELIST_CACHE_DESTINATION)).create()
+        DictHelper(
+            {
+                "created": datetime.utcnow().isoformat(),
+                "hash": downloader.get("hash"),
+                "manifest": manifest,
+            }
+        ).to_json_file(outputs.WHITELIST_CACHE_DESTINATION, indent=None)
+        downloader.save()
+
+        return manifest
+
+    def is_whitelisted(self, subject: str) -> bool:
+        """
+        Checks if the given subject is whitelisted.
+        """
+
+        return any(x.is_whitelisted(subject) for x in self.matchers)
@@ -0,0 +1,261 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our whitelist matcher.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern, Set, Tuple
+
+from PyFunceble.converter.url2netloc import Url2Netloc
+
+try:
+    # pylint: disable=no-name-in-module
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover ## Python < 3.11
+    import sre_parse  # pylint: disable=deprecated-module
+
+
+class WhitelistMatcher:
+    """
+    Provides a matcher with the exact same semantics as the whitelist tool,
+    but built for speed.
+
+    - The exact (strict and present) rules are kept into hash sets.
+    - The suffix (ends / :code:`ALL`) rules are kept into a reversed-label
+      trie.
+    - The regex rules are prefiltered by a literal they require, whenever
+      we can extract one.
+
+    :param manifest:
+        The compiled rules, as produced by the whitelist tool parser.
+    """
+
+    # Characters which make urllib do more than returning the given subject.
+    URL_CHARACTERS: Set[str] = set(":/?#;[]")
+
+    exact: Optional[Dict[str, Set[str]]] = None
+    suffix_trie: Optional[dict] = None
+    ends_fallback: Optional[Dict[str, List[str]]] = None
+    prefiltered_regex: Optional[List[Tuple[str, Pattern]]] = None
+    regex: Optional[Pattern] = None
+
+    def __init__(self, manifest: Optional[dict]) -> None:
+        self.exact = {}
+        self.suffix_trie = {}
+        self.ends_fallback = {}
+        self.prefiltered_regex = []
+
+        if not manifest:
+            return
+
+        for rule_type in ("strict", "present"):
+            for index, rules in (manifest.get(rule_type) or {}).items():
+                self.exact.setdefault(index, set()).update(rules)
+
+        for index, rules in (manifest.get("ends") or {}).items():
+            for rule in rules:
+                if rule.startswith("."):
+                    self.add_suffix(rule, index)
+                else:
+                    self.ends_fallback.setdefault(index, []).append(rule)
+
+        self.set_regex(
+            manifest.get("regex_rules")
+            or ([manifest["regex"]] if manifest.get("regex") else [])
+        )
+
+    def add_suffix(self, rule: str, index: str) -> None:
+        """
+        Adds the given suffix rule into our trie.
+
+        :param rule:
+            The rule to add. It is expected to start with a dot.
+        :param index:
+            The index the whitelist tool stores the rule under.
+        """
+
+        node = self.suffix_trie
+
+        for label in reversed(rule[1:].split(".")):
+            node = node.setdefault(label, {})
+
+        # Labels are strings, so a boolean key can't collide with them.
+        node.setdefault(True, set()).add(index)
+
+    @staticmethod
+    def get_required_literal(rule: str) -> Optional[str]:
+        """
+        Provides the longest literal any match of the given regex contains,
+        if we can find one.
+        """
+
+        try:
+            parsed = sre_parse.parse(rule)
+        except (re.error, RecursionError, OverflowError):
+            return None
+
+        state = getattr(parsed, "state", None) or getattr(parsed, "pattern", None)
+
+        if state is None or state.flags & (re.IGNORECASE | re.VERBOSE):
+            return None
+
+        best = current = ""
+
+        for operation, value in parsed:
+            if operation is sre_parse.LITERAL:
+                current += chr(value)
+            else:
+                best = max(best, current, key=len)
+                current = ""
+
+        best = max(best, current, key=len)
+
+        return best if len(best) >= 2 else None
+
+    def set_regex(self, rules: List[str]) -> None:
+        """
+        Compiles and prefilters the given regex rules.
+        """
+
+        others = []
+
+        for rule in rules:
+            literal = self.get_required_literal(rule)
+
+            if literal:
+                try:
+                    self.prefiltered_regex.append((literal, re.compile(rule)))
+                    continue
+                except re.error:
+                    pass
+
+            others.append(rule)
+
+        if not others:
+            return
+
+        try:
+            self.regex = re.compile("({0})".format("|".join(others)))
+        except re.error:
+            # Some rules can't live together (e.g. global flags). We keep the
+            # valid ones apart, without prefilter.
+            for rule in others:
+                try:
+                    self.prefiltered_regex.append(("", re.compile(rule)))
+                except re.error:
+                    continue
+
+    def match_suffix(self, subject: str, bare: str) -> bool:
+        """
+        Checks if the given subject ends with one of our suffix rules.
+        """
+
+        labels = subject.split(".")
+        node = self.suffix_trie
+
+        # A suffix rule starts with a dot, so we never consider the first label.
+        for label in reversed(labels[1:]):
+            node = node.get(label)
+
+            if node is None:
+                break
+
+            if True in node and bare[-3:] in node[True]:
+                return True
+
+        for rule in self.ends_fallback.get(bare[-3:], ()):
+            if subject.endswith(rule):
+                return True
+
+        return False
+
+    def match_regex(self, subject: str) -> bool:
+        """
+        Checks if the given subject matches one of our regex rules.
+        """
+
+        for literal, pattern in self.prefiltered_regex:
+            if literal in subject and pattern.search(subject):
+                return True
+
+        return bool(self.regex and self.regex.search(subject))
+
+    def match(self, subject: str) -> bool:
+        """
+        Checks if the given (network location) subject is whitelisted.
+        """
+
+        if subject.startswith("www."):
+            bare = subject[4:]
+        else:
+            bare = subject
+
+        exact = self.exact.get(bare[:4])
+
+        if exact and subject in exact:
+            return True
+
+        if self.suffix_trie and self.match_suffix(subject, bare):
+            return True
+
+        return self.match_regex(subject)
+
+    @classmethod
+    def get_netloc(cls, subject: str) -> str:
+        """
+        Provides the network location of the given subject.
+        """
+
+        if subject[0] > " " and cls.URL_CHARACTERS.isdisjoint(subject):
+            return subject
+
+        return Url2Netloc(subject).get_converted()
+
+    def is_whitelisted(self, line: str) -> bool:
+        """
+        Checks if the given line is whitelisted.
+        """
+
+        line = line.strip() if line else line
+
+        if not line:
+            return True
+
+        clean_line = line.split()[-1]
+
+        if self.match(self.get_netloc(clean_line)):
+            return True
+
+        return clean_line.startswith(("http://", "https://")) and self.match(clean_line)
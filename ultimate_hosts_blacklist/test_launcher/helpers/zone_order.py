@@ -0,0 +1,68 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our zone order helper.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from typing import Iterable, List
+
+
+class ZoneOrderHelper:
+    """
+    Provides a way to order subjects by zone - through their reversed
+    labels - so that the subjects of the same zone follow each other.
+
+    As an example, :code:`a.example.com`, :code:`b.example.net` and
+    :code:`c.example.com` are ordered as :code:`a.example.com`,
+    :code:`c.example.com` and :code:`b.example.net`.
+    """
+
+    @staticmethod
+    def reverse(subject: str) -> str:
+        """
+        Reverses the labels of the given subject.
+
+        .. note::
+            Reversing twice gives the subject back.
+        """
+
+        return ".".join(reversed(subject.split(".")))
+
+    @classmethod
+    def sort(cls, subjects: Iterable[str]) -> List[str]:
+        """
+        Sorts the given subjects by zone.
+        """
+
+        return sorted(subjects, key=cls.reverse)
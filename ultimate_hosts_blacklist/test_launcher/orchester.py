@@ -37,9 +37,8 @@ License:
 
 import sys
 import traceback
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from github import Github
 from PyFunceble.cli.processes.producer import ProducerProcessesManager
 from PyFunceble.cli.processes.tester import TesterProcessesManager
 from PyFunceble.helpers.environment_variable import EnvironmentVariableHelper
@@ -50,6 +49,9 @@ from ultimate_hosts_blacklist.test_launcher.pyfunceble.system_launcher import (
     UHBPyFuncebleSystemLauncher,
 )
 
+if TYPE_CHECKING:
+    from github import Github
+
 
 class Orchestration:
     """
@@ -78,7 +80,7 @@ class Orchestration:
 
     tester_process_manager: Optional[TesterProcessesManager] = None
     producer_process_manager: Optional[ProducerProcessesManager] = None
-    github_api: Optional[Github] = None
+    _github_api: Optional["Github"] = None
     kill_switch: Optional[EnvironmentVariableHelper] = None
 
     def __init__(
@@ -91,10 +93,23 @@ class Orchestration:
             administration=self.administration
         )
 
-        env_helper = EnvironmentVariableHelper("GITHUB_TOKEN")
         self.kill_switch = EnvironmentVariableHelper("UHB_GH_KILL_SWITCH")
 
-        self.github_api = Github(env_helper.get_value(default=None))
+    @property
+    def github_api(self) -> "Github":
+        """
+        Provides our GitHub API client - created the first time we need it.
+        """
+
+        if self._github_api is None:
+            # pylint: disable=import-outside-toplevel
+            from github import Github
+
+            self._github_api = Github(
+                EnvironmentVariableHelper("GITHUB_TOKEN").get_value(default=None)
+            )
+
+        return self._github_api
 
     def submit_error_issue(self, *, trace: str) -> None:
         """
@@ -0,0 +1,282 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+Provides our DNS query tool.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import socket
+import time
+from typing import List, Optional, Union
+
+import dns.exception
+import dns.message
+import dns.query
+import dns.rcode
+import dns.rdatatype
+from PyFunceble.query.dns.query_tool import DNSQueryTool
+
+from ultimate_hosts_blacklist.test_launcher.helpers.dns_cache import DNSAnswerCache
+from ultimate_hosts_blacklist.test_launcher.helpers.rate_limiter import (
+    AdaptiveRateLimiter,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.server_selector import (
+    DNSServerSelector,
+)
+
+
+class UHBDNSQueryTool(DNSQueryTool):
+    """
+    Provides a DNS query tool which consults our DNS answer cache before
+    querying the nameservers, and caches what they answered.
+
+    When given, our rate limiter paces the queries sent to each nameserver
+    and our server selector decides which nameserver we query first. Both
+    learn from the responses.
+
+    The response codes of our last query are kept - the cached ones
+    included.
+
+    :param cache:
+        The cache to use.
+    :param rate_limiter:
+        The rate limiter to use.
+    :param server_selector:
+        The server selector to use.
+    """
+
+    cache: Optional[DNSAnswerCache] = None
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+    server_selector: Optional[DNSServerSelector] = None
+    response_ttl: Optional[int] = None
+    rcodes: Optional[List[int]] = None
+
+    def __init__(
+        self,
+        cache: Optional[DNSAnswerCache] = None,
+        *,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        server_selector: Optional[DNSServerSelector] = None,
+        **kwargs,
+    ) -> None:
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.server_selector = server_selector
+        self.rcodes = []
+
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def get_ttl_from_response(response: dns.message.Message) -> int:
+        """
+        Provides the number of seconds we may keep the given response.
+
+        For an empty answer, that is the negative TTL given by the SOA record
+        of the authority section. Responses we can't trust (e.g. SERVFAIL)
+        can't be kept.
+        """
+
+        if response.rcode() not in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+            return 0
+
+        if response.answer:
+            return min(x.ttl for x in response.answer)
+
+        for rrset in response.authority:
+            if rrset.rdtype == dns.rdatatype.SOA and rrset:
+                return min(rrset.ttl, rrset[0].minimum)
+
+        return 0
+
+    def _get_result_from_response(self, response: dns.message.Message) -> List[str]:
+        self.rcodes.append(response.rcode())
+
+        result = super()._get_result_from_response(response)
+
+        ttl = self.get_ttl_from_response(response)
+
+        if self.response_ttl is None or ttl < self.response_ttl:
+            self.response_ttl = ttl
+
+        return result
+
+    def query(self) -> Optional[List[str]]:
+        self.rcodes.clear()
+
+        return super().query()
+
+    def is_nxdomain(self) -> bool:
+        """
+        Checks if every nameserver which answered our last query told us that
+        the name does not exist.
+        """
+
+        return bool(self.rcodes) and all(x == dns.rcode.NXDOMAIN for x in self.rcodes)
+
+    def _mix_order(self, data: Union[dict, List[str]]) -> Union[dict, List[str]]:
+        if self.server_selector is None:
+            return super()._mix_order(data)
+
+        if isinstance(data, dict):
+            return {x: data[x] for x in self.server_selector.sort(list(data))}
+
+        return self.server_selector.sort(list(data))
+
+    def _query_protocol(self, protocol: str) -> Optional[List[str]]:
+        if self.cache is None:
+            return self._query_nameservers(protocol)
+
+        name, record_type = self.dns_name.to_text(), int(self.query_record_type)
+
+        cached = self.cache.get(name, record_type)
+
+        if cached is not None:
+            result, rcode = cached
+
+            self.rcodes.append(rcode)
+            self.lookup_record.used_protocol = protocol.upper()
+            return result
+
+        self.response_ttl = None
+        result = self._query_nameservers(protocol)
+
+        if self.response_ttl is not None:
+            # We only keep what (at least) a nameserver answered.
+            self.cache.set(
+                name,
+                record_type,
+                result,
+                self.response_ttl,
+                rcode=dns.rcode.NXDOMAIN if self.is_nxdomain() else dns.rcode.NOERROR,
+            )
+
+        return result
+
+    def report(self, nameserver: str, latency: Optional[float]) -> "UHBDNSQueryTool":
+        """
+        Lets our rate limiter and server selector learn from the outcome of
+        a query.
+
+        :param latency:
+            The number of seconds the nameserver took to answer.
+            :code:`None` when it failed (timeout, SERVFAIL, ...).
+        """
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.report(nameserver, latency is not None)
+
+        if self.server_selector is not None:
+            self.server_selector.report(nameserver, latency)
+
+        return self
+
+    def _query_nameservers(self, protocol: str) -> List[str]:
+        """
+        Queries the nameservers through the given protocol - like PyFunceble
+        does, but through our rate limiter and server selector.
+        """
+
+        if self.rate_limiter is None and self.server_selector is None:
+            return super()._query_protocol(protocol)
+
+        self.lookup_record.used_protocol = protocol.upper()
+
+        if self.lookup_record.used_protocol not in self.SUPPORTED_PROTOCOL:
+            raise ValueError(
+                f"<protocol> ({self.lookup_record.used_protocol!r}) is unknown or "
+                f"unsupported (supported: {self.SUPPORTED_PROTOCOL!r})."
+            )
+
+        result = set()
+
+        for nameserver, port in self._mix_order(
+            self.nameservers.get_nameserver_ports()
+        ).items():
+            if self.lookup_record.used_protocol == "HTTPS" and port == 53:
+                port = 443
+
+            if self.lookup_record.used_protocol == "TLS" and port == 53:
+                port = 853
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(nameserver)
+
+            started_at = time.perf_counter()
+
+            try:
+                response = getattr(dns.query, protocol.lower())(
+                    self.query_message,
+                    nameserver,
+                    port=port,
+                    timeout=self.query_timeout,
+                )
+            except (dns.exception.Timeout, socket.error):
+                self.report(nameserver, None)
+            except (dns.query.UnexpectedSource, dns.query.BadResponse):
+                pass
+            except ValueError:
+                break
+            else:
+                if response.rcode() == dns.rcode.SERVFAIL:
+                    self.report(nameserver, None)
+                else:
+                    self.report(nameserver, time.perf_counter() - started_at)
+
+                local_result = self._get_result_from_response(response)
+
+                if local_result:
+                    result.update(local_result)
+
+                    self.lookup_record.nameserver = nameserver
+                    self.lookup_record.port = port
+
+                if self.trust_server:
+                    break
+
+            time.sleep(self.delay)
+
+        return list(result)
+
+
+class CountingDNSQueryTool(UHBDNSQueryTool):
+    """
+    Provides a DNS query tool which counts the queries it sends to the
+    nameservers - the answers of our cache are not counted.
+    """
+
+    queries: int = 0
+
+    def _query_nameservers(self, protocol: str) -> List[str]:
+        self.queries += 1
+
+        return super()._query_nameservers(protocol)
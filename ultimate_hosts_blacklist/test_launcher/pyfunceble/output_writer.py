@@ -0,0 +1,290 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides the process which writes the output of our
+producers.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import collections
+import logging
+import multiprocessing
+import multiprocessing.queues
+import multiprocessing.synchronize
+import os
+import queue
+import time
+from typing import IO, Optional
+
+from PyFunceble.cli.filesystem.printer.file import FilePrinter
+
+
+class QueuedFilePrinter(FilePrinter):
+    """
+    Provides a file printer which sends its lines to our output writer
+    instead of writing them itself.
+
+    :param output_queue:
+        The queue of our output writer.
+    """
+
+    WITHOUT_HEADER: tuple = ("hosts", "plain")
+
+    output_queue: Optional[multiprocessing.queues.JoinableQueue] = None
+
+    def __init__(
+        self, output_queue: multiprocessing.queues.JoinableQueue, **kwargs
+    ) -> None:
+        self.output_queue = output_queue
+
+        super().__init__(**kwargs)
+
+    def get_preamble(self) -> str:
+        """
+        Provides what we have to write at the top of a new file.
+        """
+
+        result = self.STD_FILE_GENERATION + self.get_generation_date_line() + "\n\n"
+
+        if self.template_to_use not in self.WITHOUT_HEADER:
+            result += self.get_header_to_print() + "\n"
+
+        return result
+
+    def print_interpolated_line(self) -> None:
+        """
+        Sends the interpolated line to our output writer.
+        """
+
+        self.output_queue.put(
+            (self.destination, self.get_preamble(), self.get_line_to_print() + "\n")
+        )
+
+
+class OutputWriter(multiprocessing.Process):
+    """
+    Provides a process which writes all the records sent by our producers.
+
+    A record is a :code:`(destination, preamble, data)` tuple. The preamble
+    - if any - is only written when the destination doesn't exist yet.
+
+    File handles are kept open (and buffered) between records. They are
+    flushed when the queue stays idle for :code:`max_delay` seconds and
+    closed when a :code:`__flush__` or :code:`__stop__` signal is received.
+
+    A flush signal is a :code:`(__flush__, connection)` tuple: once our
+    handles are closed, we acknowledge it through the given connection -
+    see :meth:`flush_and_wait`.
+
+    A record we can't write is logged and skipped. Once we stopped - for
+    whatever reason - the :code:`stopped` event is set.
+
+    :param output_queue:
+        The queue to read.
+    :param max_open_files:
+        The maximum number of file handles we keep open.
+    :param max_delay:
+        The maximum number of seconds we wait for a record before flushing
+        our handles.
+    """
+
+    FLUSH_SIGNAL: str = "__flush__"
+    STOP_SIGNAL: str = "__stop__"
+
+    BUFFER_SIZE: int = 1024 * 1024
+    WAIT_TIMEOUT: float = 300.0
+
+    output_queue: Optional[multiprocessing.queues.JoinableQueue] = None
+    max_open_files: int = 256
+    max_delay: float = 5.0
+
+    handles: Optional[collections.OrderedDict] = None
+    stopped: Optional[multiprocessing.synchronize.Event] = None
+
+    def __init__(
+        self,
+        output_queue: multiprocessing.queues.JoinableQueue,
+        *,
+        max_open_files: Optional[int] = None,
+        max_delay: Optional[float] = None,
+    ) -> None:
+        self.output_queue = output_queue
+
+        if max_open_files is not None:
+            self.max_open_files = int(max_open_files)
+
+        if max_delay is not None:
+            self.max_delay = float(max_delay)
+
+        super().__init__(name="uhb-output-writer", daemon=True)
+
+        self.handles = collections.OrderedDict()
+        self.stopped = multiprocessing.Event()
+
+    def get_handle(self, destination: str, preamble: Optional[str]) -> IO:
+        """
+        Provides an (open) handle for the given destination.
+        """
+
+        if destination in self.handles:
+            self.handles.move_to_end(destination)
+            return self.handles[destination]
+
+        if len(self.handles) >= self.max_open_files:
+            self.handles.popitem(last=False)[1].close()
+
+        is_new = not os.path.isfile(destination)
+
+        directory = os.path.dirname(destination)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        handle = open(  # pylint: disable=consider-using-with
+            destination, "a", encoding="utf-8", buffering=self.BUFFER_SIZE
+        )
+
+        if is_new and preamble:
+            handle.write(preamble)
+
+        self.handles[destination] = handle
+
+        return handle
+
+    def flush(self) -> "OutputWriter":
+        """
+        Flushes all our handles.
+        """
+
+        for handle in self.handles.values():
+            handle.flush()
+
+        return self
+
+    def close(self) -> "OutputWriter":
+        """
+        Closes all our handles.
+        """
+
+        while self.handles:
+            self.handles.popitem(last=False)[1].close()
+
+        return self
+
+    def run(self) -> None:
+        try:
+            self.write_records()
+        finally:
+            self.stopped.set()
+
+    def write_records(self) -> None:
+        """
+        Writes the records of our queue - until we receive our stop signal.
+        """
+
+        while True:
+            try:
+                record = self.output_queue.get(timeout=self.max_delay)
+            except queue.Empty:
+                try:
+                    self.flush()
+                except OSError as exception:
+                    logging.critical("Could not flush: %s", exception)
+                continue
+            except Exception as exception:  # pylint: disable=broad-except
+                # For example, a flush signal whose sender is already gone.
+                logging.critical("Could not read a record: %s", exception)
+                continue
+
+            try:
+                if record == self.STOP_SIGNAL:
+                    self.close()
+                    break
+
+                if record[0] == self.FLUSH_SIGNAL:
+                    self.close()
+                    record[1].send(True)
+                    record[1].close()
+                    continue
+
+                destination, preamble, data = record
+
+                self.get_handle(destination, preamble).write(data)
+            except Exception as exception:  # pylint: disable=broad-except
+                logging.critical("Could not write %r: %s", record, exception)
+            finally:
+                self.output_queue.task_done()
+
+    def flush_and_wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sends our flush signal and waits until all the records the current
+        process sent so far are written. We don't wait when we are stopped
+        nor longer than the given timeout. Can be called from any process.
+
+        :param timeout:
+            The maximum number of seconds to wait. Defaults to
+            :code:`WAIT_TIMEOUT`.
+
+        :return:
+            Whether everything got written.
+        """
+
+        deadline = time.monotonic() + (
+            self.WAIT_TIMEOUT if timeout is None else timeout
+        )
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+
+        try:
+            # Our records and our signal go through the same queue: when we
+            # get our acknowledgement, the records sent before are written.
+            self.output_queue.put((self.FLUSH_SIGNAL, sender))
+
+            while not receiver.poll(min(1.0, max(deadline - time.monotonic(), 0))):
+                if self.stopped.is_set() or time.monotonic() >= deadline:
+                    return False
+
+            return receiver.recv()
+        finally:
+            receiver.close()
+            sender.close()
+
+    def stop(self) -> "OutputWriter":
+        """
+        Sends our stop signal and waits until everything is written.
+        """
+
+        if self.is_alive():
+            self.output_queue.put(self.STOP_SIGNAL)
+            self.join()
+
+        return self
@@ -0,0 +1,61 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our parent zone resolver.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from typing import Optional
+
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.zone_resolver import (
+    ZoneResolverBase,
+)
+
+
+class ParentZoneResolver(ZoneResolverBase):
+    """
+    Provides a way to find the registrable domains which do not exist, so
+    that the testing of their subdomains can be skipped.
+
+    As nothing exists under a name which does not exist (RFC 8020), once a
+    registrable domain is NXDOMAIN, all its subdomains are INACTIVE.
+    """
+
+    def get_parent(self, subject: str) -> Optional[str]:
+        return self.public_suffix.get_registrable_domain(subject)
+
+    def check(self, parent: str) -> Optional[bool]:
+        query_tool = self.dns_query_tool
+        query_tool.set_subject(parent).set_query_record_type("SOA").query()
+
+        return True if query_tool.is_nxdomain() else None
@@ -36,32 +36,116 @@ License:
     SOFTWARE.
 """
 
+import logging
+import multiprocessing.queues
+import multiprocessing.sharedctypes
 from typing import Any, Optional, Tuple
 
 from PyFunceble.cli.processes.workers.producer import ProducerWorker
-from PyFunceble.helpers.file import FileHelper
 
 from ultimate_hosts_blacklist.test_launcher.defaults import outputs
+from ultimate_hosts_blacklist.test_launcher.helpers.profiler import ProcessProfiler
+from ultimate_hosts_blacklist.test_launcher.helpers.sink import BufferedLineSink
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.output_writer import (
+    OutputWriter,
+    QueuedFilePrinter,
+)
 
 
 class UHBPyFuncebleProducerWorker(ProducerWorker):
     """
     Provides a modified version of PyFunceble's producer worker.
+
+    When the :code:`output_queue` and :code:`output_writer` class attributes
+    are set (by the launcher, before the workers are forked), all our files
+    are written by our output writer instead of the worker itself.
+
+    When the :code:`tested_counter` class attribute is set, we count the
+    subjects we produced an output for.
     """
 
+    output_queue: Optional[multiprocessing.queues.JoinableQueue] = None
+    output_writer: Optional[OutputWriter] = None
+    tested_counter: Optional[multiprocessing.sharedctypes.Synchronized] = None
+
+    _volatile_sink: Optional[BufferedLineSink] = None
+    _profiler: Optional[ProcessProfiler] = None
+
+    @property
+    def volatile_sink(self) -> BufferedLineSink:
+        """
+        Provides the (per worker) sink of our volatile subjects.
+        """
+
+        if self._volatile_sink is None:
+            self._volatile_sink = BufferedLineSink(
+                outputs.TEMP_VOLATIVE_DESTINATION, output_queue=self.output_queue
+            )
+
+        return self._volatile_sink
+
+    def perform_external_poweron_checks(self) -> bool:
+        self._profiler = ProcessProfiler.start_if_requested(type(self).__name__)
+
+        result = super().perform_external_poweron_checks()
+
+        if self.output_queue is not None:
+            file_printer = QueuedFilePrinter(self.output_queue)
+            file_printer.skip_column = self.file_printer.skip_column
+            file_printer.extra_formatters = self.file_printer.extra_formatters
+
+            self.file_printer = file_printer
+            self.status_file_generator.file_printer = QueuedFilePrinter(
+                self.output_queue
+            )
+
+        return result
+
+    def perform_external_preflight_checks(self) -> bool:
+        result = super().perform_external_preflight_checks()
+
+        if result:
+            self.volatile_sink.flush_if_due()
+        else:
+            # We are about to stop (e.g. autosave): nothing should be left
+            # behind.
+            self.volatile_sink.flush()
+
+        return result
+
+    def perform_external_poweroff_checks(self) -> bool:
+        self.volatile_sink.flush()
+
+        if self.output_queue is not None:
+            # We only leave once our output writer wrote everything - unless
+            # it is gone or stuck.
+            if not self.output_writer.flush_and_wait():
+                logging.critical(
+                    "Our output writer did not write everything we sent. "
+                    "Stopped waiting."
+                )
+
+        result = super().perform_external_poweroff_checks()
+
+        if self._profiler is not None:
+            self._profiler.stop()
+
+        return result
+
     def target(self, consumed: Any) -> Optional[Tuple[Any, ...]]:
         result = super().target(consumed)
 
         if result is not None:
             _, test_result = result
 
+            if self.tested_counter is not None:
+                with self.tested_counter.get_lock():
+                    self.tested_counter.value += 1
+
             if (
                 hasattr(test_result, "status_after_extra_rules")
                 and test_result.status_after_extra_rules is not None
             ):
-
-                FileHelper(outputs.TEMP_VOLATIVE_DESTINATION).write(
-                    test_result.idna_subject + "\n"
-                )
+                self.volatile_sink.add(test_result.idna_subject)
 
         return result
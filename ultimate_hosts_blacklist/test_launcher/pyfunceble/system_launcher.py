@@ -37,20 +37,55 @@ License:
 """
 
 import argparse
+import contextlib
+import copy
+import functools
 import logging
+import multiprocessing
 import os
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Generator, Optional, Set
 
+import domain2idna
 from PyFunceble.cli.system.launcher import SystemLauncher
+from PyFunceble.dataset.public_suffix import PublicSuffixDataset
+from PyFunceble.helpers.dict import DictHelper
 from PyFunceble.helpers.file import FileHelper
-from ultimate_hosts_blacklist.whitelist.core import Core as whitelist_core_tool
+from PyFunceble.query.dns.query_tool import DNSQueryTool
 
 from ultimate_hosts_blacklist.test_launcher.administration import Administration
-from ultimate_hosts_blacklist.test_launcher.defaults import outputs
+from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure, outputs
+from ultimate_hosts_blacklist.test_launcher.helpers.dns_cache import DNSAnswerCache
+from ultimate_hosts_blacklist.test_launcher.helpers.metrics import RunMetrics
+from ultimate_hosts_blacklist.test_launcher.helpers.public_suffix import (
+    PublicSuffixHelper,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.rate_limiter import (
+    AdaptiveRateLimiter,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.server_selector import (
+    DNSServerSelector,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.whitelist import WhitelistHelper
+from ultimate_hosts_blacklist.test_launcher.helpers.zone_order import ZoneOrderHelper
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.output_writer import (
+    OutputWriter,
+)
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.parent_zone import (
+    ParentZoneResolver,
+)
 from ultimate_hosts_blacklist.test_launcher.pyfunceble.producer_worker import (
     UHBPyFuncebleProducerWorker,
 )
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.tester_worker import (
+    UHBPyFuncebleTesterWorker,
+)
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.wildcard_zone import (
+    WildcardZoneResolver,
+)
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.worker_tuner import (
+    WorkerCountTuner,
+)
 
 
 class UHBPyFuncebleSystemLauncher(SystemLauncher):
@@ -59,6 +94,11 @@ class UHBPyFuncebleSystemLauncher(SystemLauncher):
     """
 
     uhb_administration: Optional[Administration] = None
+    _whitelist: Optional[WhitelistHelper] = None
+    output_writer: Optional[OutputWriter] = None
+    worker_tuner: Optional[WorkerCountTuner] = None
+    priority_subjects: Optional[Set[str]] = None
+    priority_lane_sent: bool = False
 
     def __init__(
         self,
@@ -81,117 +121,250 @@ class UHBPyFuncebleSystemLauncher(SystemLauncher):
 
         super().__init__(args=args)
 
-        self.producer_process_manager.WORKER_OBJ = UHBPyFuncebleProducerWorker
+        for manager, worker in (
+            (self.producer_process_manager, UHBPyFuncebleProducerWorker),
+            (self.tester_process_manager, UHBPyFuncebleTesterWorker),
+        ):
+            # Newer versions of PyFunceble renamed WORKER_OBJ to WORKER_CLASS.
+            manager.WORKER_OBJ = manager.WORKER_CLASS = worker
+
+        if self.uhb_administration.output_writer_process:
+            self.output_writer = OutputWriter(multiprocessing.JoinableQueue())
+            UHBPyFuncebleProducerWorker.output_queue = self.output_writer.output_queue
+            UHBPyFuncebleProducerWorker.output_writer = self.output_writer
+
+        if self.uhb_administration.auto_tune_workers:
+            UHBPyFuncebleProducerWorker.tested_counter = multiprocessing.Value("Q", 0)
+
+            self.worker_tuner = WorkerCountTuner(
+                self.tester_process_manager,
+                UHBPyFuncebleProducerWorker.tested_counter,
+                start=self.uhb_administration.tuned_max_workers
+                or infrastructure.WORKER_TUNING_START,
+                maximum=min(
+                    infrastructure.WORKER_TUNING_MAX_WORKERS,
+                    (os.cpu_count() or 1)
+                    * infrastructure.WORKER_TUNING_MAX_WORKERS_PER_CPU,
+                ),
+            )
+
+        if self.uhb_administration.dns_cache:
+            UHBPyFuncebleTesterWorker.dns_cache = DNSAnswerCache(
+                outputs.DNS_CACHE_DESTINATION,
+                max_ttl=self.uhb_administration.dns_cache_max_ttl
+                or infrastructure.DNS_CACHE_MAX_TTL,
+                max_negative_ttl=infrastructure.DNS_CACHE_MAX_NEGATIVE_TTL,
+                max_size=infrastructure.DNS_CACHE_MAX_SIZE,
+            )
+            UHBPyFuncebleTesterWorker.dns_cache_statistics = multiprocessing.Array(
+                "Q", len(UHBPyFuncebleTesterWorker.DNS_CACHE_STATISTICS)
+            )
+
+        if self.uhb_administration.dns_rate_limit:
+            UHBPyFuncebleTesterWorker.rate_limiter = AdaptiveRateLimiter(
+                DNSQueryTool().nameservers.get_nameservers() or [],
+                rates=self.uhb_administration.dns_rate_limits,
+            )
+
+        if self.uhb_administration.dns_server_selection:
+            dns_query_tool = DNSQueryTool()
+
+            UHBPyFuncebleTesterWorker.server_selector = DNSServerSelector(
+                dns_query_tool.nameservers.get_nameservers() or [],
+                penalty=dns_query_tool.query_timeout,
+            )
+
+        if os.path.isfile(outputs.PRIORITY_LANE_DESTINATION):
+            self.priority_subjects = set(
+                self.get_subjects(FileHelper(outputs.PRIORITY_LANE_DESTINATION))
+            )
+
+        if self.priority_subjects:
+            self.tester_process_manager.push_to_input_queue = functools.partial(
+                self.push_with_priority_lane,
+                self.tester_process_manager.push_to_input_queue,
+            )
 
         logging.debug("CI Engine: %r", self.continuous_integration)
         logging.debug(
             "CI Engine authorized ? %r", self.continuous_integration.authorized
         )
 
-    def update_clean_list(self) -> "UHBPyFuncebleSystemLauncher":
+    @property
+    def whitelist(self) -> WhitelistHelper:
         """
-        Updates the content of the :code:`clean.list` file.
+        Provides the whitelist used by our list generations.
         """
 
-        input_file = FileHelper(outputs.ACTIVE_SUBJECTS_DESTINATION)
-        clean_file = FileHelper(outputs.CLEAN_DESTINATION)
+        if self._whitelist is None:
+            self._whitelist = WhitelistHelper(use_official=True)
 
-        if input_file.exists():
-            logging.info("Started generation of %r.", clean_file.path)
+        return self._whitelist
 
-            with input_file.open(
-                "r", encoding="utf-8"
-            ) as input_file_stream, clean_file.open(
-                "w", encoding="utf-8"
-            ) as clean_file_stream:
-                for line in input_file_stream:
-                    line = line.strip()
+    @staticmethod
+    def get_subjects(file: FileHelper) -> Generator[str, None, None]:
+        """
+        Provides the (formatted) subjects of the given result file.
+        """
 
-                    if not line or line.startswith("#") or "." not in line:
-                        continue
+        if not file.exists():
+            return
 
-                    if line.endswith("."):
-                        line = line[:-1]
+        with file.open("r", encoding="utf-8") as file_stream:
+            for line in file_stream:
+                line = line.strip()
 
-                    clean_file_stream.write("\n" + line)
+                if not line or line.startswith("#") or "." not in line:
+                    continue
 
-            logging.info("Finished generation of %r.", clean_file.path)
+                if line.endswith("."):
+                    line = line[:-1]
 
-        return self
+                yield line
 
-    def update_whitelisted_list(self) -> "UHBPyFuncebleSystemLauncher":
+    def push_with_priority_lane(
+        self, push: Callable[..., Any], data: Any, **kwargs
+    ) -> Any:
         """
-        Updates the content of the :code:`whitelist.list` file.
+        Pushes the given data to our testers. Before the first subject of our
+        input file, the subjects of our priority lane are pushed. Their later
+        occurrences are skipped - except their inactive retests: our testers
+        ignore a subject of the inactive database unless it comes from there.
+
+        :param push:
+            The original push method of the tester process manager.
+        :param data:
+            The data to push.
         """
 
-        input_file = FileHelper(outputs.CLEAN_DESTINATION)
-        whitelist_file = FileHelper(outputs.WHITELISTED_DESTINATION)
-
-        if input_file.exists():
-            logging.info("Started generation of %r.", whitelist_file.path)
-
-            whitelist_core_tool(
-                output_file=whitelist_file.path,
-                use_official=True,
-                processes=os.cpu_count(),
-            ).filter(file=input_file.path, already_formatted=True, standard_sort=False)
+        if not isinstance(data, dict) or data.get("type") != "file":
+            return push(data, **kwargs)
 
-            logging.info("Finished generation of %r.", whitelist_file.path)
+        if not self.priority_lane_sent:
+            self.priority_lane_sent = True
 
-        return self
+            logging.info(
+                "Started to push %d subject(s) of the priority lane.",
+                len(self.priority_subjects),
+            )
 
-    def update_volatile_list(self) -> "UHBPyFuncebleSystemLauncher":
+            if self.uhb_administration.zone_ordering:
+                priority_subjects = ZoneOrderHelper.sort(self.priority_subjects)
+            else:
+                priority_subjects = sorted(self.priority_subjects)
+
+            for subject in priority_subjects:
+                to_send = copy.deepcopy(data)
+                to_send["subject"] = subject
+                to_send["idna_subject"] = domain2idna.domain2idna(subject)
+
+                # Let our testers skip what a previous session already tested.
+                to_send.pop("from_preload", None)
+                to_send.pop("from_inactive", None)
+
+                push(to_send, **kwargs)
+
+        if "from_inactive" not in data and (
+            data.get("subject") in self.priority_subjects
+            or data.get("idna_subject") in self.priority_subjects
+        ):
+            return self.tester_process_manager
+
+        return push(data, **kwargs)
+
+    @RunMetrics.span(
+        "update_domain_lists",
+        files=[
+            outputs.CLEAN_DESTINATION,
+            outputs.WHITELISTED_DESTINATION,
+            outputs.VOLATILE_DESTINATION,
+        ],
+    )
+    def update_domain_lists(self) -> "UHBPyFuncebleSystemLauncher":
         """
-        Updates the content of the :code:`volatile.list` file.
+        Updates the content of the :code:`clean.list`, :code:`whitelisted.list`
+        and :code:`volatile.list` files.
+
+        All of them are generated while reading each source once.
         """
 
-        input_file = FileHelper(outputs.TEMP_VOLATIVE_DESTINATION)
-        volatile_file = FileHelper(outputs.VOLATILE_DESTINATION)
+        active_file = FileHelper(outputs.ACTIVE_SUBJECTS_DESTINATION)
+        temp_volatile_file = FileHelper(outputs.TEMP_VOLATIVE_DESTINATION)
         clean_file = FileHelper(outputs.CLEAN_DESTINATION)
+        whitelist_file = FileHelper(outputs.WHITELISTED_DESTINATION)
+        volatile_file = FileHelper(outputs.VOLATILE_DESTINATION)
 
-        logging.info("Started generation of %r.", volatile_file.path)
+        # Without new results, we work from our previous clean list.
+        update_clean = active_file.exists()
+        update_whitelisted = update_clean or clean_file.exists()
 
-        with volatile_file.open("w", encoding="utf-8") as volatile_file_stream:
-            if clean_file.exists():
-                with clean_file.open("r", encoding="utf-8") as clean_file_stream:
-                    for line in clean_file_stream:
-                        line = line.strip()
+        if update_clean:
+            source_file = active_file
+        else:
+            source_file = clean_file
 
-                        if not line or line.startswith("#") or "." not in line:
-                            continue
+        logging.info(
+            "Started generation of %r, %r and %r.",
+            clean_file.path,
+            whitelist_file.path,
+            volatile_file.path,
+        )
 
-                        if line.endswith("."):
-                            line = line[:-1]
+        clean_file_stream = whitelist_file_stream = None
 
-                        volatile_file_stream.write(line + "\n")
+        with contextlib.ExitStack() as stack:
+            volatile_file_stream = stack.enter_context(
+                volatile_file.open("w", encoding="utf-8")
+            )
 
-            if input_file.exists():
-                with input_file.open("r", encoding="utf-8") as input_file_stream:
-                    for line in input_file_stream:
-                        line = line.strip()
+            if update_clean:
+                clean_file_stream = stack.enter_context(
+                    clean_file.open("w", encoding="utf-8")
+                )
 
-                        if not line or line.startswith("#") or "." not in line:
-                            continue
+            if update_whitelisted:
+                whitelist_file_stream = stack.enter_context(
+                    whitelist_file.open("w", encoding="utf-8")
+                )
+
+            whitelisted_written = volatile_written = False
+
+            for subject in self.get_subjects(source_file):
+                if update_clean:
+                    clean_file_stream.write("\n" + subject)
+
+                if self.whitelist.is_whitelisted(subject):
+                    continue
 
-                        if line.endswith("."):
-                            line = line[:-1]
+                whitelist_file_stream.write(subject + "\n")
+                volatile_file_stream.write(subject + "\n")
 
-                        volatile_file_stream.write(line + "\n")
+                whitelisted_written = volatile_written = True
 
-            volatile_file.write("\n")
+            for subject in self.get_subjects(temp_volatile_file):
+                if self.whitelist.is_whitelisted(subject):
+                    continue
 
-        whitelist_core_tool(
-            output_file=volatile_file.path,
-            use_official=True,
-            processes=os.cpu_count(),
-        ).filter(file=volatile_file.path, already_formatted=True, standard_sort=False)
+                volatile_file_stream.write(subject + "\n")
+                volatile_written = True
 
-        logging.info("Finished generation of %r.", volatile_file.path)
+            if update_whitelisted and not whitelisted_written:
+                whitelist_file_stream.write("\n")
+
+            if not volatile_written:
+                volatile_file_stream.write("\n")
+
+        logging.info(
+            "Finished generation of %r, %r and %r.",
+            clean_file.path,
+            whitelist_file.path,
+            volatile_file.path,
+        )
 
         return self
 
-    @staticmethod
-    def update_ip_list() -> "UHBPyFuncebleSystemLauncher":
+    @RunMetrics.span("update_ip_list", files=[outputs.IP_DESTINATION])
+    def update_ip_list(self) -> "UHBPyFuncebleSystemLauncher":
         """
         Updates the content of the :code:`ip.list` file.
         """
@@ -202,6 +375,8 @@ class UHBPyFuncebleSystemLauncher(SystemLauncher):
         if input_file.exists():
             logging.info("Started generation of %r.", ip_file.path)
 
+            written = False
+
             with input_file.open(
                 "r", encoding="utf-8"
             ) as input_file_stream, ip_file.open(
@@ -211,24 +386,245 @@ class UHBPyFuncebleSystemLauncher(SystemLauncher):
                     if not line.strip() or line.startswith("#"):
                         continue
 
-                    ip_file_stream.write("\n".join(line.split()[1:]) + "\n")
+                    for subject in line.split()[1:]:
+                        if self.whitelist.is_whitelisted(subject):
+                            continue
 
-                ip_file_stream.write("\n")
+                        ip_file_stream.write(subject + "\n")
+                        written = True
 
-            whitelist_core_tool(
-                output_file=ip_file.path,
-                use_official=True,
-                processes=os.cpu_count(),
-            ).filter(file=ip_file.path, already_formatted=True, standard_sort=False)
+                if not written:
+                    ip_file_stream.write("\n")
 
             logging.info("Finished generation of %r.", ip_file.path)
 
+        return self
+
+    def record_worker_tuning(self) -> "UHBPyFuncebleSystemLauncher":
+        """
+        Records the number of testers our worker tuning settled on, so that
+        the next run starts with it.
+        """
+
+        if self.worker_tuner is not None:
+            self.uhb_administration.tuned_max_workers = self.worker_tuner.current
+
+        return self
+
+    @staticmethod
+    def record_dns_cache() -> None:
+        """
+        Records the statistics of our DNS cache into the run report, and
+        prunes it.
+        """
+
+        dns_cache = UHBPyFuncebleTesterWorker.dns_cache
+
+        if dns_cache is None:
+            return
+
+        statistics = dict(
+            zip(
+                UHBPyFuncebleTesterWorker.DNS_CACHE_STATISTICS,
+                UHBPyFuncebleTesterWorker.dns_cache_statistics,
+            )
+        )
+        lookups = statistics["hits"] + statistics["misses"]
+
+        statistics["hit_ratio"] = (
+            round(statistics["hits"] / lookups, 4) if lookups else None
+        )
+
+        RunMetrics.set_section("dns_cache", statistics)
+
+        logging.info("DNS cache: %r", statistics)
+
+        with RunMetrics.span("prune_dns_cache"):
+            dns_cache.prune()
+            dns_cache.close()
+
+    def record_dns_rate_limit(self) -> "UHBPyFuncebleSystemLauncher":
+        """
+        Records the statistics of our DNS rate limiter into the run report,
+        and the rates it settled on, so that the next run starts with them.
+        """
+
+        rate_limiter = UHBPyFuncebleTesterWorker.rate_limiter
+
+        if rate_limiter is None:
+            return self
+
+        statistics = rate_limiter.get_statistics()
+
+        RunMetrics.set_section("dns_rate_limit", statistics)
+        self.uhb_administration.dns_rate_limits = rate_limiter.get_rates()
+
+        logging.info("DNS rate limit: %r", statistics)
+
+        return self
+
+    @staticmethod
+    def record_dns_servers() -> None:
+        """
+        Records the statistics of our DNS server selector into the run report.
+        """
+
+        server_selector = UHBPyFuncebleTesterWorker.server_selector
+
+        if server_selector is None:
+            return
+
+        statistics = server_selector.get_statistics()
+
+        RunMetrics.set_section("dns_servers", statistics)
+
+        logging.info("DNS servers: %r", statistics)
+
+    @RunMetrics.span("resolve_zones")
+    def resolve_zones(self) -> "UHBPyFuncebleSystemLauncher":
+        """
+        Groups the subjects of our input file by parent and lets our (active)
+        zone resolvers check the parents. Our testers then skip the subjects
+        our zone resolvers already know the status of.
+
+        What our zone resolvers found is kept until the end of the test
+        cycle, so that the next sessions don't have to check again.
+        """
+
+        public_suffix = PublicSuffixHelper(PublicSuffixDataset().get_content())
+        zone_resolvers = {}
+
+        if self.uhb_administration.parent_zone_short_circuit:
+            UHBPyFuncebleTesterWorker.parent_zone = ParentZoneResolver(
+                public_suffix,
+                min_subjects=infrastructure.PARENT_ZONE_MIN_SUBDOMAINS,
+                threads=infrastructure.ZONE_RESOLVER_THREADS,
+                rate_limiter=UHBPyFuncebleTesterWorker.rate_limiter,
+                server_selector=UHBPyFuncebleTesterWorker.server_selector,
+                cache=UHBPyFuncebleTesterWorker.dns_cache,
+            )
+            zone_resolvers["parent_zone"] = UHBPyFuncebleTesterWorker.parent_zone
+
+        if self.uhb_administration.wildcard_zone_short_circuit:
+            UHBPyFuncebleTesterWorker.wildcard_zone = WildcardZoneResolver(
+                public_suffix,
+                min_subjects=infrastructure.WILDCARD_ZONE_MIN_SUBDOMAINS,
+                threads=infrastructure.ZONE_RESOLVER_THREADS,
+                rate_limiter=UHBPyFuncebleTesterWorker.rate_limiter,
+                server_selector=UHBPyFuncebleTesterWorker.server_selector,
+            )
+            zone_resolvers["wildcard_zone"] = UHBPyFuncebleTesterWorker.wildcard_zone
+
+            # The parent zones are resolved first, so that we don't probe what
+            # does not exist.
+            UHBPyFuncebleTesterWorker.wildcard_zone.parent_zone = (
+                UHBPyFuncebleTesterWorker.parent_zone
+            )
+
+        saved = DictHelper().from_json_file(outputs.ZONES_DESTINATION)
+        to_resolve = []
+
+        for name, zone_resolver in zone_resolvers.items():
+            if name in saved:
+                zone_resolver.load(saved[name])
+
+                logging.info(
+                    "%s: Loaded %d match(es) of a previous session.",
+                    type(zone_resolver).__name__,
+                    len(zone_resolver.matches),
+                )
+            else:
+                to_resolve.append(zone_resolver)
+
+        if to_resolve:
+            for zone_resolver in to_resolve:
+                zone_resolver.add_all(
+                    self.get_subjects(FileHelper(outputs.INPUT_DESTINATION))
+                )
+
+                # Whatever got checked before the CI time is exceeded is kept.
+                zone_resolver.resolve(self.continuous_integration.is_time_exceeded)
+
+            DictHelper(
+                {name: x.dump() for name, x in zone_resolvers.items()}
+            ).to_json_file(outputs.ZONES_DESTINATION)
+
+        UHBPyFuncebleTesterWorker.short_circuit_statistics = multiprocessing.Array(
+            "Q", len(UHBPyFuncebleTesterWorker.SHORT_CIRCUITS)
+        )
+
+        return self
+
+    @staticmethod
+    def record_zones() -> None:
+        """
+        Records the statistics of our zone resolvers into the run report.
+        """
+
+        if UHBPyFuncebleTesterWorker.short_circuit_statistics is None:
+            return
+
+        short_circuited = dict(
+            zip(
+                UHBPyFuncebleTesterWorker.SHORT_CIRCUITS,
+                UHBPyFuncebleTesterWorker.short_circuit_statistics,
+            )
+        )
+
+        parent_zone = UHBPyFuncebleTesterWorker.parent_zone
+
+        if parent_zone is not None:
+            statistics = {
+                "parents": parent_zone.statistics["parents"],
+                "dead_parents": parent_zone.statistics["matches"],
+                "dead_subdomains": parent_zone.statistics["subjects"],
+                "short_circuited": short_circuited["parent_zone"],
+                "probe_queries": parent_zone.statistics["queries"],
+            }
+
+            RunMetrics.set_section("parent_zone", statistics)
+
+            logging.info("Parent zones: %r", statistics)
+
+        wildcard_zone = UHBPyFuncebleTesterWorker.wildcard_zone
+
+        if wildcard_zone is not None:
+            statistics = {
+                "parents": wildcard_zone.statistics["parents"],
+                "wildcard_parents": wildcard_zone.statistics["matches"],
+                "wildcard_subdomains": wildcard_zone.statistics["subjects"],
+                "short_circuited": short_circuited["wildcard_zone"],
+                "probe_queries": wildcard_zone.statistics["queries"],
+            }
+
+            RunMetrics.set_section("wildcard_zone", statistics)
+
+            logging.info("Wildcard zones: %r", statistics)
+
     def run_ci_saving_instructions(self) -> "SystemLauncher":
         if not self.uhb_administration.currently_under_test:
             self.uhb_administration.currently_under_test = True
 
+        self.record_worker_tuning()
+        self.record_dns_cache()
+        self.record_dns_rate_limit()
+        self.record_dns_servers()
+        self.record_zones()
+
+        # The CI engine pushes our changes, so the report has to be ready
+        # before.
+        RunMetrics.save(self.uhb_administration)
+
         self.uhb_administration.save()
-        return super().run_ci_saving_instructions()
+
+        if UHBPyFuncebleTesterWorker.dns_cache is None:
+            return super().run_ci_saving_instructions()
+
+        # Our testers may still be running (e.g. when the time is exceeded in
+        # the middle of a session). Nothing should be written into our DNS
+        # cache while it is committed.
+        with UHBPyFuncebleTesterWorker.dns_cache.locked():
+            return super().run_ci_saving_instructions()
 
     def run_standard_end_instructions(self) -> "SystemLauncher":
         self.uhb_administration.currently_under_test = False
@@ -239,14 +635,29 @@ class UHBPyFuncebleSystemLauncher(SystemLauncher):
             end_datetime
         )
 
+        self.record_worker_tuning()
         self.uhb_administration.save()
 
-        self.update_clean_list()
-        self.update_whitelisted_list()
-        self.update_volatile_list()
+        self.update_domain_lists()
         self.update_ip_list()
 
-        return super().run_standard_end_instructions()
+        # Everything got tested. Nothing is left to prioritize, and the zones
+        # have to be checked again during the next test cycle.
+        FileHelper(outputs.PRIORITY_LANE_DESTINATION).delete()
+        FileHelper(outputs.ZONES_DESTINATION).delete()
+
+        with RunMetrics.span("generate_waiting_files"):
+            super().run_standard_end_instructions()
+
+        self.record_dns_cache()
+        self.record_dns_rate_limit()
+        self.record_dns_servers()
+        self.record_zones()
+
+        RunMetrics.save(self.uhb_administration)
+        self.uhb_administration.save()
+
+        return self
 
     def start(self) -> "SystemLauncher":
         if not self.uhb_administration.currently_under_test:
@@ -265,4 +676,21 @@ class UHBPyFuncebleSystemLauncher(SystemLauncher):
             self.uhb_administration.start_epoch = start_datetime
             self.uhb_administration.start_datetime = start_datetime
 
-        return super().start()
+        if (
+            self.uhb_administration.parent_zone_short_circuit
+            or self.uhb_administration.wildcard_zone_short_circuit
+        ):
+            # Our testers inherit the result - so it has to be ready before they
+            # are started.
+            self.resolve_zones()
+
+        for helper in (self.output_writer, self.worker_tuner):
+            if helper is not None:
+                helper.start()
+
+        try:
+            return super().start()
+        finally:
+            for helper in (self.worker_tuner, self.output_writer):
+                if helper is not None:
+                    helper.stop()
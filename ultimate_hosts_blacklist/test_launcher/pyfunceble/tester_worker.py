@@ -0,0 +1,238 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+Provides our tester worker.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import datetime
+import functools
+import multiprocessing.sharedctypes
+from typing import Callable, Dict, Optional
+
+import PyFunceble.storage
+from PyFunceble.checker.base import CheckerBase
+from PyFunceble.cli.processes.workers.tester import TesterWorker
+
+from ultimate_hosts_blacklist.test_launcher.helpers.dns_cache import DNSAnswerCache
+from ultimate_hosts_blacklist.test_launcher.helpers.profiler import ProcessProfiler
+from ultimate_hosts_blacklist.test_launcher.helpers.rate_limiter import (
+    AdaptiveRateLimiter,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.server_selector import (
+    DNSServerSelector,
+)
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.dns_query_tool import (
+    UHBDNSQueryTool,
+)
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.parent_zone import (
+    ParentZoneResolver,
+)
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.wildcard_zone import (
+    WildcardZoneResolver,
+)
+
+
+class UHBPyFuncebleTesterWorker(TesterWorker):
+    """
+    Provides a modified version of PyFunceble's tester worker.
+
+    When the :code:`dns_cache` class attribute is set (by the launcher,
+    before the workers are forked), our checkers consult it before querying
+    the nameservers. Our hits, misses and stores are added to the
+    :code:`dns_cache_statistics` (shared) array when we stop.
+
+    When the :code:`rate_limiter` class attribute is set, it paces our
+    queries - instead of the fixed cooldown between two subjects. When the
+    :code:`server_selector` class attribute is set, it decides which
+    nameserver we query first.
+
+    When the :code:`parent_zone` class attribute is set, the domains under a
+    parent which does not exist are INACTIVE without being queried. When the
+    :code:`wildcard_zone` class attribute is set, the domains right under a
+    wildcard are ACTIVE - with the answer of the wildcard - without being
+    queried. Their numbers are added to the :code:`short_circuit_statistics`
+    (shared) array when we stop.
+    """
+
+    DNS_CACHE_STATISTICS: tuple = ("hits", "misses", "stores")
+
+    dns_cache: Optional[DNSAnswerCache] = None
+    dns_cache_statistics: Optional[multiprocessing.sharedctypes.SynchronizedArray] = (
+        None
+    )
+
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+    server_selector: Optional[DNSServerSelector] = None
+
+    SHORT_CIRCUITS: tuple = ("parent_zone", "wildcard_zone")
+
+    parent_zone: Optional[ParentZoneResolver] = None
+    wildcard_zone: Optional[WildcardZoneResolver] = None
+    short_circuit_statistics: Optional[
+        multiprocessing.sharedctypes.SynchronizedArray
+    ] = None
+
+    short_circuited: Optional[Dict[str, int]] = None
+
+    _profiler: Optional[ProcessProfiler] = None
+
+    def perform_external_poweron_checks(self) -> bool:
+        self._profiler = ProcessProfiler.start_if_requested(type(self).__name__)
+        self.short_circuited = dict.fromkeys(self.SHORT_CIRCUITS, 0)
+
+        result = super().perform_external_poweron_checks()
+
+        if self.rate_limiter is not None:
+            # Our rate limiter paces our queries, the cooldown would only slow
+            # us down.
+            PyFunceble.storage.CONFIGURATION.cli_testing.cooldown_time = 0
+
+        return result
+
+    def perform_external_poweroff_checks(self) -> bool:
+        result = super().perform_external_poweroff_checks()
+
+        if self.dns_cache is not None:
+            self.dns_cache.close()
+
+            if self.dns_cache_statistics is not None:
+                statistics = self.dns_cache.get_statistics()
+
+                with self.dns_cache_statistics.get_lock():
+                    for index, key in enumerate(self.DNS_CACHE_STATISTICS):
+                        self.dns_cache_statistics[index] += statistics[key]
+
+        if self.short_circuit_statistics is not None:
+            with self.short_circuit_statistics.get_lock():
+                for index, key in enumerate(self.SHORT_CIRCUITS):
+                    self.short_circuit_statistics[index] += self.short_circuited[key]
+
+        if self._profiler is not None:
+            self._profiler.stop()
+
+        return result
+
+    def _init_testing_object(
+        self, subject_type: str, checker_type: str
+    ) -> Optional[CheckerBase]:
+        result = super()._init_testing_object(subject_type, checker_type)
+
+        if (
+            any(
+                x is not None
+                for x in (self.dns_cache, self.rate_limiter, self.server_selector)
+            )
+            and hasattr(result, "dns_query_tool")
+            and not isinstance(result.dns_query_tool, UHBDNSQueryTool)
+        ):
+            # Our checkers never configure their DNS query tool themselves.
+            # Therefore, a freshly (and guessed) configured one is equivalent.
+            result.dns_query_tool = UHBDNSQueryTool(
+                self.dns_cache,
+                rate_limiter=self.rate_limiter,
+                server_selector=self.server_selector,
+            )
+
+        if (
+            (self.parent_zone is not None or self.wildcard_zone is not None)
+            and hasattr(result, "dns_query_tool")
+            and "query_status" not in vars(result)
+        ):
+            result.query_status = functools.partial(
+                self.query_status_with_zones, result, result.query_status
+            )
+
+        return result
+
+    def query_status_with_zones(
+        self, checker: CheckerBase, query_status: Callable[[], CheckerBase]
+    ) -> CheckerBase:
+        """
+        Queries the status of the subject of the given checker - unless our
+        zone resolvers already know it.
+
+        :param checker:
+            The availability checker to work with.
+        :param query_status:
+            The original query method of the checker.
+        """
+
+        if not checker.status.domain_syntax or checker.status.ip_syntax:
+            return query_status()
+
+        if self.parent_zone is not None and self.parent_zone.get_match(
+            checker.idna_subject
+        ):
+            return self.short_circuit(
+                checker, "parent_zone", PyFunceble.storage.STATUS.down
+            )
+
+        if self.wildcard_zone is not None:
+            answers = self.wildcard_zone.get_match(checker.idna_subject)
+
+            if answers:
+                checker.status.dns_lookup = {"A": answers}
+
+                return self.short_circuit(
+                    checker, "wildcard_zone", PyFunceble.storage.STATUS.up
+                )
+
+        return query_status()
+
+    def short_circuit(
+        self, checker: CheckerBase, name: str, status: str
+    ) -> CheckerBase:
+        """
+        Gives the given status to the subject of the given checker - as if it
+        was given by its DNS lookup.
+
+        :param checker:
+            The availability checker to work with.
+        :param name:
+            The name of the short-circuit - as counted.
+        :param status:
+            The status to give.
+        """
+
+        checker.status.status = status
+        checker.status.status_source = "DNSLOOKUP"
+
+        if checker.use_extra_rules:
+            checker.try_to_query_status_from_extra_rules()
+
+        checker.status.tested_at = datetime.datetime.now(datetime.timezone.utc)
+
+        self.short_circuited[name] += 1
+
+        return checker
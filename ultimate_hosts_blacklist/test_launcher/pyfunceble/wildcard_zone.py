@@ -0,0 +1,102 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides our wildcard zone resolver.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import secrets
+from typing import List, Optional
+
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.parent_zone import (
+    ParentZoneResolver,
+)
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.zone_resolver import (
+    ZoneResolverBase,
+)
+
+
+class WildcardZoneResolver(ZoneResolverBase):
+    """
+    Provides a way to find the zones with a wildcard record, so that the
+    testing of their subdomains can be skipped.
+
+    A parent is probed through random labels. When all of them resolve to
+    the same answer, the parent synthesizes it for any name right under it:
+    the subjects right under it are ACTIVE - with the synthesized answer.
+
+    .. note::
+        We group by direct parent (and never by public suffix): a wildcard
+        only covers the names whose closest existing ancestor holds it.
+
+    When the :code:`parent_zone` attribute is set, the subjects under a
+    registrable domain which does not exist are not grouped: nothing - not
+    even a wildcard - exists under it, so probing would only cost queries.
+    """
+
+    # The number of random labels we probe a parent with.
+    PROBES: int = 2
+
+    parent_zone: Optional[ParentZoneResolver] = None
+
+    def get_parent(self, subject: str) -> Optional[str]:
+        labels = subject.lower().rstrip(".").split(".", 1)
+
+        if len(labels) < 2 or not self.public_suffix.get_registrable_domain(labels[1]):
+            return None
+
+        return labels[1]
+
+    def add(self, subject: str) -> "WildcardZoneResolver":
+        if self.parent_zone is not None and self.parent_zone.get_match(subject):
+            return self
+
+        return super().add(subject)
+
+    def check(self, parent: str) -> Optional[List[str]]:
+        query_tool = self.dns_query_tool
+        result = None
+
+        for _ in range(self.PROBES):
+            answers = (
+                query_tool.set_subject(f"{secrets.token_hex(8)}.{parent}")
+                .set_query_record_type("A")
+                .query()
+            )
+
+            if not answers or (result is not None and sorted(answers) != result):
+                return None
+
+            result = sorted(answers)
+
+        return result
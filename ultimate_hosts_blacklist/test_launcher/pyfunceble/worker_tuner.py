@@ -0,0 +1,255 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+Provides the tuner of our number of testers.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import logging
+import multiprocessing.sharedctypes
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from PyFunceble.ext.process_manager.core import ProcessManagerCore
+
+from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure
+
+
+class WorkerCountTuner(threading.Thread):
+    """
+    Provides a thread which tunes the number of testers while we test.
+
+    Availability tests are mostly waiting for the DNS. Therefore, we start
+    with a small pool and grow it as long as it brings more tested subjects
+    per second. Once a growth stops paying off (the knee of the throughput
+    curve), we step back to the previous size and stay there. Whenever the
+    CPU or the memory of the runner gets short, we shrink the pool.
+
+    :param manager:
+        The tester process manager to tune.
+    :param counter:
+        The (shared) number of tested subjects.
+    :param start:
+        The number of testers to start with.
+    :param maximum:
+        The maximum number of testers we are allowed to run.
+    """
+
+    PROC_STAT_FILE: str = "/proc/stat"
+    PROC_MEMINFO_FILE: str = "/proc/meminfo"
+
+    INTERVAL: float = infrastructure.WORKER_TUNING_INTERVAL
+    MIN_GAIN: float = 0.1
+    MAX_CPU_USAGE: float = 0.9
+    MIN_AVAILABLE_MEMORY: float = 0.15
+
+    manager: Optional[ProcessManagerCore] = None
+    counter: Optional[multiprocessing.sharedctypes.Synchronized] = None
+
+    current: int = 1
+    maximum: int = 1
+    settled: bool = False
+    throughputs: Optional[Dict[int, float]] = None
+
+    def __init__(
+        self,
+        manager: ProcessManagerCore,
+        counter: multiprocessing.sharedctypes.Synchronized,
+        *,
+        start: int,
+        maximum: int,
+    ) -> None:
+        self.manager = manager
+        self.counter = counter
+
+        self.maximum = max(1, maximum)
+        self.current = min(max(1, start), self.maximum)
+        self.throughputs = {}
+
+        self.stop_event = threading.Event()
+        self.previous_cpu_times: Optional[Tuple[int, int]] = None
+
+        super().__init__(name="uhb-worker-tuner", daemon=True)
+
+        self.apply(self.current)
+
+    @classmethod
+    def get_cpu_usage(cls, previous: Optional[Tuple[int, int]]) -> Tuple[
+        Optional[float],
+        Optional[Tuple[int, int]],
+    ]:
+        """
+        Provides the CPU usage (0..1) of the whole runner since the given
+        previous reading.
+
+        :return:
+            The usage and the reading to give to the next call.
+        """
+
+        try:
+            with open(cls.PROC_STAT_FILE, "r", encoding="utf-8") as file_stream:
+                times = [int(x) for x in file_stream.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None, None
+
+        # idle + iowait.
+        current = (sum(times), times[3] + (times[4] if len(times) > 4 else 0))
+
+        if not previous or current[0] <= previous[0]:
+            return None, current
+
+        total, idle = current[0] - previous[0], current[1] - previous[1]
+
+        return 1.0 - idle / total, current
+
+    @classmethod
+    def get_available_memory(cls) -> Optional[float]:
+        """
+        Provides the part (0..1) of the memory of the runner which is still
+        available.
+        """
+
+        try:
+            with open(cls.PROC_MEMINFO_FILE, "r", encoding="utf-8") as file_stream:
+                meminfo = {
+                    x.split(":", 1)[0]: int(x.split(":", 1)[1].split()[0])
+                    for x in file_stream
+                    if ":" in x
+                }
+        except (OSError, ValueError, IndexError):
+            return None
+
+        if not meminfo.get("MemTotal") or "MemAvailable" not in meminfo:
+            return None
+
+        return meminfo["MemAvailable"] / meminfo["MemTotal"]
+
+    def apply(self, value: int) -> None:
+        """
+        Applies the given number of testers.
+
+        Growing is handled by the (dynamic) scaling of the manager, which
+        spawns testers as subjects come. When shrinking, we ask the
+        superfluous testers to leave. As all testers share the same input
+        queue, nothing is lost.
+        """
+
+        self.current = value
+        self.manager.max_workers = value
+
+        for worker in list(self.manager.running_workers)[value:]:
+            worker.push_to_input_queue(
+                "__immediate_shutdown__", destination_worker=worker.name
+            )
+
+        logging.info("Number of testers set to %d.", value)
+
+    def tune(self, throughput: float, cpu_usage: Optional[float]) -> None:
+        """
+        Decides the number of testers, given the throughput (tested subjects
+        per second) we measured with the current one.
+        """
+
+        available_memory = self.get_available_memory()
+
+        under_pressure = (cpu_usage is not None and cpu_usage > self.MAX_CPU_USAGE) or (
+            available_memory is not None
+            and available_memory < self.MIN_AVAILABLE_MEMORY
+        )
+
+        logging.debug(
+            "Testers: %d | Throughput: %.2f/s | CPU: %r | Available memory: %r",
+            self.current,
+            throughput,
+            cpu_usage,
+            available_memory,
+        )
+
+        self.throughputs[self.current] = throughput
+
+        if under_pressure:
+            if self.current > 1:
+                self.apply(max(1, self.current * 3 // 4))
+
+            self.settled = True
+            return
+
+        if self.settled:
+            return
+
+        smaller = [x for x in self.throughputs if x < self.current]
+
+        if smaller:
+            previous = max(smaller)
+
+            if throughput < self.throughputs[previous] * (1 + self.MIN_GAIN):
+                # Our last growth did not pay off: we found the knee.
+                self.apply(previous)
+                self.settled = True
+                return
+
+        if self.current >= self.maximum:
+            self.settled = True
+            return
+
+        self.apply(min(self.maximum, self.current + max(1, self.current // 2)))
+
+    def run(self) -> None:
+        _, self.previous_cpu_times = self.get_cpu_usage(None)
+
+        previous_count = self.counter.value
+        previous_time = time.monotonic()
+
+        while not self.stop_event.wait(self.INTERVAL):
+            count, now = self.counter.value, time.monotonic()
+
+            cpu_usage, self.previous_cpu_times = self.get_cpu_usage(
+                self.previous_cpu_times
+            )
+
+            if count > previous_count:
+                # No test, no information (e.g. we are still preloading).
+                self.tune((count - previous_count) / (now - previous_time), cpu_usage)
+
+            previous_count, previous_time = count, now
+
+    def stop(self) -> None:
+        """
+        Stops the tuning.
+        """
+
+        self.stop_event.set()
+
+        if self.is_alive():
+            self.join()
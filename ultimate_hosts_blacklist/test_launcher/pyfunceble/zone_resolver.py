@@ -0,0 +1,267 @@
+"""
+The test launcher of the Ultimate-Hosts-Blacklist project.
+
+This is the module that provides the base of our zone resolvers.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+License:
+::
+
+
+    MIT License
+
+    Copyright (c) 2019-2024 Mitchell Krog - @mitchellkrogza
+    Copyright (c) 2019-2024 Nissar Chababy - @funilrys
+    Copyright (c) 2019-2024 Ultimate Hosts Blacklist - @Ultimate-Hosts-Blacklist Contributors
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ultimate_hosts_blacklist.test_launcher.helpers.dns_cache import DNSAnswerCache
+from ultimate_hosts_blacklist.test_launcher.helpers.public_suffix import (
+    PublicSuffixHelper,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.rate_limiter import (
+    AdaptiveRateLimiter,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.server_selector import (
+    DNSServerSelector,
+)
+from ultimate_hosts_blacklist.test_launcher.pyfunceble.dns_query_tool import (
+    CountingDNSQueryTool,
+)
+
+
+class ZoneResolverBase:
+    """
+    Provides the base of our zone resolvers.
+
+    A zone resolver groups the subjects of our input by parent, checks
+    (concurrently) the parents which have enough subjects, and tells which
+    subjects are under a matching parent - so that our testers can skip them.
+
+    :param public_suffix:
+        The public suffix helper to group the subjects with.
+    :param min_subjects:
+        The minimum number of subjects a parent should have to be checked.
+    :param threads:
+        The number of concurrent checks.
+    :param rate_limiter:
+        The rate limiter to pace our queries with.
+    :param server_selector:
+        The server selector to route our queries with.
+    :param cache:
+        The DNS cache to consult before querying.
+    """
+
+    public_suffix: Optional[PublicSuffixHelper] = None
+    min_subjects: int = 2
+    threads: int = 16
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+    server_selector: Optional[DNSServerSelector] = None
+    cache: Optional[DNSAnswerCache] = None
+
+    subjects: Optional[Dict[str, int]] = None
+    matches: Optional[Dict[str, Any]] = None
+    statistics: Optional[Dict[str, int]] = None
+
+    def __init__(
+        self,
+        public_suffix: PublicSuffixHelper,
+        *,
+        min_subjects: Optional[int] = None,
+        threads: Optional[int] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        server_selector: Optional[DNSServerSelector] = None,
+        cache: Optional[DNSAnswerCache] = None,
+    ) -> None:
+        self.public_suffix = public_suffix
+        self.rate_limiter = rate_limiter
+        self.server_selector = server_selector
+        self.cache = cache
+
+        if min_subjects is not None:
+            self.min_subjects = int(min_subjects)
+
+        if threads is not None:
+            self.threads = int(threads)
+
+        self.subjects = {}
+        self.matches = {}
+        self.statistics = {"parents": 0, "matches": 0, "subjects": 0, "queries": 0}
+
+        self._local = threading.local()
+        self._query_tools: List[CountingDNSQueryTool] = []
+
+    def get_parent(self, subject: str) -> Optional[str]:
+        """
+        Provides the parent of the given subject - or :code:`None` when it
+        shouldn't be grouped.
+        """
+
+        raise NotImplementedError()
+
+    def check(self, parent: str) -> Any:
+        """
+        Checks the given parent.
+
+        :return:
+            What our testers should know about the subjects of the parent -
+            or :code:`None` when it doesn't match.
+        """
+
+        raise NotImplementedError()
+
+    def add(self, subject: str) -> "ZoneResolverBase":
+        """
+        Adds the given subject to its group.
+        """
+
+        parent = self.get_parent(subject)
+
+        if parent is not None and parent != subject.lower():
+            self.subjects[parent] = self.subjects.get(parent, 0) + 1
+
+        return self
+
+    def add_all(self, subjects: Iterable[str]) -> "ZoneResolverBase":
+        """
+        Adds all the given subjects to their group.
+        """
+
+        for subject in subjects:
+            self.add(subject)
+
+        return self
+
+    @property
+    def dns_query_tool(self) -> CountingDNSQueryTool:
+        """
+        Provides the (per thread) DNS query tool to check with.
+        """
+
+        if not hasattr(self._local, "dns_query_tool"):
+            self._local.dns_query_tool = CountingDNSQueryTool(
+                # SQLite connections can't be shared between threads.
+                self.cache.clone() if self.cache is not None else None,
+                rate_limiter=self.rate_limiter,
+                server_selector=self.server_selector,
+            )
+            self._query_tools.append(self._local.dns_query_tool)
+
+        return self._local.dns_query_tool
+
+    def resolve(
+        self, should_stop: Optional[Callable[[], bool]] = None
+    ) -> "ZoneResolverBase":
+        """
+        Checks the parents which have enough subjects.
+
+        :param should_stop:
+            A function which tells us when to stop checking (e.g. when the CI
+            time is exceeded). The parents we didn't check yet are then
+            simply considered as not matching.
+        """
+
+        parents = [
+            x for x, count in self.subjects.items() if count >= self.min_subjects
+        ]
+        checked = 0
+
+        logging.info(
+            "%s: Started to check %d parent(s).", type(self).__name__, len(parents)
+        )
+
+        with concurrent.futures.ThreadPoolExecutor(self.threads) as executor:
+            futures = {executor.submit(self.check, x): x for x in parents}
+
+            for future in concurrent.futures.as_completed(futures):
+                parent, match = futures[future], future.result()
+                checked += 1
+
+                if match is not None:
+                    self.matches[parent] = match
+                    self.statistics["subjects"] += self.subjects[parent]
+
+                if should_stop is not None and should_stop():
+                    logging.warning(
+                        "%s: Stopped after %d parent(s).", type(self).__name__, checked
+                    )
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+
+        for query_tool in self._query_tools:
+            if query_tool.cache is not None:
+                query_tool.cache.close()
+
+        self.statistics["parents"] = checked
+        self.statistics["matches"] = len(self.matches)
+        self.statistics["queries"] = sum(x.queries for x in self._query_tools)
+
+        # We don't need them anymore - and our testers shouldn't inherit them.
+        self.subjects = {}
+
+        logging.info("%s: %r", type(self).__name__, self.statistics)
+
+        return self
+
+    def dump(self) -> Dict[str, Any]:
+        """
+        Provides what we found - in a JSON serializable format.
+        """
+
+        return {"matches": self.matches, "statistics": self.statistics}
+
+    def load(self, data: Dict[str, Any]) -> "ZoneResolverBase":
+        """
+        Loads what a previous session found.
+
+        :param data:
+            What :meth:`dump` provided.
+        """
+
+        self.subjects = {}
+        self.matches = dict(data["matches"])
+        self.statistics = {
+            **dict(data["statistics"]),
+            # We didn't query anything this time.
+            "queries": 0,
+        }
+
+        return self
+
+    def get_match(self, subject: str) -> Any:
+        """
+        Provides what we know about the parent of the given subject.
+
+        :return:
+            :code:`None` when the subject is not under a matching parent.
+        """
+
+        if not self.matches:
+            return None
+
+        return self.matches.get(self.get_parent(subject))
@@ -41,7 +41,6 @@ import os
 import re
 import secrets
 
-from PyFunceble.helpers.download import DownloadHelper
 from PyFunceble.helpers.file import FileHelper
 
 from ultimate_hosts_blacklist.test_launcher.defaults import (
@@ -49,6 +48,10 @@ from ultimate_hosts_blacklist.test_launcher.defaults import (
     outputs,
     pyfunceble,
 )
+from ultimate_hosts_blacklist.test_launcher.helpers.download import (
+    PooledDownloadHelper,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.file import ChangeAwareFileHelper
 from ultimate_hosts_blacklist.test_launcher.updater.base import UpdaterBase
 
 
@@ -75,57 +78,54 @@ class InfrastructureFilesUpdater(UpdaterBase):
         Starts the update process.
         """
 
-        for file in infrastructure.LINKS.values():
-            destination = os.path.join(outputs.CURRENT_DIRECTORY, file["destination"])
-
-            parent_directory = os.path.dirname(destination)
-            os.makedirs(parent_directory, exist_ok=True)
-
-            DownloadHelper(file["link"]).download_text(destination=destination)
-
-            logging.info("Updated: %r", destination)
+        downloads = []
 
-        for file in pyfunceble.LINKS.values():
+        for file in [
+            *infrastructure.LINKS.values(),
+            *pyfunceble.LINKS.values(),
+            infrastructure.WORKFLOW_LINKS["main"],
+        ]:
             destination = os.path.join(outputs.CURRENT_DIRECTORY, file["destination"])
 
-            parent_directory = os.path.dirname(destination)
-            os.makedirs(parent_directory, exist_ok=True)
+            downloads.append((file["link"], destination))
 
-            DownloadHelper(file["link"]).download_text(destination=destination)
-
-            logging.info("Updated: %r", destination)
-
-        destination = os.path.join(
+        scheduled_file = os.path.join(
             outputs.CURRENT_DIRECTORY,
-            infrastructure.WORKFLOW_LINKS["main"]["destination"],
-        )
-        DownloadHelper(infrastructure.WORKFLOW_LINKS["main"]["link"]).download_text(
-            destination=destination
+            infrastructure.WORKFLOW_LINKS["scheduler"]["destination"],
         )
 
-        logging.info("Updated: %r", destination)
+        update_scheduler = int(secrets.token_hex(8), 16) % 3 == 0
 
-        scheduled_file = os.path.join(
-            outputs.CURRENT_DIRECTORY,
-            infrastructure.WORKFLOW_LINKS["scheduler"]["destination"],
+        if update_scheduler:
+            downloads.append(
+                (infrastructure.WORKFLOW_LINKS["scheduler"]["link"], scheduled_file)
+            )
+
+        results = PooledDownloadHelper().download_many(
+            (link, None) for link, _ in downloads
         )
 
-        if int(secrets.token_hex(8), 16) % 3 == 0:
-            data = DownloadHelper(
-                infrastructure.WORKFLOW_LINKS["scheduler"]["link"]
-            ).download_text(destination=None)
+        for (_, destination), data in zip(downloads, results):
+            if destination == scheduled_file:
+                data = self.randomize_schedule(data)
 
-            random_minute = secrets.randbelow(59)
-            random_hour = secrets.randbelow(12)
+            if ChangeAwareFileHelper(destination).write_if_changed(data):
+                logging.info("Updated: %r", destination)
+            else:
+                logging.info("Unchanged: %r", destination)
 
-            # pylint: disable=consider-using-f-string
-            new_data = re.sub(
-                r'cron: "\d+\s\d+\s(\*\s\*\s\*)"',
-                r'cron: "{0} {1} \1"'.format(random_minute, random_hour),
-                data,
-            )
+    @staticmethod
+    def randomize_schedule(data: str) -> str:
+        """
+        Randomizes the schedule of the given scheduler workflow.
+        """
 
-            with open(scheduled_file, "w", encoding="utf-8") as file_stream:
-                file_stream.write(new_data)
+        random_minute = secrets.randbelow(59)
+        random_hour = secrets.randbelow(12)
 
-                logging.info("Updated: %r", scheduled_file)
+        # pylint: disable=consider-using-f-string
+        return re.sub(
+            r'cron: "\d+\s\d+\s(\*\s\*\s\*)"',
+            r'cron: "{0} {1} \1"'.format(random_minute, random_hour),
+            data,
+        )
@@ -35,18 +35,29 @@ License:
     SOFTWARE.
 """
 
+import concurrent.futures
+import functools
+import io
 import logging
 import os
 import tempfile
-from typing import List, Set, Tuple, Union
+from typing import IO, Callable, Generator, List, Optional, Set, Tuple, Union
 
+from PyFunceble.cli.utils.sort import standard as standard_sort_key
 from PyFunceble.cli.utils.testing import get_subjects_from_line
-from PyFunceble.helpers.download import DownloadHelper
 from PyFunceble.helpers.file import FileHelper
-from ultimate_hosts_blacklist.whitelist.core import Core as whitelist_core_tool
+from PyFunceble.helpers.hash import HashHelper
 
 from ultimate_hosts_blacklist.test_launcher.administration import Administration
-from ultimate_hosts_blacklist.test_launcher.defaults import outputs
+from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure, outputs
+from ultimate_hosts_blacklist.test_launcher.helpers.download import (
+    CachedDownloadHelper,
+    PooledDownloadHelper,
+)
+from ultimate_hosts_blacklist.test_launcher.helpers.file import ChangeAwareFileHelper
+from ultimate_hosts_blacklist.test_launcher.helpers.metrics import RunMetrics
+from ultimate_hosts_blacklist.test_launcher.helpers.sort import ExternalSortHelper
+from ultimate_hosts_blacklist.test_launcher.helpers.zone_order import ZoneOrderHelper
 from ultimate_hosts_blacklist.test_launcher.updater.base import UpdaterBase
 
 
@@ -69,12 +80,15 @@ class OutputFilesUpdater(UpdaterBase):
         self.download_temp_file = tempfile.NamedTemporaryFile(mode="r", delete=False)
         # pylint: disable=consider-using-with
         self.whitelist_list = tempfile.NamedTemporaryFile(mode="r", delete=False)
+        # pylint: disable=consider-using-with
+        self.new_list = tempfile.NamedTemporaryFile(mode="r", delete=False)
 
         super().__init__(administration)
 
     def __del__(self) -> None:
         FileHelper(self.download_temp_file.name).delete()
         FileHelper(self.whitelist_list.name).delete()
+        FileHelper(self.new_list.name).delete()
 
     @property
     def authorized(self) -> bool:
@@ -88,6 +102,60 @@ class OutputFilesUpdater(UpdaterBase):
             )
         ).exists()
 
+    @property
+    def memory_limit(self) -> int:
+        """
+        Provides the maximum number of bytes the streaming diff is allowed to
+        keep in memory.
+        """
+
+        return (
+            (self.administration.diff_memory_limit or infrastructure.DIFF_MEMORY_LIMIT)
+            * 1024
+            * 1024
+        )
+
+    @property
+    def sort_key(self) -> Callable[[str], str]:
+        """
+        Provides the key our input file is ordered by: the reversed labels
+        when the zone ordering is activated, the subject itself otherwise.
+
+        .. note::
+            Applying the key twice gives the subject back. Therefore, the
+            streamed diff can compare (and write from) the keys directly.
+        """
+
+        if self.administration.zone_ordering:
+            return ZoneOrderHelper.reverse
+
+        return str
+
+    @property
+    def input_settings(self) -> dict:
+        """
+        Provides the settings which shape our input file. When they change,
+        our input file has to be produced again - even if the upstream didn't
+        change.
+        """
+
+        return {
+            "zone_ordering": bool(self.administration.zone_ordering),
+            "streaming_diff": bool(self.administration.streaming_diff),
+        }
+
+    def get_input_hash(self) -> Optional[str]:
+        """
+        Provides the hash of the current content of our input file.
+        """
+
+        if not FileHelper(self.final_destination).exists():
+            return None
+
+        return HashHelper(CachedDownloadHelper.HASH_ALGO).hash_file(
+            self.final_destination
+        )
+
     def __get_diff_data(
         self,
         current_content: Set[str],
@@ -113,6 +181,7 @@ class OutputFilesUpdater(UpdaterBase):
 
         return kept, new
 
+    @RunMetrics.span("produce_diff")
     def produce_diff(self) -> None:
         """
         Produce the difference from teh downloaded file.
@@ -160,31 +229,251 @@ class OutputFilesUpdater(UpdaterBase):
 
         return kept, removed, new
 
+    def get_downloaded_subjects(self) -> Generator[str, None, None]:
+        """
+        Provides the subjects of the downloaded file.
+        """
+
+        for line in self.download_temp_file:
+            line = line.strip()
+
+            if not line:
+                continue
+
+            for subject in get_subjects_from_line(line, "availability"):
+                if subject:
+                    yield subject
+
+    @RunMetrics.span("produce_streamed_diff")
+    def produce_streamed_diff(self) -> Tuple[int, int, int]:
+        """
+        Produces the difference from the downloaded file without loading any
+        of the compared files into memory.
+
+        Both sides are sorted externally (by our sort key) and merge-joined.
+        The new input file and the removed subjects are written straight to
+        the disk.
+
+        :return:
+            The number of kept, removed and new subjects.
+        """
+
+        file_helper = FileHelper(self.final_destination)
+
+        kept = removed = new = 0
+        sort_key = self.sort_key
+
+        # Both sides may be sorting at the same time.
+        current_sorter = ExternalSortHelper(self.memory_limit // 2)
+        downloaded_sorter = ExternalSortHelper(self.memory_limit // 2)
+
+        self.download_temp_file.seek(0)
+        downloaded_empty = not self.download_temp_file.read(1)
+        self.download_temp_file.seek(0)
+
+        if file_helper.exists():
+            current_file_stream = file_helper.open("r", encoding="utf-8")
+        else:
+            current_file_stream = io.StringIO()
+
+        new_input_file = FileHelper(f"{self.final_destination}.tmp")
+
+        with current_file_stream, new_input_file.open(
+            "w", encoding="utf-8"
+        ) as new_input_file_stream, open(
+            self.whitelist_list.name, "w", encoding="utf-8"
+        ) as removed_file_stream, open(
+            self.new_list.name, "w", encoding="utf-8"
+        ) as new_file_stream:
+            current = current_sorter.sort(
+                sort_key(y) for y in (x.strip() for x in current_file_stream) if y
+            )
+
+            if downloaded_empty:
+                downloaded = current
+                current = iter(())
+            else:
+                downloaded = downloaded_sorter.sort(
+                    sort_key(x) for x in self.get_downloaded_subjects()
+                )
+
+            current_subject = next(current, None)
+
+            for subject in downloaded:
+                while current_subject is not None and current_subject < subject:
+                    removed_file_stream.write(sort_key(current_subject) + "\n")
+                    removed += 1
+
+                    current_subject = next(current, None)
+
+                if current_subject == subject or downloaded_empty:
+                    kept += 1
+                    current_subject = next(current, None)
+                else:
+                    new_file_stream.write(sort_key(subject) + "\n")
+                    new += 1
+
+                new_input_file_stream.write(sort_key(subject) + "\n")
+
+            while current_subject is not None:
+                removed_file_stream.write(sort_key(current_subject) + "\n")
+                removed += 1
+
+                current_subject = next(current, None)
+
+            if not kept and not new:
+                new_input_file_stream.write("\n")
+
+        ChangeAwareFileHelper(self.final_destination).replace_if_changed(
+            new_input_file.path
+        )
+        self.download_temp_file.seek(0)
+
+        return kept, removed, new
+
+    @staticmethod
+    def remove_subjects(
+        file: str, removed: Set[str], *, memory_limit: Optional[int] = None
+    ) -> int:
+        """
+        Removes the given subjects from the given file.
+
+        The kept lines are sorted externally and written into a temporary
+        file which replaces the given one - if anything changed.
+
+        :param file:
+            The file to clean.
+        :param removed:
+            The subjects to remove.
+        :param memory_limit:
+            The maximum number of bytes our sort is allowed to keep in memory.
+
+        :return:
+            The number of removed lines.
+        """
+
+        file_helper = ChangeAwareFileHelper(file)
+        new_file = FileHelper(f"{file}.tmp")
+        sorter = ExternalSortHelper(memory_limit, key=standard_sort_key)
+        dropped = 0
+
+        def get_kept_lines(file_stream: IO) -> Generator[str, None, None]:
+            nonlocal dropped
+
+            for line in file_stream:
+                line = line.strip()
+
+                if not line:
+                    continue
+
+                if line in removed:
+                    dropped += 1
+                    continue
+
+                yield line
+
+        with file_helper.open("r", encoding="utf-8") as file_stream, new_file.open(
+            "w", encoding="utf-8"
+        ) as new_file_stream:
+            written = False
+
+            for line in sorter.sort(get_kept_lines(file_stream)):
+                new_file_stream.write(line + "\n")
+                written = True
+
+            if not written:
+                new_file_stream.write("\n")
+
+        file_helper.replace_if_changed(new_file.path)
+
+        return dropped
+
+    @RunMetrics.span(
+        "remove_removed",
+        files=[
+            outputs.CLEAN_DESTINATION,
+            outputs.IP_DESTINATION,
+            outputs.VOLATILE_DESTINATION,
+            outputs.WHITELISTED_DESTINATION,
+        ],
+    )
     def remove_removed(self) -> None:
         """
         Removed the removed entries from all files to clean.
         """
 
-        file_helper = FileHelper()
+        with open(self.whitelist_list.name, "r", encoding="utf-8") as file_stream:
+            removed = {y for y in (x.strip() for x in file_stream) if y}
+
+        files = [x for x in self.files_to_clean if FileHelper(x).exists()]
+
+        if not files:
+            return
+
+        logging.info("Started to cleanup: %r", files)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(files)) as executor:
+            for file, dropped in zip(
+                files,
+                executor.map(
+                    functools.partial(
+                        self.remove_subjects,
+                        removed=removed,
+                        # The files are cleaned at the same time.
+                        memory_limit=self.memory_limit // len(files),
+                    ),
+                    files,
+                ),
+            ):
+                logging.info("Finished to cleanup: %r (%d removed)", file, dropped)
+
+    def update_priority_lane(self) -> None:
+        """
+        Updates the subjects of our priority lane: the new subjects of this
+        update, and the ones of the previous updates which are still waiting
+        for their first test.
 
-        for file in self.files_to_clean:
-            if not file_helper.set_path(file).exists():
+        When the update brings too many new subjects (e.g. the very first
+        update), a priority lane is pointless. Therefore, we drop it.
+        """
+
+        lane_file = ChangeAwareFileHelper(outputs.PRIORITY_LANE_DESTINATION)
+        subjects = set()
+
+        for file in (self.new_list.name, lane_file.path):
+            if not os.path.isfile(file):
                 continue
 
-            logging.info(
-                "Started to cleanup: %r",
-                file,
-            )
-            whitelist_core_tool(
-                output_file=file,
-                secondary_whitelist=self.whitelist_list.name,
-                use_official=False,
-                processes=os.cpu_count(),
-            ).filter(file=file, already_formatted=True, standard_sort=True)
-            logging.info(
-                "Finished to cleanup: %r",
-                file,
-            )
+            with open(file, "r", encoding="utf-8") as file_stream:
+                for line in file_stream:
+                    line = line.strip()
+
+                    if line:
+                        subjects.add(line)
+
+                    if len(subjects) > infrastructure.PRIORITY_LANE_MAX_SIZE:
+                        logging.info(
+                            "More than %d subjects to prioritize. "
+                            "Dropping the priority lane.",
+                            infrastructure.PRIORITY_LANE_MAX_SIZE,
+                        )
+
+                        lane_file.delete()
+                        return
+
+        if subjects:
+            with open(self.whitelist_list.name, "r", encoding="utf-8") as file_stream:
+                subjects.difference_update(x.strip() for x in file_stream)
+
+        if not subjects:
+            lane_file.delete()
+            return
+
+        lane_file.write_if_changed(
+            "\n".join(sorted(subjects, key=standard_sort_key)) + "\n"
+        )
+
+        logging.info("%d subject(s) in the priority lane.", len(subjects))
 
     @UpdaterBase.execute_if_authorized
     def start(self) -> "UpdaterBase":
@@ -192,16 +481,76 @@ class OutputFilesUpdater(UpdaterBase):
         Starts the update process.
         """
 
+        downloader = None
+
         if self.administration.raw_link:
-            logging.info("Started to download: %r", self.administration.raw_link)
-            DownloadHelper(self.administration.raw_link).download_text(
-                destination=self.download_temp_file.name
+            downloader = CachedDownloadHelper(
+                self.administration.raw_link, downloader=PooledDownloadHelper()
             )
 
+            # We can only trust the upstream to tell us that nothing changed
+            # when our input file is still the one we produced last time - with
+            # the same settings.
+            input_hash = self.get_input_hash()
+            conditional = (
+                input_hash is not None
+                and input_hash == downloader.get("input_hash")
+                and self.input_settings == downloader.get("input_settings")
+            )
+
+            logging.info("Started to download: %r", self.administration.raw_link)
+            downloaded = downloader.download(
+                self.download_temp_file.name, conditional=conditional
+            )
             logging.info("Finished to download: %r", self.administration.raw_link)
 
+            if not downloaded:
+                logging.info(
+                    "Upstream unchanged since the last update of %r. Skipping.",
+                    self.final_destination,
+                )
+
+                # The upstream may have sent new validators along with the
+                # same content. Let's keep them for our next request.
+                downloader.save()
+                return
+
         self.download_temp_file.seek(0)
 
+        if self.administration.streaming_diff:
+            logging.info("Started streamed comparison of: %r", self.final_destination)
+            kept, removed, new = self.produce_streamed_diff()
+            logging.info(
+                "Finished streamed comparison of: %r (kept: %d | removed: %d | "
+                "new: %d)",
+                self.final_destination,
+                kept,
+                removed,
+                new,
+            )
+
+            self.whitelist_list.seek(0)
+        else:
+            removed = self.update_from_diff()
+
+        self.update_priority_lane()
+
+        if removed:
+            self.remove_removed()
+
+        if downloader:
+            downloader.set("input_hash", self.get_input_hash()).set(
+                "input_settings", self.input_settings
+            ).save()
+
+    def update_from_diff(self) -> bool:
+        """
+        Updates the input file from the in-memory difference.
+
+        :return:
+            Whether some subjects were removed.
+        """
+
         logging.info("Started comparison of: %r", self.final_destination)
         kept, removed, new = self.produce_diff()
         logging.info("Finished comparison of: %r", self.final_destination)
@@ -223,12 +572,18 @@ class OutputFilesUpdater(UpdaterBase):
 
         logging.info("Started to update: %r", self.final_destination)
 
-        FileHelper(self.final_destination).write(
-            "\n".join(sorted(to_write)) + "\n", overwrite=True
+        ChangeAwareFileHelper(self.final_destination).write_if_changed(
+            "\n".join(sorted(to_write, key=self.sort_key)) + "\n"
         )
 
         logging.info("Finished to update: %r", self.final_destination)
 
+        new.discard(None)
+        new.discard("")
+
+        if new:
+            FileHelper(self.new_list.name).write("\n".join(new) + "\n", overwrite=True)
+
         if removed:
             logging.info(
                 "Started to write our temporary whitelist list into: %r",
@@ -243,4 +598,4 @@ class OutputFilesUpdater(UpdaterBase):
                 self.whitelist_list.name,
             )
 
-            self.remove_removed()
+        return bool(removed)
@@ -42,6 +42,7 @@ import os
 from PyFunceble.helpers.file import FileHelper
 
 from ultimate_hosts_blacklist.test_launcher.defaults import outputs
+from ultimate_hosts_blacklist.test_launcher.helpers.file import ChangeAwareFileHelper
 from ultimate_hosts_blacklist.test_launcher.updater.base import UpdaterBase
 
 
@@ -97,9 +98,11 @@ class ReadmeUpdater(UpdaterBase):
 
         content += "\n"
 
-        readme_file = FileHelper(
+        readme_file = ChangeAwareFileHelper(
             os.path.join(outputs.CURRENT_DIRECTORY, outputs.README_FILENAME)
         )
-        readme_file.write(content, overwrite=True)
 
-        logging.info("Updated: %r", readme_file.path)
+        if readme_file.write_if_changed(content):
+            logging.info("Updated: %r", readme_file.path)
+        else:
+            logging.info("Unchanged: %r", readme_file.path)
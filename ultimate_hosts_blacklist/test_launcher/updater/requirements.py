@@ -41,6 +41,7 @@ import os
 from PyFunceble.helpers.file import FileHelper
 
 from ultimate_hosts_blacklist.test_launcher.defaults import infrastructure, outputs
+from ultimate_hosts_blacklist.test_launcher.helpers.file import ChangeAwareFileHelper
 from ultimate_hosts_blacklist.test_launcher.updater.base import UpdaterBase
 
 
@@ -67,10 +68,13 @@ class RequirementsUpdater(UpdaterBase):
         Starts the update process.
         """
 
-        file_helper = FileHelper(
+        file_helper = ChangeAwareFileHelper(
             os.path.join(outputs.CURRENT_DIRECTORY, outputs.REQUIREMENTS_FILENAME)
-        ).write(
-            "\n".join(infrastructure.REQUIREMENTS_FILE_CONTENT) + "\n", overwrite=True
         )
 
-        logging.info("Updated: %r", file_helper.path)
+        if file_helper.write_if_changed(
+            "\n".join(infrastructure.REQUIREMENTS_FILE_CONTENT) + "\n"
+        ):
+            logging.info("Updated: %r", file_helper.path)
+        else:
+            logging.info("Unchanged: %r", file_helper.path)